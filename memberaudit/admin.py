@@ -536,9 +536,3 @@ class SkillSetAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         obj.user = request.user
         super().save_model(request, obj, form, change)
-        tasks.update_characters_skill_checks.delay(force_update=True)
-
-    def delete_model(self, request, obj):
-        obj.user = request.user
-        super().delete_model(request, obj)
-        tasks.update_characters_skill_checks.delay(force_update=True)
@@ -48,12 +48,23 @@ MEMBERAUDIT_LOG_UPDATE_STATS = clean_setting("MEMBERAUDIT_LOG_UPDATE_STATS", Fal
 The update stats include the measures durations from the last run per round and section.
 """
 
-MEMBERAUDIT_TASKS_MAX_ASSETS_PER_PASS = clean_setting(
-    "MEMBERAUDIT_TASKS_MAX_ASSETS_PER_PASS", 2500
+MEMBERAUDIT_TASKS_BUNDLED_UPDATES = clean_setting(
+    "MEMBERAUDIT_TASKS_BUNDLED_UPDATES", False
 )
-"""Technical parameter defining the maximum number of asset items processed in each pass
-when updating character assets.
-A higher value reduces duration, but also increases task queue congestion.
+"""When set True will update light sections (e.g. location, online status, ship)
+of a character within one task, instead of one task per section.
+"""
+
+MEMBERAUDIT_TASKS_BUNDLED_MAX_WORKERS = clean_setting(
+    "MEMBERAUDIT_TASKS_BUNDLED_MAX_WORKERS", 4, min_value=1
+)
+"""Maximum number of threads for fetching sections concurrently in bundled updates."""
+
+MEMBERAUDIT_TASKS_SPREAD_UPDATES = clean_setting(
+    "MEMBERAUDIT_TASKS_SPREAD_UPDATES", False
+)
+"""When set True will spread character updates evenly across the time until
+ring 1 sections become stale, instead of starting all updates at once.
 """
 
 MEMBERAUDIT_TASKS_TIME_LIMIT = clean_setting("MEMBERAUDIT_TASKS_TIME_LIMIT", 7200)
@@ -97,3 +108,13 @@ Minimum is 7 day.
 MEMBERAUDIT_TASKS_OBJECT_CACHE_TIMEOUT = clean_setting(
     "MEMBERAUDIT_TASKS_OBJECT_CACHE_TIMEOUT", 600
 )
+
+# Maximum number of characters kept in the in-process cache of each worker
+MEMBERAUDIT_TASKS_LOCAL_CACHE_MAX_SIZE = clean_setting(
+    "MEMBERAUDIT_TASKS_LOCAL_CACHE_MAX_SIZE", 500, min_value=1
+)
+
+# Timeout for caching the token of a character between tasks in seconds
+MEMBERAUDIT_TASKS_TOKEN_CACHE_TIMEOUT = clean_setting(
+    "MEMBERAUDIT_TASKS_TOKEN_CACHE_TIMEOUT", 300
+)
@@ -0,0 +1,91 @@
+"""Building the asset tree of a character from a flat ESI asset list."""
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set
+
+
+@dataclass
+class AssetTree:
+    """A flat ESI asset list ordered into the levels of an asset tree.
+
+    Items on level 0 are located directly at a known location (e.g. a station).
+    Items on every other level are located inside an item from the previous level,
+    so writing the levels in order always creates parents before their children.
+    """
+
+    levels: List[List[dict]] = field(default_factory=list)
+    orphaned_ids: Set[int] = field(default_factory=set)
+    cyclic_ids: Set[int] = field(default_factory=set)
+
+    def __len__(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+    @property
+    def has_failed_items(self) -> bool:
+        """Whether some items could not be placed in the tree."""
+        return bool(self.orphaned_ids or self.cyclic_ids)
+
+    def items(self) -> Iterable[dict]:
+        """Iterate over all items in the tree, parents before children."""
+        for level in self.levels:
+            yield from level
+
+
+def build_asset_tree(asset_list: Iterable[dict], location_ids: Set[int]) -> AssetTree:
+    """Build an asset tree from a flat asset list in memory.
+
+    Args:
+    - asset_list: Assets as returned from ESI
+    - location_ids: IDs of all known locations the assets can be located at
+
+    Items which can not be traced back to a known location are reported as orphaned.
+    Items which are part of a location loop are reported as cyclic.
+    """
+    assets_flat = {int(item["item_id"]): item for item in asset_list}
+    children_map: Dict[int, List[int]] = defaultdict(list)
+    root_ids = []
+    for item_id, item in assets_flat.items():
+        location_id = item.get("location_id")
+        if location_id in location_ids:
+            root_ids.append(item_id)
+        elif location_id in assets_flat:
+            children_map[location_id].append(item_id)
+
+    tree = AssetTree()
+    current_ids = root_ids
+    placed_ids = set()
+    while current_ids:
+        tree.levels.append([assets_flat[item_id] for item_id in current_ids])
+        placed_ids.update(current_ids)
+        current_ids = [
+            child_id
+            for item_id in current_ids
+            for child_id in children_map.get(item_id, [])
+        ]
+
+    unplaced_ids = set(assets_flat.keys()) - placed_ids
+    if unplaced_ids:
+        tree.cyclic_ids = _find_cyclic_ids(assets_flat, unplaced_ids)
+        tree.orphaned_ids = unplaced_ids - tree.cyclic_ids
+
+    return tree
+
+
+def _find_cyclic_ids(assets_flat: Dict[int, dict], unplaced_ids: Set[int]) -> Set[int]:
+    """Identify all items that are part of a location loop."""
+    cyclic_ids = set()
+    visited_ids = set()
+    for start_id in unplaced_ids:
+        path = []
+        positions = {}
+        item_id = start_id
+        while item_id in assets_flat and item_id not in visited_ids:
+            visited_ids.add(item_id)
+            positions[item_id] = len(path)
+            path.append(item_id)
+            item_id = assets_flat[item_id].get("location_id")
+
+        if item_id in positions:
+            cyclic_ids.update(path[positions[item_id] :])
+
+    return cyclic_ids
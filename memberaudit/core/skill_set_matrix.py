@@ -0,0 +1,98 @@
+"""Checking characters against the skill requirements of all skill sets at once."""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+class SkillRequirement(NamedTuple):
+    """Required and recommended level of a skill in a skill set."""
+
+    skill_set_id: int
+    skill_id: int  # pk of the skill set skill
+    eve_type_id: int
+    required_level: Optional[int]
+    recommended_level: Optional[int]
+
+
+@dataclass
+class SkillSetCheckResult:
+    """Skills of a skill set a character has not trained to the needed level."""
+
+    failed_required_skill_ids: List[int] = field(default_factory=list)
+    failed_recommended_skill_ids: List[int] = field(default_factory=list)
+
+
+class SkillSetMatrix:
+    """Requirements of all skill sets compiled into one matrix.
+
+    Each requirement is a row with its skill set and skill type, the columns
+    are stored as flat tuples. A character is checked against all skill sets
+    by comparing its vector of skill levels with the level columns in one pass.
+    """
+
+    def __init__(
+        self,
+        requirements: Iterable[SkillRequirement],
+        skill_set_ids: Iterable[int] = None,
+    ) -> None:
+        requirements = sorted(requirements, key=lambda obj: obj[:2])
+        self._skill_set_ids = tuple(obj.skill_set_id for obj in requirements)
+        self._skill_ids = tuple(obj.skill_id for obj in requirements)
+        self._eve_type_ids = tuple(obj.eve_type_id for obj in requirements)
+        self._required_levels = tuple(obj.required_level for obj in requirements)
+        self._recommended_levels = tuple(obj.recommended_level for obj in requirements)
+        all_skill_set_ids = set(self._skill_set_ids)
+        if skill_set_ids is not None:
+            all_skill_set_ids |= set(skill_set_ids)
+        self.skill_set_ids: Tuple[int] = tuple(sorted(all_skill_set_ids))
+
+    def __len__(self) -> int:
+        return len(self._skill_ids)
+
+    @property
+    def eve_type_ids(self) -> Set[int]:
+        """IDs of all skill types used in any skill set."""
+        return set(self._eve_type_ids)
+
+    def subset(self, skill_set_ids: Iterable[int]) -> "SkillSetMatrix":
+        """Matrix with the requirements of the given skill sets only."""
+        skill_set_ids = set(skill_set_ids).intersection(self.skill_set_ids)
+        requirements = [
+            SkillRequirement(*row)
+            for row in zip(
+                self._skill_set_ids,
+                self._skill_ids,
+                self._eve_type_ids,
+                self._required_levels,
+                self._recommended_levels,
+            )
+            if row[0] in skill_set_ids
+        ]
+        return SkillSetMatrix(requirements, skill_set_ids=skill_set_ids)
+
+    def check(self, skill_levels: Dict[int, int]) -> Dict[int, SkillSetCheckResult]:
+        """Check skill levels of a character against all skill sets.
+
+        Args:
+            skill_levels: Active skill level of a character by skill type ID
+
+        Returns:
+            Result for every skill set by skill set ID
+        """
+        results = {
+            skill_set_id: SkillSetCheckResult() for skill_set_id in self.skill_set_ids
+        }
+        character_levels = [
+            skill_levels.get(eve_type_id, 0) for eve_type_id in self._eve_type_ids
+        ]
+        for skill_set_id, skill_id, level, required, recommended in zip(
+            self._skill_set_ids,
+            self._skill_ids,
+            character_levels,
+            self._required_levels,
+            self._recommended_levels,
+        ):
+            if required and level < required:
+                results[skill_set_id].failed_required_skill_ids.append(skill_id)
+            if recommended and level < recommended:
+                results[skill_set_id].failed_recommended_skill_ids.append(skill_id)
+        return results
@@ -0,0 +1,54 @@
+"""Spreading character updates evenly across the time until sections become stale."""
+from math import floor
+from typing import Iterable, Optional
+
+_HASH_MULTIPLIER = 2_654_435_761  # Knuth's multiplicative hash
+_HASH_RANGE = 2**32
+
+
+def character_tick(character_pk: int, ticks: int) -> int:
+    """Return the tick in which a character is updated, from 0 to ticks - 1.
+
+    Ticks are assigned deterministically, so a character is updated
+    at about the same time in every update cycle.
+    Sequential PKs are spread evenly over all ticks.
+    """
+    return (character_pk * _HASH_MULTIPLIER % _HASH_RANGE) * ticks // _HASH_RANGE
+
+
+def tick_capacity(
+    tick_minutes: int, throughputs_per_hour: Iterable[Optional[int]]
+) -> Optional[int]:
+    """Return the maximum number of characters to update per tick.
+
+    The capacity is derived from the lowest measured throughput of all rings.
+    Characters which do not fit are deferred to later ticks.
+
+    Returns None when there is no measured throughput yet, i.e. no limit.
+    """
+    throughputs = [value for value in throughputs_per_hour if value]
+    if not throughputs:
+        return None
+    return max(floor(min(throughputs) * tick_minutes / 60), 1)
+
+
+def next_tick_capacity(
+    capacity: Optional[int],
+    released_count: int,
+    released_sections: int,
+    finished_sections: int,
+) -> Optional[int]:
+    """Return the capacity for the next tick from the outcome of the last tick.
+
+    When workers have not finished all sections released in the last tick,
+    the capacity becomes the share of characters they did finish.
+    When they finished all sections of a full tick, the capacity grows by half.
+    Otherwise the capacity stays the same.
+    """
+    if not released_sections:
+        return capacity
+    if finished_sections < released_sections:
+        return max(released_count * finished_sections // released_sections, 1)
+    if capacity and released_count >= capacity:
+        return capacity + max(capacity // 2, 1)
+    return capacity
@@ -1,6 +1,7 @@
 from functools import wraps
 
 from django.http import HttpResponseForbidden, HttpResponseNotFound
+from esi.errors import TokenError
 
 from allianceauth.services.hooks import get_extension_logger
 from app_utils.logging import LoggerAddTag
@@ -68,7 +69,11 @@ def fetch_token_for_character(scopes=None):
                 token.pk,
                 func.__name__,
             )
-            return func(character, token, *args, **kwargs)
+            try:
+                return func(character, token, *args, **kwargs)
+            except TokenError:
+                character.invalidate_token_cache()
+                raise
 
         return _wrapped_view
 
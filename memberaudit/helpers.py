@@ -1,12 +1,14 @@
-from typing import Optional
+from typing import Callable, Dict, Iterable, Iterator, Optional, Set
 
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import connections, models
 
 from allianceauth.services.hooks import get_extension_logger
+from app_utils.helpers import chunks
 from app_utils.logging import LoggerAddTag
 
 from . import __title__
+from .app_settings import MEMBERAUDIT_BULK_METHODS_BATCH_SIZE
 
 logger = LoggerAddTag(get_extension_logger(__name__), __title__)
 
@@ -26,14 +28,31 @@ def get_or_create_esi_or_none(
     return obj
 
 
-def get_or_create_or_none(
-    prop_name: str, dct: dict, Model: type
-) -> Optional[models.Model]:
-    """Get or creates a Django object from a dictionary entry or returns None."""
-    if dct.get(prop_name):
-        obj, _ = Model.objects.get_or_create(id=dct.get(prop_name))
-        return obj
-    return None
+def bulk_get_or_create_map(
+    prop_names: Iterable[str], rows: Iterable[dict], Model: type
+) -> Dict[int, models.Model]:
+    """Get or create Django objects for all IDs referenced in a list of dictionaries.
+
+    Missing objects are created with one bulk query.
+
+    Returns a map of ID to object for all referenced IDs.
+    """
+    prop_names = list(prop_names)
+    ids = {row.get(prop_name) for row in rows for prop_name in prop_names}
+    ids.discard(None)
+    ids.discard(0)
+    if not ids:
+        return dict()
+    objs = Model.objects.in_bulk(ids)
+    new_objs = [Model(id=id) for id in ids.difference(objs.keys())]
+    if new_objs:
+        Model.objects.bulk_create(
+            new_objs,
+            batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        objs.update({obj.id: obj for obj in new_objs})
+    return objs
 
 
 def get_or_none(prop_name: str, dct: dict, Model: type) -> Optional[models.Model]:
@@ -48,6 +67,77 @@ def get_or_none(prop_name: str, dct: dict, Model: type) -> Optional[models.Model
     return None
 
 
+def filter_existing_values(
+    queryset: models.QuerySet, field_name: str, values: Iterable
+) -> Set:
+    """Return those of the given values which exist for a field in a queryset."""
+    existing_values = set()
+    for values_chunk in _query_chunks(queryset, values):
+        existing_values.update(
+            queryset.filter(**{f"{field_name}__in": values_chunk}).values_list(
+                field_name, flat=True
+            )
+        )
+    return existing_values
+
+
+def filter_new_values(
+    queryset: models.QuerySet, field_name: str, values: Iterable
+) -> Set:
+    """Return those of the given values which do not yet exist for a field
+    in a queryset."""
+    values = set(values)
+    return values.difference(filter_existing_values(queryset, field_name, values))
+
+
+def map_field_values(
+    queryset: models.QuerySet, key_field: str, value_field: str, keys: Iterable
+) -> dict:
+    """Map the given keys to the values of another field in a queryset.
+
+    Keys which do not exist in the queryset are not included.
+    """
+    result = dict()
+    for keys_chunk in _query_chunks(queryset, keys):
+        result.update(
+            queryset.filter(**{f"{key_field}__in": keys_chunk}).values_list(
+                key_field, value_field
+            )
+        )
+    return result
+
+
+def _query_chunks(queryset: models.QuerySet, values: Iterable) -> Iterator[list]:
+    """Split values for an IN lookup into chunks.
+
+    Values are looked up with one query,
+    or in chunks when the database limits the number of query parameters.
+    """
+    values = list(values)
+    if not values:
+        return
+    max_query_params = connections[queryset.db].features.max_query_params
+    yield from chunks(values, max_query_params or len(values))
+
+
+def iter_esi_pages(esi_method: Callable, **kwargs) -> Iterator[list]:
+    """Fetch all pages from a paged ESI endpoint and yield them as they arrive.
+
+    Only the current page is kept in memory,
+    unlike ``results()`` which collects all pages before returning.
+    """
+    page = 1
+    total_pages = 1
+    while page <= total_pages:
+        operation = esi_method(page=page, **kwargs)
+        operation.request_config.also_return_response = True
+        data, response = operation.result()
+        headers = {str(key).lower(): value for key, value in response.headers.items()}
+        total_pages = int(headers.get("x-pages", 1))
+        yield data
+        page += 1
+
+
 def filter_groups_available_to_user(
     groups_qs: models.QuerySet, user: User
 ) -> models.QuerySet:
@@ -1,9 +1,15 @@
 from copy import deepcopy
+from functools import reduce
 from math import floor
+from operator import or_
+from typing import Dict, Iterable, Set
+from uuid import uuid4
 
 from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
 from django.db import models
-from django.db.models import Avg, Count, ExpressionWrapper, F, Max, Min
+from django.db.models import Avg, Count, ExpressionWrapper, F, Max, Min, Q
+from django.utils.timezone import now
 
 from allianceauth.authentication.models import CharacterOwnership
 from allianceauth.services.hooks import get_extension_logger
@@ -12,6 +18,11 @@ from app_utils.django import users_with_permission
 from app_utils.logging import LoggerAddTag
 
 from .. import __title__
+from ..app_settings import (
+    MEMBERAUDIT_TASKS_LOCAL_CACHE_MAX_SIZE,
+    MEMBERAUDIT_TASKS_OBJECT_CACHE_TIMEOUT,
+)
+from ..core.local_cache import LocalLRUCache
 
 logger = LoggerAddTag(get_extension_logger(__name__), __title__)
 
@@ -26,6 +37,62 @@ class CharacterQuerySet(models.QuerySet):
 
 
 class CharacterManagerBase(ObjectCacheMixin, models.Manager):
+    _local_cache = LocalLRUCache(max_size=MEMBERAUDIT_TASKS_LOCAL_CACHE_MAX_SIZE)
+
+    def get_cached(self, pk, timeout: float = None, select_related: str = None):
+        """Return character from the in-process cache, the shared cache or the DB.
+
+        The in-process cache avoids fetching and unpickling the same character
+        from the shared cache again for every task of a worker.
+        Its entries are only used while the version of the character
+        in the shared cache is unchanged, so a character cleared by any process
+        is fetched again by all processes.
+        Every call returns its own copy, so related objects loaded by one task
+        are not seen by other tasks.
+        """
+        pk = int(pk)
+        key = (pk, select_related)
+        version = self._cache_version(pk)
+        cached_version, character = self._local_cache.get(key, (None, None))
+        if character is None or cached_version != version:
+            character = super().get_cached(
+                pk=pk, timeout=timeout, select_related=select_related
+            )
+            self._local_cache.set(
+                key,
+                (version, character),
+                timeout=timeout or MEMBERAUDIT_TASKS_OBJECT_CACHE_TIMEOUT,
+            )
+        return deepcopy(character)
+
+    def clear_cache(self, pk: int) -> None:
+        """Remove a character from the in-process and the shared cache
+        and invalidate its copies in the in-process caches of all other processes.
+        """
+        pk = int(pk)
+        cache.set(self._version_cache_key(pk), uuid4().hex, timeout=None)
+        local_keys = [key for key in self._local_cache.keys() if key[0] == pk]
+        self._local_cache.delete_many(local_keys)
+        cache.delete_many(
+            {self._create_object_cache_key(pk)}
+            | {
+                self._create_object_cache_key(pk, select_related)
+                for _, select_related in local_keys
+            }
+        )
+
+    def _cache_version(self, pk: int) -> str:
+        """Return the current version of a character in the shared cache."""
+        key = self._version_cache_key(pk)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, uuid4().hex, timeout=None)
+            version = cache.get(key)
+        return version
+
+    def _version_cache_key(self, pk: int) -> str:
+        return f"{self._create_object_cache_key(pk)}-version"
+
     def unregistered_characters_of_user_count(self, user: User) -> int:
         return CharacterOwnership.objects.filter(
             user=user, character__memberaudit_character__isnull=True
@@ -101,6 +168,49 @@ CharacterManager = CharacterManagerBase.from_queryset(CharacterQuerySet)
 
 
 class CharacterUpdateStatusManager(models.Manager):
+    def stale_sections_matrix(
+        self, character_pks: Iterable[int]
+    ) -> Dict[int, Set[str]]:
+        """Return the stale sections for each of the given characters.
+
+        Sections without a successful update are considered stale.
+        Staleness of all sections is computed with one query,
+        regardless of the number of characters.
+
+        Args:
+        - character_pks: PKs of characters, can also be a values queryset
+        """
+        from ..models import Character
+
+        if not isinstance(character_pks, models.QuerySet):
+            character_pks = list(character_pks)
+        current = now()
+        is_fresh = reduce(
+            or_,
+            (
+                Q(
+                    section__in=Character.sections_in_ring(ring),
+                    started_at__gte=current - Character.ring_time_until_stale(ring),
+                )
+                for ring in set(Character.UPDATE_SECTION_RINGS_MAP.values())
+            ),
+        )
+        fresh_sections = (
+            self.filter(
+                is_fresh,
+                character_id__in=character_pks,
+                is_success=True,
+                finished_at__isnull=False,
+            )
+            .values_list("character_id", "section")
+            .order_by()
+        )
+        all_sections = set(Character.UpdateSection.values)
+        matrix = {character_pk: set(all_sections) for character_pk in character_pks}
+        for character_pk, section in fresh_sections:
+            matrix[character_pk].discard(section)
+        return matrix
+
     def statistics(self) -> dict:
         """returns detailed statistics about the last update run and the app"""
         from django.conf import settings as auth_settings
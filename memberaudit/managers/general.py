@@ -1,9 +1,11 @@
 import datetime as dt
-from typing import Iterable, List, Tuple
+from typing import Iterable, List, Optional, Set, Tuple
+from uuid import uuid4
 
 from bravado.exception import HTTPForbidden, HTTPUnauthorized
 
 from django.contrib.auth.models import Group, User
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models import Q
 from django.utils.timezone import now
@@ -19,12 +21,14 @@ from .. import __title__
 from ..app_settings import (
     MEMBERAUDIT_BULK_METHODS_BATCH_SIZE,
     MEMBERAUDIT_LOCATION_STALE_HOURS,
+    MEMBERAUDIT_TASKS_OBJECT_CACHE_TIMEOUT,
 )
 from ..constants import DATETIME_FORMAT, EveCategoryId, EveTypeId
 from ..core.fittings import Fitting
 from ..core.skill_plans import SkillPlan
+from ..core.skill_set_matrix import SkillRequirement, SkillSetMatrix
 from ..core.skills import Skill
-from ..helpers import filter_groups_available_to_user
+from ..helpers import bulk_get_or_create_map, filter_groups_available_to_user
 from ..providers import esi
 
 logger = LoggerAddTag(get_extension_logger(__name__), __title__)
@@ -123,6 +127,11 @@ class LocationManager(models.Manager):
     Additional requests for the same location will be ignored within a grace period.
     """
 
+    STRUCTURE_ACCESS_SCOPE = "esi-universe.read_structures.v1"
+    STRUCTURE_UPDATE_CACHE_KEY_PREFIX = "memberaudit-location-structure-update"
+
+    _ACCESS_ERROR_BACKOFF_MINUTES = 15
+    _ACCESS_ERROR_BACKOFF_MAX_HOURS = 24 * 7
     _UPDATE_EMPTY_GRACE_MINUTES = 5
 
     def get_or_create_esi(self, id: int, token: Token) -> Tuple[models.Model, bool]:
@@ -157,6 +166,48 @@ class LocationManager(models.Manager):
                 return self.update_or_create_esi_async(id=id, token=token)
             return self.update_or_create_esi(id=id, token=token)
 
+    def bulk_get_or_create_esi_async(
+        self, ids: Iterable[int], token: Token
+    ) -> Set[int]:
+        """gets or creates location objects for all given IDs in bulk
+
+        Missing and stale locations are determined with one query.
+        Stations are fetched from ESI and written in bulk with their related objects.
+        Structures are created empty and updated asynchronously,
+        with one update per structure within the grace period for all characters.
+
+        returns IDs of all given locations, which exist after the call
+        """
+        ids = {int(id) for id in ids if id}
+        if not ids:
+            return set()
+        stale_threshold = now() - dt.timedelta(hours=MEMBERAUDIT_LOCATION_STALE_HOURS)
+        existing = dict(self.filter(id__in=ids).values_list("id", "updated_at"))
+        refresh_ids = {
+            id for id in ids if id not in existing or existing[id] < stale_threshold
+        }
+        if not refresh_ids:
+            return ids
+        logger.info("Loading %s missing or stale locations", len(refresh_ids))
+        station_ids = {id for id in refresh_ids if self.model.is_station_id(id)}
+        structure_ids = {id for id in refresh_ids if self.model.is_structure_id(id)}
+        if station_ids:
+            self._stations_bulk_update_or_create_esi(station_ids, existing.keys())
+        if structure_ids:
+            self.bulk_create(
+                [self.model(id=id) for id in structure_ids.difference(existing)],
+                batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+            for id in structure_ids:
+                self._structure_update_esi_once(id=id, token=token)
+        for id in refresh_ids.difference(station_ids, structure_ids):
+            try:
+                self._update_or_create_esi(id=id, token=token, update_async=True)
+            except ValueError:
+                ids.discard(id)
+        return ids
+
     def update_or_create_esi_async(
         self, id: int, token: Token
     ) -> Tuple[models.Model, bool]:
@@ -240,21 +291,103 @@ class LocationManager(models.Manager):
             },
         )
 
+    def _stations_bulk_update_or_create_esi(
+        self, ids: Iterable[int], existing_ids: Iterable[int]
+    ):
+        """updates or creates stations from ESI with related objects in bulk"""
+        stations = {}
+        for id in ids:
+            logger.info("%s: Fetching station from ESI", id)
+            stations[id] = esi.client.Universe.get_universe_stations_station_id(
+                station_id=id
+            ).results()
+        rows = stations.values()
+        eve_solar_systems = EveSolarSystem.objects.in_bulk(
+            EveSolarSystem.objects.bulk_get_or_create_esi(
+                ids={row["system_id"] for row in rows if row.get("system_id")}
+            ).values_list("id", flat=True)
+        )
+        eve_types = EveType.objects.in_bulk(
+            EveType.objects.bulk_get_or_create_esi(
+                ids={row["type_id"] for row in rows if row.get("type_id")}
+            ).values_list("id", flat=True)
+        )
+        owners = bulk_get_or_create_map(["owner"], rows, EveEntity)
+        EveEntity.objects.bulk_update_new_esi()
+        updated_at = now()
+        objs = [
+            self.model(
+                id=id,
+                name=station.get("name", ""),
+                eve_solar_system=eve_solar_systems.get(station.get("system_id")),
+                eve_type=eve_types.get(station.get("type_id")),
+                owner=owners.get(station.get("owner")),
+                updated_at=updated_at,
+            )
+            for id, station in stations.items()
+        ]
+        existing_ids = set(existing_ids)
+        with transaction.atomic():
+            self.bulk_create(
+                [obj for obj in objs if obj.id not in existing_ids],
+                batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+            self.bulk_update(
+                [obj for obj in objs if obj.id in existing_ids],
+                fields=["name", "eve_solar_system", "eve_type", "owner", "updated_at"],
+                batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE,
+            )
+
     def _structure_update_or_create_esi_async(self, id: int, token: Token):
+        id = int(id)
+        location, created = self.get_or_create(id=id)
+        self._structure_update_esi_once(id=id, token=token)
+        return location, created
+
+    def _structure_update_esi_once(self, id: int, token: Token):
+        """starts task for updating a structure from ESI
+
+        Further requests for the same structure are ignored within the grace period,
+        so characters sharing a structure only cause one ESI request.
+        """
         from ..tasks import DEFAULT_TASK_PRIORITY
         from ..tasks import update_structure_esi as task_update_structure_esi
 
-        id = int(id)
-        location, created = self.get_or_create(id=id)
+        key = f"{self.STRUCTURE_UPDATE_CACHE_KEY_PREFIX}-{id}"
+        if not cache.add(key, token.pk, timeout=self._UPDATE_EMPTY_GRACE_MINUTES * 60):
+            return
         task_update_structure_esi.apply_async(
             kwargs={"id": id, "token_pk": token.pk},
             priority=DEFAULT_TASK_PRIORITY,
         )
-        return location, created
 
     def structure_update_or_create_esi(self, id: int, token: Token):
-        """Update or creates structure from ESI"""
+        """Update or creates structure from ESI
+
+        Tokens of characters, which had access to the structure before,
+        are preferred over the given token.
+        Once all of them have failed, the structure is backed off exponentially
+        after each access error, regardless of the given token.
+        """
         fetch_esi_status().raise_for_status()
+        access_token = self._structure_access_token(id)
+        if access_token:
+            token = access_token
+        else:
+            location = self.filter(id=id).first()
+            if (
+                location
+                and location.access_retry_at
+                and location.access_retry_at > now()
+            ):
+                logger.info(
+                    "Location #%s: Skipping structure after %d access errors until %s",
+                    id,
+                    location.access_errors,
+                    location.access_retry_at.strftime(DATETIME_FORMAT),
+                )
+                return location, False
         try:
             structure = esi.client.Universe.get_universe_structures_structure_id(
                 structure_id=id, token=token.valid_access_token()
@@ -266,9 +399,84 @@ class LocationManager(models.Manager):
                 id,
                 http_error,
             )
-            return self.get_or_create(id=id)
+            location, created = self.get_or_create(id=id)
+            self._record_structure_access(location, token, has_access=False)
+            # allow other characters to try right away
+            cache.delete(f"{self.STRUCTURE_UPDATE_CACHE_KEY_PREFIX}-{id}")
+            return location, created
+        else:
+            location, created = self._structure_update_or_create_dict(
+                id=id, structure=structure
+            )
+            self._record_structure_access(location, token, has_access=True)
+            return location, created
+
+    def _structure_access_token(self, id: int) -> Optional[Token]:
+        """returns a valid token of a character with access to a structure or None
+
+        Tokens are looked up directly, so missing tokens of those characters
+        do not notify their owners.
+        """
+        from ..models import LocationAccess
+
+        owners = [
+            (character_id, user_id)
+            for character_id, user_id in LocationAccess.objects.filter(
+                location_id=id, has_access=True
+            )
+            .order_by("-updated_at")
+            .values_list(
+                "character__eve_character__character_id",
+                "character__eve_character__character_ownership__user_id",
+            )
+            if user_id
+        ]
+        if not owners:
+            return None
+        query = Q()
+        for character_id, user_id in owners:
+            query |= Q(character_id=character_id, user_id=user_id)
+        tokens = {
+            (token.character_id, token.user_id): token
+            for token in Token.objects.filter(query)
+            .require_scopes([self.STRUCTURE_ACCESS_SCOPE])
+            .require_valid()
+        }
+        for owner in owners:
+            if owner in tokens:
+                return tokens[owner]
+        return None
+
+    def _record_structure_access(
+        self, location: models.Model, token: Token, has_access: bool
+    ):
+        """records outcome of fetching a structure with a token"""
+        from ..models import Character, LocationAccess
+
+        update_fields = ["access_errors", "access_retry_at"]
+        if has_access:
+            location.access_errors = 0
+            location.access_retry_at = None
+            update_fields.append("updated_at")
         else:
-            return self._structure_update_or_create_dict(id=id, structure=structure)
+            location.access_errors += 1
+            backoff = min(
+                dt.timedelta(minutes=self._ACCESS_ERROR_BACKOFF_MINUTES)
+                * 2 ** min(location.access_errors - 1, 16),
+                dt.timedelta(hours=self._ACCESS_ERROR_BACKOFF_MAX_HOURS),
+            )
+            location.access_retry_at = now() + backoff
+        # a failed access must not make an empty structure look fresh
+        location.save(update_fields=update_fields)
+        try:
+            character = Character.objects.get(
+                eve_character__character_id=token.character_id
+            )
+        except Character.DoesNotExist:
+            return
+        LocationAccess.objects.update_or_create(
+            location=location, character=character, defaults={"has_access": has_access}
+        )
 
     def _structure_update_or_create_dict(
         self, id: int, structure: dict
@@ -303,6 +511,63 @@ class LocationManager(models.Manager):
 
 
 class SkillSetManager(models.Manager):
+    REQUIREMENT_MATRIX_CACHE_KEY = "memberaudit-skill-set-requirement-matrix"
+    REQUIREMENT_MATRIX_VERSION_CACHE_KEY = (
+        "memberaudit-skill-set-requirement-matrix-version"
+    )
+
+    def requirement_matrix(self, use_cache: bool = True) -> SkillSetMatrix:
+        """Requirements of all skill sets compiled into one matrix.
+
+        The matrix is compiled once and then served from cache,
+        until a skill set changes or the cache times out.
+
+        Args:
+        - use_cache: When set to False the matrix is always compiled
+        """
+        if not use_cache:
+            return self._compile_requirement_matrix()
+        cache_key = self._requirement_matrix_cache_key()
+        matrix = cache.get(cache_key)
+        if matrix is None:
+            matrix = self._compile_requirement_matrix()
+            cache.set(cache_key, matrix, timeout=MEMBERAUDIT_TASKS_OBJECT_CACHE_TIMEOUT)
+        return matrix
+
+    def clear_requirement_matrix_cache(self) -> None:
+        """Invalidate the compiled requirement matrix.
+
+        This must be called after skill sets or skills have been changed
+        without sending signals, e.g. by bulk methods.
+        """
+        cache.set(self.REQUIREMENT_MATRIX_VERSION_CACHE_KEY, uuid4().hex, timeout=None)
+
+    def _requirement_matrix_cache_key(self) -> str:
+        """Cache key for the current version of the requirement matrix."""
+        version = cache.get_or_set(
+            self.REQUIREMENT_MATRIX_VERSION_CACHE_KEY,
+            lambda: uuid4().hex,
+            timeout=None,
+        )
+        return f"{self.REQUIREMENT_MATRIX_CACHE_KEY}-{version}"
+
+    def _compile_requirement_matrix(self) -> SkillSetMatrix:
+        from ..models import SkillSetSkill
+
+        requirements = [
+            SkillRequirement(*row)
+            for row in SkillSetSkill.objects.values_list(
+                "skill_set_id",
+                "pk",
+                "eve_type_id",
+                "required_level",
+                "recommended_level",
+            )
+        ]
+        return SkillSetMatrix(
+            requirements, skill_set_ids=self.values_list("pk", flat=True)
+        )
+
     def update_or_create_from_fitting(
         self,
         fitting: Fitting,
@@ -368,6 +633,8 @@ class SkillSetManager(models.Manager):
             SkillSetSkill.objects.bulk_create(skill_set_skills)
             if skill_set_group:
                 skill_set_group.skill_sets.add(skill_set)
+        self.clear_requirement_matrix_cache()
+        transaction.on_commit(self.clear_requirement_matrix_cache)
         return skill_set, created
 
     def compile_groups_map(self) -> dict:
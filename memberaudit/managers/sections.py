@@ -1,9 +1,22 @@
 import ast
 import datetime as dt
-from typing import Dict, List
-
-from django.db import models, transaction
-from django.db.models import Case, ExpressionWrapper, F, Value, When
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from django.db import connections, models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Sum,
+    Value,
+    When,
+)
+from django.utils.timezone import now
 from esi.models import Token
 from eveuniverse.models import (
     EveAncestry,
@@ -15,18 +28,43 @@ from eveuniverse.models import (
     EveType,
 )
 
+from allianceauth.authentication.models import get_guest_state_pk
 from allianceauth.services.hooks import get_extension_logger
+from app_utils.helpers import chunks
 from app_utils.logging import LoggerAddTag
 
 from .. import __title__
 from ..app_settings import MEMBERAUDIT_BULK_METHODS_BATCH_SIZE
+from ..core.asset_tree import AssetTree, build_asset_tree
+from ..core.skill_set_matrix import SkillSetMatrix
 from ..core.xml_converter import eve_xml_to_html
-from ..helpers import get_or_create_esi_or_none, get_or_create_or_none, get_or_none
+from ..helpers import (
+    bulk_get_or_create_map,
+    filter_existing_values,
+    filter_new_values,
+    get_or_create_esi_or_none,
+    get_or_none,
+    map_field_values,
+)
 
 logger = LoggerAddTag(get_extension_logger(__name__), __title__)
 
 
-class CharacterAssetManager(models.Manager):
+def _asset_total_expression() -> models.Expression:
+    """Expression for the total value of an asset. BPCs have no value."""
+    return Case(
+        When(
+            is_blueprint_copy=True,
+            then=Value(None),
+        ),
+        default=ExpressionWrapper(
+            F("eve_type__market_price__average_price") * F("quantity"),
+            output_field=models.FloatField(),
+        ),
+    )
+
+
+class CharacterAssetQuerySet(models.QuerySet):
     def annotate_pricing(self) -> models.QuerySet:
         """Returns qs with annotated price and total columns"""
         return (
@@ -40,19 +78,316 @@ class CharacterAssetManager(models.Manager):
                     default=F("eve_type__market_price__average_price"),
                 )
             )
+            .annotate(total=_asset_total_expression())
+        )
+
+    def location_totals(self) -> Dict[int, dict]:
+        """Item count and total value of assets for each location.
+
+        Both are aggregated by the database in one query.
+        Assets inside other assets are not counted.
+
+        Returns:
+            dict of location ID to dict with "items_count" and "total"
+        """
+        qs = (
+            self.filter(location__isnull=False)
+            .order_by()
+            .values("location_id")
             .annotate(
-                total=Case(
-                    When(
-                        is_blueprint_copy=True,
-                        then=Value(None),
-                    ),
-                    default=ExpressionWrapper(
-                        F("eve_type__market_price__average_price") * F("quantity"),
-                        output_field=models.FloatField(),
-                    ),
+                items_count=Count("pk"), items_total=Sum(_asset_total_expression())
+            )
+        )
+        return {
+            obj["location_id"]: {
+                "items_count": obj["items_count"],
+                "total": obj["items_total"],
+            }
+            for obj in qs
+        }
+
+    def descendants_of(self, asset: models.Model) -> models.QuerySet:
+        """Assets inside the given asset, including all nested assets."""
+        return self.filter(
+            character_id=asset.character_id,
+            path__startswith=f"{asset.path}{asset.item_id}/",
+        )
+
+    def ancestors_of(self, asset: models.Model) -> models.QuerySet:
+        """Assets the given asset is in, i.e. its parent and all their parents."""
+        item_ids = [int(item_id) for item_id in asset.path.split("/") if item_id]
+        return self.filter(character_id=asset.character_id, item_id__in=item_ids)
+
+    def root_location_of(self, asset: models.Model) -> Optional[models.Model]:
+        """Location of the top most parent of the given asset."""
+        from ..models import Location
+
+        return Location.objects.filter(pk=asset.root_location_id).first()
+
+    def located_in(self, location: models.Model) -> models.QuerySet:
+        """Assets which are in the given location,
+        including all assets inside containers and ships.
+        """
+        return self.filter(root_location=location)
+
+
+class CharacterAssetManagerBase(models.Manager):
+    _SYNCED_FIELDS = (
+        "location_id",
+        "parent_id",
+        "eve_type_id",
+        "name",
+        "is_blueprint_copy",
+        "is_singleton",
+        "location_flag",
+        "quantity",
+        "path",
+        "root_location_id",
+    )
+
+    @transaction.atomic()
+    def update_for_character(
+        self, character: models.Model, asset_list: list
+    ) -> AssetTree:
+        """Sync the asset tree of a character with the given asset list.
+
+        The tree is ordered in memory and then compared with the stored assets
+        by item ID, so that only new assets are created, only changed assets
+        are updated and only vanished assets are deleted.
+        New assets are written level by level, so parents are always created
+        before their children. Each asset gets the path of its parents
+        and the location of its top most parent.
+        Finally the contents of all assets are rolled up.
+
+        Returns the asset tree, which also reports items that could not be placed.
+        """
+        from ..models import Location
+
+        incoming_location_ids = {
+            item["location_id"] for item in asset_list if item.get("location_id")
+        }
+        location_ids = set(
+            Location.objects.filter(id__in=incoming_location_ids).values_list(
+                "id", flat=True
+            )
+        )
+        tree = build_asset_tree(asset_list, location_ids)
+        existing_assets = {
+            obj["item_id"]: obj
+            for obj in self.filter(character=character).values(
+                "pk", "item_id", *self._SYNCED_FIELDS
+            )
+        }
+        item_pks = {item_id: obj["pk"] for item_id, obj in existing_assets.items()}
+        positions = dict()
+        changed_assets = []
+        for depth, level in enumerate(tree.levels):
+            new_assets = []
+            for item in level:
+                item_id = item["item_id"]
+                if depth == 0:
+                    path, root_location_id = "/", item["location_id"]
+                else:
+                    parent_path, root_location_id = positions[item["location_id"]]
+                    path = f"{parent_path}{item['location_id']}/"
+                positions[item_id] = path, root_location_id
+                values = {
+                    "location_id": item["location_id"] if depth == 0 else None,
+                    "parent_id": item_pks[item["location_id"]] if depth > 0 else None,
+                    "eve_type_id": item.get("type_id"),
+                    "name": item.get("name"),
+                    "is_blueprint_copy": item.get("is_blueprint_copy"),
+                    "is_singleton": item.get("is_singleton"),
+                    "location_flag": item.get("location_flag"),
+                    "quantity": item.get("quantity"),
+                    "path": path,
+                    "root_location_id": root_location_id,
+                }
+                existing = existing_assets.get(item_id)
+                if not existing:
+                    new_assets.append(
+                        self.model(character=character, item_id=item_id, **values)
+                    )
+                elif any(existing[key] != value for key, value in values.items()):
+                    changed_assets.append(self.model(pk=existing["pk"], **values))
+
+            if new_assets:
+                logger.info(
+                    "%s: Creating %s assets on level %s",
+                    character,
+                    len(new_assets),
+                    depth,
+                )
+                self.bulk_create(
+                    new_assets, batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE
                 )
+                if depth + 1 < len(tree.levels):
+                    item_pks.update(
+                        self._item_pks_for_new_assets(character, new_assets)
+                    )
+
+        if changed_assets:
+            logger.info("%s: Updating %s assets", character, len(changed_assets))
+            self.bulk_update(
+                changed_assets,
+                fields=self._SYNCED_FIELDS,
+                batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE,
+            )
+
+        placed_ids = {item["item_id"] for item in tree.items()}
+        vanished_pks = [
+            obj["pk"]
+            for item_id, obj in existing_assets.items()
+            if item_id not in placed_ids
+        ]
+        if vanished_pks:
+            logger.info("%s: Deleting %s assets", character, len(vanished_pks))
+            for pks_chunk in chunks(vanished_pks, MEMBERAUDIT_BULK_METHODS_BATCH_SIZE):
+                self.filter(pk__in=pks_chunk).delete()
+
+        self.update_contents(character)
+        return tree
+
+    _CONTENTS_FIELDS = ("contents_count", "contents_total", "contents_volume")
+
+    def update_contents(self, character: models.Model) -> None:
+        """Update the aggregated contents of all assets of a character.
+
+        Count, value and volume of everything inside an asset are rolled up
+        from the leaves of the tree in memory, so the whole tree needs one query.
+        Only assets with changed contents are written.
+        """
+        assets = {
+            obj["pk"]: obj
+            for obj in self.filter(character=character)
+            .annotate_pricing()
+            .order_by("pk")
+            .values(
+                "pk",
+                "parent_id",
+                "quantity",
+                "eve_type__volume",
+                "total",
+                *self._CONTENTS_FIELDS,
+            )
+        }
+        children = defaultdict(list)
+        for obj in assets.values():
+            if obj["parent_id"] in assets:
+                children[obj["parent_id"]].append(obj["pk"])
+
+        levels = [[pk for pk, obj in assets.items() if obj["parent_id"] not in assets]]
+        while levels[-1]:
+            levels.append([child_pk for pk in levels[-1] for child_pk in children[pk]])
+
+        contents = dict()
+        for level in reversed(levels):
+            for pk in level:
+                count, total, volume = 0, 0.0, 0.0
+                for child_pk in children[pk]:
+                    child = assets[child_pk]
+                    child_count, child_total, child_volume = contents[child_pk]
+                    count += 1 + child_count
+                    total += (child["total"] or 0) + child_total
+                    volume += (
+                        child["quantity"] * (child["eve_type__volume"] or 0)
+                        + child_volume
+                    )
+                contents[pk] = (count, total, volume)
+
+        changed_assets = [
+            self.model(
+                pk=pk,
+                contents_count=count,
+                contents_total=total,
+                contents_volume=volume,
+            )
+            for pk, (count, total, volume) in contents.items()
+            if self._is_contents_changed(
+                (count, total, volume),
+                tuple(assets[pk][field] for field in self._CONTENTS_FIELDS),
+            )
+        ]
+        if changed_assets:
+            self.bulk_update(
+                changed_assets,
+                fields=self._CONTENTS_FIELDS,
+                batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE,
+            )
+
+    @staticmethod
+    def _is_contents_changed(contents: tuple, old_contents: tuple) -> bool:
+        """Compare contents, ignoring rounding differences of float totals."""
+        count, total, volume = contents
+        old_count, old_total, old_volume = old_contents
+        return (
+            count != old_count
+            or not math.isclose(total, old_total, abs_tol=0.01)
+            or not math.isclose(volume, old_volume, abs_tol=0.01)
+        )
+
+    def _item_pks_for_new_assets(
+        self, character: models.Model, new_assets: List[models.Model]
+    ) -> Dict[int, int]:
+        """Map item IDs to primary keys of freshly bulk created assets.
+
+        Uses the primary keys returned by bulk_create when the database supports it
+        and falls back to a single query for the whole character otherwise.
+        """
+        if connections[self.db].features.can_return_rows_from_bulk_insert:
+            return {obj.item_id: obj.pk for obj in new_assets}
+        return dict(self.filter(character=character).values_list("item_id", "pk"))
+
+
+CharacterAssetManager = CharacterAssetManagerBase.from_queryset(CharacterAssetQuerySet)
+
+
+class CharacterAssetValuationManager(models.Manager):
+    def update_for_character(self, character: models.Model) -> models.Model:
+        """Refresh today's asset valuation snapshot of a character.
+
+        All assets are valued with one query. Assets inside containers and ships
+        count towards the location of their top most parent.
+        Assets without a known location only count towards the totals
+        of their categories.
+        The snapshot is only written when a value has changed.
+        """
+        from ..models import CharacterAsset
+
+        assets = (
+            CharacterAsset.objects.filter(character=character)
+            .annotate_pricing()
+            .values_list(
+                "root_location_id", "eve_type__eve_group__eve_category_id", "total"
             )
         )
+        items_count = 0
+        location_totals = defaultdict(float)
+        category_totals = defaultdict(float)
+        for root_location_id, category_id, total in assets:
+            items_count += 1
+            if not total:
+                continue
+            if root_location_id:
+                location_totals[str(root_location_id)] += total
+            category_totals[str(category_id)] += total
+
+        values = {
+            "items_count": items_count,
+            "total": sum(category_totals.values()),
+            "location_totals": dict(location_totals),
+            "category_totals": dict(category_totals),
+        }
+        valuation, created = self.get_or_create(
+            character=character, date=now().date(), defaults=values
+        )
+        if not created and any(
+            getattr(valuation, field) != value for field, value in values.items()
+        ):
+            for field, value in values.items():
+                setattr(valuation, field, value)
+            valuation.save()
+        return valuation
 
 
 class CharacterContactLabelManager(models.Manager):
@@ -122,10 +457,13 @@ class CharacterContactManager(models.Manager):
             for contact_id, obj in contacts_list.items()
             if contact_id in contact_ids
         }
+        entities = bulk_get_or_create_map(
+            ["contact_id"], new_contacts_list.values(), EveEntity
+        )
         new_contacts = [
             self.model(
                 character=character,
-                eve_entity=get_or_create_or_none("contact_id", contact_data, EveEntity),
+                eve_entity=entities.get(contact_data.get("contact_id")),
                 is_blocked=contact_data.get("is_blocked"),
                 is_watched=contact_data.get("is_watched"),
                 standing=contact_data.get("standing"),
@@ -229,6 +567,11 @@ class CharacterContractManager(models.Manager):
         from ..models import Location
 
         logger.info("%s: Storing %s new contracts", character, len(contract_ids))
+        entities = bulk_get_or_create_map(
+            ["acceptor_id", "assignee_id", "issuer_corporation_id", "issuer_id"],
+            [contracts_list[contract_id] for contract_id in contract_ids],
+            EveEntity,
+        )
         new_contracts = list()
         for contract_id in contract_ids:
             contract_data = contracts_list.get(contract_id)
@@ -237,12 +580,8 @@ class CharacterContractManager(models.Manager):
                     self.model(
                         character=character,
                         contract_id=contract_data.get("contract_id"),
-                        acceptor=get_or_create_or_none(
-                            "acceptor_id", contract_data, EveEntity
-                        ),
-                        assignee=get_or_create_or_none(
-                            "assignee_id", contract_data, EveEntity
-                        ),
+                        acceptor=entities.get(contract_data.get("acceptor_id")),
+                        assignee=entities.get(contract_data.get("assignee_id")),
                         availability=self.model.ESI_AVAILABILITY_MAP[
                             contract_data.get("availability")
                         ],
@@ -261,12 +600,10 @@ class CharacterContractManager(models.Manager):
                             "end_location_id", contract_data, Location
                         ),
                         for_corporation=contract_data.get("for_corporation"),
-                        issuer_corporation=get_or_create_or_none(
-                            "issuer_corporation_id", contract_data, EveEntity
-                        ),
-                        issuer=get_or_create_or_none(
-                            "issuer_id", contract_data, EveEntity
+                        issuer_corporation=entities.get(
+                            contract_data.get("issuer_corporation_id")
                         ),
+                        issuer=entities.get(contract_data.get("issuer_id")),
                         price=contract_data.get("price"),
                         reward=contract_data.get("reward"),
                         start_location=get_or_none(
@@ -290,14 +627,17 @@ class CharacterContractManager(models.Manager):
             )
         )
         contracts = self.in_bulk(update_contract_pks)
+        entities = bulk_get_or_create_map(
+            ["acceptor_id", "acceptor_corporation_id"],
+            [contracts_list[contract_id] for contract_id in contract_ids],
+            EveEntity,
+        )
         for contract in contracts.values():
             contract_data = contracts_list.get(contract.contract_id)
             if contract_data:
-                contract.acceptor = get_or_create_or_none(
-                    "acceptor_id", contract_data, EveEntity
-                )
-                contract.acceptor_corporation = get_or_create_or_none(
-                    "acceptor_corporation_id", contract_data, EveEntity
+                contract.acceptor = entities.get(contract_data.get("acceptor_id"))
+                contract.acceptor_corporation = entities.get(
+                    contract_data.get("acceptor_corporation_id")
                 )
                 contract.date_accepted = contract_data.get("date_accepted")
                 contract.date_completed = contract_data.get("date_completed")
@@ -338,16 +678,17 @@ class CharacterContractBidManager(models.Manager):
             contract.contract_id,
             len(create_ids),
         )
+        new_bids = [bid for bid_id, bid in bids_list.items() if bid_id in create_ids]
+        entities = bulk_get_or_create_map(["bidder_id"], new_bids, EveEntity)
         bids = [
             self.model(
                 contract=contract,
                 bid_id=bid.get("bid_id"),
                 amount=bid.get("amount"),
-                bidder=get_or_create_or_none("bidder_id", bid, EveEntity),
+                bidder=entities.get(bid.get("bidder_id")),
                 date_bid=bid.get("date_bid"),
             )
-            for bid_id, bid in bids_list.items()
-            if bid_id in create_ids
+            for bid in new_bids
         ]
         self.bulk_create(bids, batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE)
 
@@ -407,11 +748,12 @@ class CharacterContractItemManager(models.Manager):
 
 class CharacterCorporationHistoryManager(models.Manager):
     def update_for_character(self, character: models.Model, history):
+        entities = bulk_get_or_create_map(["corporation_id"], history, EveEntity)
         entries = [
             self.model(
                 character=character,
                 record_id=row.get("record_id"),
-                corporation=get_or_create_or_none("corporation_id", row, EveEntity),
+                corporation=entities.get(row.get("corporation_id")),
                 is_deleted=row.get("is_deleted"),
                 start_date=row.get("start_date"),
             )
@@ -461,11 +803,14 @@ class CharacterDetailsManager(models.Manager):
         # TODO: Remove once issue is fixed
         # Workaround because of ESI issue #1264
         eve_ancestry = get_or_none("ancestry_id", details, EveAncestry)
+        entities = bulk_get_or_create_map(
+            ["alliance_id", "corporation_id"], [details], EveEntity
+        )
 
         self.update_or_create(
             character=character,
             defaults={
-                "alliance": get_or_create_or_none("alliance_id", details, EveEntity),
+                "alliance": entities.get(details.get("alliance_id")),
                 "birthday": details.get("birthday"),
                 "eve_ancestry": eve_ancestry,
                 "eve_bloodline": get_or_create_esi_or_none(
@@ -475,9 +820,7 @@ class CharacterDetailsManager(models.Manager):
                     "faction_id", details, EveFaction
                 ),
                 "eve_race": get_or_create_esi_or_none("race_id", details, EveRace),
-                "corporation": get_or_create_or_none(
-                    "corporation_id", details, EveEntity
-                ),
+                "corporation": entities.get(details.get("corporation_id")),
                 "description": description,
                 "gender": gender,
                 "name": details.get("name", ""),
@@ -540,10 +883,13 @@ class CharacterLoyaltyEntryManager(models.Manager):
     @transaction.atomic()
     def update_for_character(self, character: models.Model, loyalty_entries):
         self.filter(character=character).delete()
+        entities = bulk_get_or_create_map(
+            ["corporation_id"], loyalty_entries, EveEntity
+        )
         new_entries = [
             self.model(
                 character=character,
-                corporation=get_or_create_or_none("corporation_id", entry, EveEntity),
+                corporation=entities.get(entry.get("corporation_id")),
                 loyalty_points=entry.get("loyalty_points"),
             )
             for entry in loyalty_entries
@@ -739,91 +1085,348 @@ class CharacterSkillManager(models.Manager):
 
 
 class CharacterSkillSetCheckManager(models.Manager):
-    @transaction.atomic()
     def update_for_character(self, character):
+        self.update_for_characters([character.pk])
+
+    def update_for_characters(self, character_pks: Iterable[int]):
+        """Update skill set checks for many characters in one pass.
+
+        All characters are checked against the compiled requirement matrix
+        of all skill sets, so the number of queries does not depend
+        on the number of skill sets.
+        """
         from ..models import SkillSet
 
-        character_skills = {
-            obj["eve_type_id"]: obj["active_skill_level"]
-            for obj in character.skills.values("eve_type_id", "active_skill_level")
-        }
-        self.filter(character=character).all().delete()
-        skill_sets_qs = SkillSet.objects.prefetch_related(
-            "skills", "skills__eve_type"
-        ).all()
-        skill_sets_count = skill_sets_qs.count()
-        if skill_sets_count == 0:
-            logger.info("%s: No skill sets defined", character)
-            return
+        matrix = SkillSet.objects.requirement_matrix()
+        if not matrix.skill_set_ids:
+            logger.info("No skill sets defined")
+        for character_pks_chunk in chunks(
+            list(character_pks), MEMBERAUDIT_BULK_METHODS_BATCH_SIZE
+        ):
+            self._update_characters_chunk(character_pks_chunk, matrix)
+
+    def update_for_skill_sets(self, skill_set_ids: Iterable[int]):
+        """Update checks of the given skill sets for all characters in one pass.
+
+        Only skills needed by the given skill sets are read
+        and only checks of those skill sets are written.
+        Requirements are compiled fresh, because this runs right after
+        skill sets have been changed.
+        """
+        from ..models import Character, SkillSet
+
+        skill_set_ids = set(skill_set_ids)
+        matrix = SkillSet.objects.requirement_matrix(use_cache=False).subset(
+            skill_set_ids
+        )
+        if not matrix.skill_set_ids:
+            return  # checks of deleted skill sets are removed by cascade
+        character_pks = list(Character.objects.values_list("pk", flat=True))
+        for character_pks_chunk in chunks(
+            character_pks, MEMBERAUDIT_BULK_METHODS_BATCH_SIZE
+        ):
+            self._update_characters_chunk(character_pks_chunk, matrix, skill_set_ids)
 
-        logger.info("%s: Checking %s skill sets", character, skill_sets_count)
-        skill_set_checks = [
-            self.model(character=character, skill_set=skill_set)
-            for skill_set in skill_sets_qs
-        ]
-        self.bulk_create(
-            skill_set_checks, batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE
+    @transaction.atomic()
+    def _update_characters_chunk(
+        self,
+        character_pks: List[int],
+        matrix: SkillSetMatrix,
+        skill_set_ids: Optional[Set[int]] = None,
+    ):
+        """Update checks of characters by applying only the differences.
+
+        Checks are created or deleted when skill sets were added or removed,
+        and failed skills are only added or removed when the outcome has changed.
+        When skill set IDs are given, only checks of those skill sets are updated.
+        """
+        from ..models import CharacterSkill, CharacterSkillSetReportRow
+
+        logger.info(
+            "Checking %s skill sets for %s characters",
+            len(matrix.skill_set_ids),
+            len(character_pks),
+        )
+        skill_levels = {character_pk: dict() for character_pk in character_pks}
+        for character_pk, eve_type_id, level in CharacterSkill.objects.filter(
+            character_id__in=character_pks, eve_type_id__in=matrix.eve_type_ids
+        ).values_list("character_id", "eve_type_id", "active_skill_level"):
+            skill_levels[character_pk][eve_type_id] = level
+
+        results = {
+            (character_pk, skill_set_id): result
+            for character_pk, levels in skill_levels.items()
+            for skill_set_id, result in matrix.check(levels).items()
+        }
+        checks_qs = self.filter(character_id__in=character_pks)
+        if skill_set_ids is not None:
+            checks_qs = checks_qs.filter(skill_set_id__in=skill_set_ids)
+        check_pks = self._sync_checks(checks_qs, character_pks, results.keys())
+        self._sync_failed_skills(
+            self.model.failed_required_skills.through,
+            checks_qs,
+            {
+                (check_pks[key], skill_id)
+                for key, result in results.items()
+                for skill_id in result.failed_required_skill_ids
+            },
         )
+        self._sync_failed_skills(
+            self.model.failed_recommended_skills.through,
+            checks_qs,
+            {
+                (check_pks[key], skill_id)
+                for key, result in results.items()
+                for skill_id in result.failed_recommended_skill_ids
+            },
+        )
+        CharacterSkillSetReportRow.objects.update_for_characters(character_pks)
 
-        # add failed recommended / required skills to objects if any
-        obj_pks = list(self.filter(character=character).values_list("pk", flat=True))
-        skill_set_checks = self.in_bulk(obj_pks)
-        checks_by_skill_set_id = {
-            obj.skill_set_id: obj for obj in skill_set_checks.values()
+    def _sync_checks(
+        self,
+        checks_qs: models.QuerySet,
+        character_pks: List[int],
+        keys: Iterable[tuple],
+    ) -> Dict[tuple, int]:
+        """Create missing and delete obsolete checks.
+
+        Returns map of (character_pk, skill_set_id) to pk for all checks.
+        """
+        check_pks = {
+            (character_pk, skill_set_id): pk
+            for character_pk, skill_set_id, pk in checks_qs.values_list(
+                "character_id", "skill_set_id", "pk"
+            )
         }
+        keys = set(keys)
+        obsolete_pks = [pk for key, pk in check_pks.items() if key not in keys]
+        for pks_chunk in chunks(obsolete_pks, MEMBERAUDIT_BULK_METHODS_BATCH_SIZE):
+            self.filter(pk__in=pks_chunk).delete()
+        new_checks = [
+            self.model(character_id=character_pk, skill_set_id=skill_set_id)
+            for character_pk, skill_set_id in keys.difference(check_pks.keys())
+        ]
+        if new_checks:
+            self.bulk_create(new_checks, batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE)
+            check_pks.update(self._check_pks_for_new_checks(character_pks, new_checks))
+        return check_pks
 
-        # required skills
-        for skill_set in skill_sets_qs:
-            failed_skills = self._identify_failed_skills(
-                skill_set, character_skills, "required"
+    @staticmethod
+    def _sync_failed_skills(
+        through: type, checks_qs: models.QuerySet, failed_skills: Set[tuple]
+    ):
+        """Add and remove links between checks and failed skills."""
+        current_links = {
+            (check_pk, skill_id): pk
+            for pk, check_pk, skill_id in through.objects.filter(
+                characterskillsetcheck__in=checks_qs
+            ).values_list("pk", "characterskillsetcheck_id", "skillsetskill_id")
+        }
+        obsolete_pks = [
+            pk for link, pk in current_links.items() if link not in failed_skills
+        ]
+        for pks_chunk in chunks(obsolete_pks, MEMBERAUDIT_BULK_METHODS_BATCH_SIZE):
+            through.objects.filter(pk__in=pks_chunk).delete()
+        new_links = [
+            through(characterskillsetcheck_id=check_pk, skillsetskill_id=skill_id)
+            for check_pk, skill_id in failed_skills.difference(current_links.keys())
+        ]
+        if new_links:
+            through.objects.bulk_create(
+                new_links, batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE
             )
-            if failed_skills:
-                checks_by_skill_set_id[skill_set.id].failed_required_skills.add(
-                    *failed_skills
-                )
 
-        # required skills
-        for skill_set in skill_sets_qs:
-            failed_skills = self._identify_failed_skills(
-                skill_set, character_skills, "recommended"
+    def _check_pks_for_new_checks(
+        self, character_pks: List[int], checks: List[models.Model]
+    ) -> Dict[tuple, int]:
+        """Map of (character_pk, skill_set_id) to pk for newly created checks."""
+        if connections[self.db].features.can_return_rows_from_bulk_insert:
+            return {(obj.character_id, obj.skill_set_id): obj.pk for obj in checks}
+        return {
+            (character_pk, skill_set_id): pk
+            for character_pk, skill_set_id, pk in self.filter(
+                character_id__in=character_pks
+            ).values_list("character_id", "skill_set_id", "pk")
+        }
+
+
+class CharacterSkillSetReportRowManager(models.Manager):
+    _SYNCED_FIELDS = (
+        "group_name",
+        "is_doctrine",
+        "character_name",
+        "character_eve_id",
+        "is_main",
+        "main_name",
+        "main_eve_id",
+        "state_name",
+        "corporation_name",
+        "alliance_name",
+        "alliance_ticker",
+        "has_required",
+        "skill_sets",
+    )
+
+    def update_for_characters(self, character_pks: Iterable[int]):
+        """Recompute the skill sets report rows of the given characters
+        from their current skill set checks.
+        """
+        for character_pks_chunk in chunks(
+            list(character_pks), MEMBERAUDIT_BULK_METHODS_BATCH_SIZE
+        ):
+            self._update_characters_chunk(character_pks_chunk)
+
+    @transaction.atomic()
+    def _update_characters_chunk(self, character_pks: List[int]):
+        """Update report rows of characters with one row per skill set group.
+
+        Skill sets without a group are reported in a row without group.
+        Characters in the guest state are not reported.
+        Only rows which have changed are written.
+        """
+        from ..models import (
+            Character,
+            CharacterSkillSetCheck,
+            SkillSet,
+            SkillSetGroup,
+            SkillSetSkill,
+        )
+
+        skill_sets = {
+            pk: (name, ship_type_id)
+            for pk, name, ship_type_id in SkillSet.objects.values_list(
+                "pk", "name", "ship_type_id"
             )
-            if failed_skills:
-                checks_by_skill_set_id[skill_set.id].failed_recommended_skills.add(
-                    *failed_skills
+        }
+        groups = SkillSetGroup.objects.in_bulk()
+        group_ids_by_skill_set = defaultdict(list)
+        for skill_set_id, group_id in SkillSet.groups.through.objects.values_list(
+            "skillset_id", "skillsetgroup_id"
+        ):
+            group_ids_by_skill_set[skill_set_id].append(group_id)
+
+        failed_required_skills = SkillSetSkill.objects.filter(
+            failed_required_skill_set_checks__pk=OuterRef("pk")
+        )
+        can_fly_by_row = defaultdict(list)
+        for character_pk, skill_set_id, can_fly in (
+            CharacterSkillSetCheck.objects.filter(character_id__in=character_pks)
+            .exclude(
+                character__eve_character__character_ownership__user__profile__state__pk=(
+                    get_guest_state_pk()
                 )
+            )
+            .annotate(can_fly=~Exists(failed_required_skills))
+            .values_list("character_id", "skill_set_id", "can_fly")
+        ):
+            for group_id in group_ids_by_skill_set.get(skill_set_id) or [None]:
+                skill_set_ids = can_fly_by_row[(character_pk, group_id)]
+                if can_fly:
+                    skill_set_ids.append(skill_set_id)
+
+        characters = Character.objects.select_related(
+            "eve_character__character_ownership__user__profile__main_character",
+            "eve_character__character_ownership__user__profile__state",
+        ).in_bulk({character_pk for character_pk, _ in can_fly_by_row.keys()})
+        rows = {
+            key: self._create_row(
+                characters[key[0]],
+                groups.get(key[1]),
+                sorted(
+                    (skill_sets[skill_set_id] for skill_set_id in skill_set_ids),
+                    key=lambda obj: obj[0].lower(),
+                ),
+            )
+            for key, skill_set_ids in can_fly_by_row.items()
+        }
+        self._sync_rows(character_pks, rows)
 
-    @staticmethod
-    def _identify_failed_skills(
-        skill_set: models.Model, character_skills: dict, level_name: str
-    ) -> list:
-        failed_skills = list()
-        kwargs = {f"{level_name}_level__isnull": False}
-        for skill in skill_set.skills.filter(**kwargs):
-            eve_type_id = skill.eve_type_id
-            if eve_type_id not in character_skills or character_skills[
-                eve_type_id
-            ] < getattr(skill, f"{level_name}_level"):
-                failed_skills.append(skill)
+    def _sync_rows(self, character_pks: List[int], rows: Dict[tuple, models.Model]):
+        """Create, change and delete rows of characters to match the given rows."""
+        current_rows = {
+            (obj.character_id, obj.group_id): obj
+            for obj in self.filter(character_id__in=character_pks)
+        }
+        obsolete_pks = [obj.pk for key, obj in current_rows.items() if key not in rows]
+        for pks_chunk in chunks(obsolete_pks, MEMBERAUDIT_BULK_METHODS_BATCH_SIZE):
+            self.filter(pk__in=pks_chunk).delete()
+        new_rows = []
+        changed_rows = []
+        for key, row in rows.items():
+            current_row = current_rows.get(key)
+            if not current_row:
+                new_rows.append(row)
+            elif any(
+                getattr(row, field) != getattr(current_row, field)
+                for field in self._SYNCED_FIELDS
+            ):
+                row.pk = current_row.pk
+                changed_rows.append(row)
+        if new_rows:
+            self.bulk_create(new_rows, batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE)
+        if changed_rows:
+            self.bulk_update(
+                changed_rows,
+                fields=self._SYNCED_FIELDS,
+                batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE,
+            )
 
-        return failed_skills
+    def _create_row(
+        self, character: models.Model, group: Optional[models.Model], skill_sets: list
+    ) -> models.Model:
+        eve_character = character.eve_character
+        main_character = character.main_character
+        user = character.user
+        return self.model(
+            character=character,
+            group=group,
+            group_name=group.name if group else "",
+            is_doctrine=group.is_doctrine if group else False,
+            character_name=eve_character.character_name,
+            character_eve_id=eve_character.character_id,
+            is_main=character.is_main,
+            main_name=main_character.character_name if main_character else "",
+            main_eve_id=main_character.character_id if main_character else None,
+            state_name=user.profile.state.name if user else "",
+            corporation_name=eve_character.corporation_name,
+            alliance_name=eve_character.alliance_name or "",
+            alliance_ticker=eve_character.alliance_ticker or "",
+            has_required=bool(skill_sets),
+            skill_sets=[list(obj) for obj in skill_sets],
+        )
 
 
 class CharacterWalletJournalEntryManager(models.Manager):
     def update_for_character(
         self, character: models.Model, cutoff_datetime: dt.datetime, journal: list
+    ):
+        self.update_pages_for_character(character, cutoff_datetime, [journal])
+
+    def update_pages_for_character(
+        self,
+        character: models.Model,
+        cutoff_datetime: dt.datetime,
+        pages: Iterable[list],
+    ):
+        """Update journal from ESI pages, which are written one page at a time."""
+        if cutoff_datetime:
+            self.filter(character=character, date__lt=cutoff_datetime).delete()
+
+        for journal in pages:
+            self._add_new_entries(character, cutoff_datetime, journal)
+
+    def _add_new_entries(
+        self, character: models.Model, cutoff_datetime: dt.datetime, journal: list
     ):
         entries_list = {
             obj.get("id"): obj
             for obj in journal
             if cutoff_datetime is None or obj.get("date") > cutoff_datetime
         }
-        if cutoff_datetime:
-            self.filter(character=character, date__lt=cutoff_datetime).delete()
-
         with transaction.atomic():
-            incoming_ids = set(entries_list.keys())
-            existing_ids = set(self.values_list("entry_id", flat=True))
-            create_ids = incoming_ids.difference(existing_ids)
+            create_ids = filter_new_values(
+                self.filter(character=character), "entry_id", entries_list.keys()
+            )
             if not create_ids:
                 logger.info("%s: No new wallet journal entries", character)
                 return
@@ -831,6 +1434,11 @@ class CharacterWalletJournalEntryManager(models.Manager):
             logger.info(
                 "%s: Adding %s new wallet journal entries", character, len(create_ids)
             )
+            entities = bulk_get_or_create_map(
+                ["first_party_id", "second_party_id"],
+                [entries_list[entry_id] for entry_id in create_ids],
+                EveEntity,
+            )
             entries = [
                 self.model(
                     character=character,
@@ -843,12 +1451,10 @@ class CharacterWalletJournalEntryManager(models.Manager):
                     ),
                     date=row.get("date"),
                     description=row.get("description"),
-                    first_party=get_or_create_or_none("first_party_id", row, EveEntity),
+                    first_party=entities.get(row.get("first_party_id")),
                     reason=row.get("reason", ""),
                     ref_type=row.get("ref_type"),
-                    second_party=get_or_create_or_none(
-                        "second_party_id", row, EveEntity
-                    ),
+                    second_party=entities.get(row.get("second_party_id")),
                     tax=row.get("tax"),
                     tax_receiver=row.get("tax_receiver"),
                 )
@@ -878,9 +1484,11 @@ class CharacterWalletTransactionManager(models.Manager):
         EveType.objects.bulk_get_or_create_esi(ids=type_ids)
 
         with transaction.atomic():
-            incoming_ids = set(transaction_list.keys())
-            existing_ids = set(self.values_list("transaction_id", flat=True))
-            create_ids = incoming_ids.difference(existing_ids)
+            create_ids = filter_new_values(
+                self.filter(character=character),
+                "transaction_id",
+                transaction_list.keys(),
+            )
             if not create_ids:
                 logger.info("%s: No new wallet transcations", character)
                 return
@@ -890,30 +1498,45 @@ class CharacterWalletTransactionManager(models.Manager):
                 character,
                 len(create_ids),
             )
-            entries = []
-            for transaction_id, row in transaction_list.items():
-                if transaction_id in create_ids:
-                    try:
-                        journal_entry = character.wallet_journal.get(
-                            entry_id=row.get("journal_ref_id")
-                        )
-                    except character.wallet_journal.model.DoesNotExist:
-                        journal_entry = None
-                    entries.append(
-                        self.model(
-                            character=character,
-                            transaction_id=transaction_id,
-                            client=get_or_create_or_none("client_id", row, EveEntity),
-                            date=row.get("date"),
-                            is_buy=row.get("is_buy"),
-                            is_personal=row.get("is_personal"),
-                            journal_ref=journal_entry,
-                            location=get_or_none("location_id", row, Location),
-                            eve_type=EveType.objects.get(id=row.get("type_id")),
-                            quantity=row.get("quantity"),
-                            unit_price=row.get("unit_price"),
-                        )
-                    )
+            new_rows = [
+                row
+                for transaction_id, row in transaction_list.items()
+                if transaction_id in create_ids
+            ]
+            journal_pks = map_field_values(
+                character.wallet_journal.all(),
+                "entry_id",
+                "pk",
+                {
+                    row["journal_ref_id"]
+                    for row in new_rows
+                    if row.get("journal_ref_id")
+                },
+            )
+            location_ids = filter_existing_values(
+                Location.objects, "id", {row.get("location_id") for row in new_rows}
+            )
+            entities = bulk_get_or_create_map(["client_id"], new_rows, EveEntity)
+            entries = [
+                self.model(
+                    character=character,
+                    transaction_id=row.get("transaction_id"),
+                    client=entities.get(row.get("client_id")),
+                    date=row.get("date"),
+                    is_buy=row.get("is_buy"),
+                    is_personal=row.get("is_personal"),
+                    journal_ref_id=journal_pks.get(row.get("journal_ref_id")),
+                    location_id=(
+                        row.get("location_id")
+                        if row.get("location_id") in location_ids
+                        else None
+                    ),
+                    eve_type_id=row.get("type_id"),
+                    quantity=row.get("quantity"),
+                    unit_price=row.get("unit_price"),
+                )
+                for row in new_rows
+            ]
             self.bulk_create(entries, batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE)
 
         EveEntity.objects.bulk_update_new_esi()
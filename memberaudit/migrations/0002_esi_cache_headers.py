@@ -0,0 +1,43 @@
+# Generated by Django 3.2.25 on 2026-10-17 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memberaudit", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="characterupdatestatus",
+            name="esi_etag_1",
+            field=models.CharField(default="", max_length=128),
+        ),
+        migrations.AddField(
+            model_name="characterupdatestatus",
+            name="esi_etag_2",
+            field=models.CharField(default="", max_length=128),
+        ),
+        migrations.AddField(
+            model_name="characterupdatestatus",
+            name="esi_etag_3",
+            field=models.CharField(default="", max_length=128),
+        ),
+        migrations.AddField(
+            model_name="characterupdatestatus",
+            name="esi_expires_1",
+            field=models.DateTimeField(default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name="characterupdatestatus",
+            name="esi_expires_2",
+            field=models.DateTimeField(default=None, null=True),
+        ),
+        migrations.AddField(
+            model_name="characterupdatestatus",
+            name="esi_expires_3",
+            field=models.DateTimeField(default=None, null=True),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 3.2.25 on 2026-10-17 10:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memberaudit", "0002_esi_cache_headers"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CharacterSkillSetReportRow",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("group_name", models.CharField(default="", max_length=100)),
+                ("is_doctrine", models.BooleanField(default=False)),
+                ("character_name", models.CharField(max_length=100)),
+                ("character_eve_id", models.PositiveIntegerField()),
+                ("is_main", models.BooleanField(default=False)),
+                ("main_name", models.CharField(default="", max_length=100)),
+                ("main_eve_id", models.PositiveIntegerField(default=None, null=True)),
+                ("state_name", models.CharField(default="", max_length=100)),
+                ("corporation_name", models.CharField(default="", max_length=100)),
+                ("alliance_name", models.CharField(default="", max_length=100)),
+                ("alliance_ticker", models.CharField(default="", max_length=100)),
+                (
+                    "has_required",
+                    models.BooleanField(
+                        default=False,
+                        help_text="Whether the character has the required skills for any skill set",
+                    ),
+                ),
+                (
+                    "skill_sets",
+                    models.JSONField(
+                        default=list,
+                        help_text="Name and ship type ID of each skill set the character has the required skills for",
+                    ),
+                ),
+                (
+                    "character",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="skill_set_report_rows",
+                        to="memberaudit.character",
+                    ),
+                ),
+                (
+                    "group",
+                    models.ForeignKey(
+                        default=None,
+                        help_text="Skill set group of this row or None for ungrouped skill sets",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="memberaudit.skillsetgroup",
+                    ),
+                ),
+            ],
+            options={
+                "default_permissions": (),
+            },
+        ),
+        migrations.AddIndex(
+            model_name="characterskillsetreportrow",
+            index=models.Index(
+                fields=["group_name", "main_name", "character_name"],
+                name="memberaudit_skill_report_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="characterskillsetreportrow",
+            constraint=models.UniqueConstraint(
+                fields=("character", "group"),
+                name="functional_pk_characterskillsetreportrow",
+            ),
+        ),
+    ]
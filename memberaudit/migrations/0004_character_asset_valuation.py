@@ -0,0 +1,64 @@
+# Generated by Django 3.2.25 on 2026-10-17 10:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memberaudit", "0003_skill_sets_report_rows"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CharacterAssetValuation",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(db_index=True)),
+                ("items_count", models.PositiveIntegerField(default=0)),
+                ("total", models.FloatField(default=0)),
+                (
+                    "location_totals",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Total value of assets by location ID, including all assets inside containers and ships",
+                    ),
+                ),
+                (
+                    "category_totals",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Total value of assets by Eve category ID",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "character",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="asset_valuations",
+                        to="memberaudit.character",
+                    ),
+                ),
+            ],
+            options={
+                "default_permissions": (),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="characterassetvaluation",
+            constraint=models.UniqueConstraint(
+                fields=("character", "date"),
+                name="functional_pk_characterassetvaluation",
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.25 on 2026-10-17 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memberaudit", "0004_character_asset_valuation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="characterasset",
+            name="contents_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Number of assets inside this asset, including nested containers",
+            ),
+        ),
+        migrations.AddField(
+            model_name="characterasset",
+            name="contents_total",
+            field=models.FloatField(
+                default=0, help_text="Estimated value of all assets inside this asset"
+            ),
+        ),
+        migrations.AddField(
+            model_name="characterasset",
+            name="contents_volume",
+            field=models.FloatField(
+                default=0, help_text="Volume of all assets inside this asset"
+            ),
+        ),
+    ]
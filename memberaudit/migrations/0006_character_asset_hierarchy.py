@@ -0,0 +1,79 @@
+# Generated by Django 3.2.25 on 2026-10-17 10:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_asset_hierarchy(apps, schema_editor):
+    """Compute path and root location of existing assets from their parents."""
+    CharacterAsset = apps.get_model("memberaudit", "CharacterAsset")
+    character_ids = (
+        CharacterAsset.objects.values_list("character_id", flat=True)
+        .order_by()
+        .distinct()
+    )
+    for character_id in character_ids:
+        assets = {
+            obj.pk: obj
+            for obj in CharacterAsset.objects.filter(character_id=character_id).only(
+                "pk", "item_id", "parent_id", "location_id"
+            )
+        }
+        children = {}
+        for obj in assets.values():
+            children.setdefault(obj.parent_id, []).append(obj)
+        level = children.get(None, [])
+        for obj in level:
+            obj.path = "/"
+            obj.root_location_id = obj.location_id
+        changed_assets = []
+        while level:
+            changed_assets += level
+            next_level = []
+            for parent in level:
+                for obj in children.get(parent.pk, []):
+                    obj.path = f"{parent.path}{parent.item_id}/"
+                    obj.root_location_id = parent.root_location_id
+                    next_level.append(obj)
+            level = next_level
+        CharacterAsset.objects.bulk_update(
+            changed_assets, fields=["path", "root_location"], batch_size=500
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memberaudit", "0005_character_asset_contents"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="characterasset",
+            name="path",
+            field=models.CharField(
+                default="",
+                help_text="Item IDs of all parents of this asset from the top most parent, e.g. '/1/2/' for an asset in container 2 within ship 1",
+                max_length=255,
+            ),
+        ),
+        migrations.AddField(
+            model_name="characterasset",
+            name="root_location",
+            field=models.ForeignKey(
+                default=None,
+                help_text="Location of the top most parent of this asset",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="memberaudit.location",
+            ),
+        ),
+        migrations.RunPython(fill_asset_hierarchy, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="characterasset",
+            index=models.Index(
+                fields=["character", "path"], name="memberaudit_asset_path_idx"
+            ),
+        ),
+    ]
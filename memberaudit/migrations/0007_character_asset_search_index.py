@@ -0,0 +1,20 @@
+# Generated by Django 3.2.25 on 2026-10-17 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memberaudit", "0006_character_asset_hierarchy"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="characterasset",
+            index=models.Index(
+                fields=["eve_type", "character", "root_location"],
+                name="memberaudit_asset_search_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 3.2.25 on 2026-10-17 10:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memberaudit", "0007_character_asset_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="access_errors",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Count of consecutive access errors when fetching this structure",
+            ),
+        ),
+        migrations.AddField(
+            model_name="location",
+            name="access_retry_at",
+            field=models.DateTimeField(
+                blank=True,
+                default=None,
+                help_text="This structure will not be fetched from ESI again before this time",
+                null=True,
+            ),
+        ),
+        migrations.CreateModel(
+            name="LocationAccess",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("has_access", models.BooleanField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "character",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="memberaudit.character",
+                    ),
+                ),
+                (
+                    "location",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="accesses",
+                        to="memberaudit.location",
+                    ),
+                ),
+            ],
+            options={
+                "default_permissions": (),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="locationaccess",
+            constraint=models.UniqueConstraint(
+                fields=("location", "character"), name="functional_pk_locationaccess"
+            ),
+        ),
+    ]
@@ -5,12 +5,14 @@ from .general import (  # noqa: F401
     EveSkillType,
     General,
     Location,
+    LocationAccess,
     SkillSet,
     SkillSetGroup,
     SkillSetSkill,
 )
 from .sections import (  # noqa: F401
     CharacterAsset,
+    CharacterAssetValuation,
     CharacterAttributes,
     CharacterContact,
     CharacterContactLabel,
@@ -31,6 +33,7 @@ from .sections import (  # noqa: F401
     CharacterSkillpoints,
     CharacterSkillqueueEntry,
     CharacterSkillSetCheck,
+    CharacterSkillSetReportRow,
     CharacterWalletBalance,
     CharacterWalletJournalEntry,
     CharacterWalletTransaction,
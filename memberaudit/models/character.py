@@ -6,11 +6,13 @@ import datetime as dt
 import hashlib
 import json
 import os
-from typing import Any, Optional
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, NamedTuple, Optional, Tuple
 
-from bravado.exception import HTTPNotFound
+from bravado.exception import HTTPNotFound, HTTPNotModified
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
@@ -34,6 +36,7 @@ from ..app_settings import (
     MEMBERAUDIT_APP_NAME,
     MEMBERAUDIT_DATA_RETENTION_LIMIT,
     MEMBERAUDIT_DEVELOPER_MODE,
+    MEMBERAUDIT_TASKS_TOKEN_CACHE_TIMEOUT,
     MEMBERAUDIT_UPDATE_STALE_OFFSET,
     MEMBERAUDIT_UPDATE_STALE_RING_1,
     MEMBERAUDIT_UPDATE_STALE_RING_2,
@@ -41,6 +44,7 @@ from ..app_settings import (
 )
 from ..core.xml_converter import eve_xml_to_html
 from ..decorators import fetch_token_for_character
+from ..helpers import iter_esi_pages
 from ..managers.character import CharacterManager, CharacterUpdateStatusManager
 from ..providers import esi
 from .general import Location
@@ -48,6 +52,25 @@ from .general import Location
 logger = LoggerAddTag(get_extension_logger(__name__), __title__)
 
 
+class EsiCacheHeaders(NamedTuple):
+    """Caching headers of an ESI response"""
+
+    etag: str = ""
+    expires: Optional[dt.datetime] = None
+
+    @classmethod
+    def from_response(cls, response) -> "EsiCacheHeaders":
+        """creates new object from the headers of a response"""
+        headers = {
+            str(key).lower(): value for key, value in dict(response.headers).items()
+        }
+        try:
+            expires = parsedate_to_datetime(headers["expires"])
+        except (KeyError, TypeError, ValueError):
+            expires = None
+        return cls(etag=headers.get("etag") or "", expires=expires)
+
+
 def data_retention_cutoff() -> Optional[dt.datetime]:
     """returns cutoff datetime for data retention of None if unlimited"""
     if MEMBERAUDIT_DATA_RETENTION_LIMIT is None:
@@ -132,6 +155,19 @@ class Character(models.Model):
         UpdateSection.ATTRIBUTES: 3,
     }
 
+    BUNDLED_UPDATE_SECTIONS = frozenset(
+        {
+            UpdateSection.ATTRIBUTES,
+            UpdateSection.IMPLANTS,
+            UpdateSection.LOCATION,
+            UpdateSection.ONLINE_STATUS,
+            UpdateSection.SHIP,
+            UpdateSection.SKILL_QUEUE,
+            UpdateSection.WALLET_BALLANCE,
+        }
+    )
+    """Light sections, which can be fetched concurrently in a bundled update."""
+
     id = models.AutoField(primary_key=True)
     eve_character = models.OneToOneField(
         EveCharacter, related_name="memberaudit_character", on_delete=models.CASCADE
@@ -239,7 +275,11 @@ class Character(models.Model):
     @classmethod
     def update_section_time_until_stale(cls, section: str) -> dt.timedelta:
         """time until given update section is considered stale"""
-        ring = cls.UPDATE_SECTION_RINGS_MAP[section]
+        return cls.ring_time_until_stale(cls.UPDATE_SECTION_RINGS_MAP[section])
+
+    @classmethod
+    def ring_time_until_stale(cls, ring: int) -> dt.timedelta:
+        """time until sections of given ring are considered stale"""
         if ring == 1:
             minutes = MEMBERAUDIT_UPDATE_STALE_RING_1
         elif ring == 2:
@@ -287,7 +327,11 @@ class Character(models.Model):
             return section.has_changed(content=content, hash_num=hash_num)
 
     def update_section_content_hash(
-        self, section: str, content: str, hash_num: int = 1
+        self,
+        section: str,
+        content: str,
+        hash_num: int = 1,
+        esi_cache: Optional[EsiCacheHeaders] = None,
     ) -> bool:
         try:
             section = self.update_status_set.get(section=section)
@@ -296,7 +340,78 @@ class Character(models.Model):
                 character=self, section=section
             )
 
-        section.update_content_hash(content=content, hash_num=hash_num)
+        section.update_content_hash(
+            content=content, hash_num=hash_num, esi_cache=esi_cache
+        )
+
+    def update_section_esi_cache(
+        self,
+        section: str,
+        esi_cache: Optional[EsiCacheHeaders],
+        hash_num: int = 1,
+    ) -> None:
+        """stores the caching headers of the ESI response for this section
+
+        Does nothing when no headers are given.
+        """
+        if not esi_cache:
+            return
+        section, _ = CharacterUpdateStatus.objects.get_or_create(
+            character=self, section=section
+        )
+        section.update_esi_cache(esi_cache=esi_cache, hash_num=hash_num)
+
+    def _fetch_section_from_esi(
+        self,
+        section: str,
+        esi_method: Callable,
+        force_update: bool = False,
+        hash_num: int = 1,
+        **kwargs,
+    ) -> Tuple[Any, Optional[EsiCacheHeaders]]:
+        """fetches data for a section from ESI with a conditional request
+
+        The request is skipped while the last response of this endpoint
+        has not expired and a known ETag is sent with the request.
+
+        Returns the data and the caching headers of the response.
+        Returns ``None`` as data when the data has not changed since the last update.
+
+        Only for single page endpoints. Bundled sections do not use this,
+        because their data is fetched without accessing the database.
+        """
+        try:
+            update_status = self.update_status_set.get(section=section)
+        except CharacterUpdateStatus.DoesNotExist:
+            update_status = None
+
+        etag = ""
+        if update_status and not force_update:
+            if update_status.is_esi_cache_valid(hash_num):
+                return None, None
+            etag = update_status.esi_etag(hash_num)
+            if etag:
+                kwargs["_request_options"] = {"headers": {"If-None-Match": etag}}
+
+        operation = esi_method(**kwargs)
+        operation.request_config.also_return_response = True
+        try:
+            data, response = operation.results()
+        except HTTPNotModified as ex:
+            esi_cache = EsiCacheHeaders.from_response(ex.response)
+            update_status.update_esi_cache(
+                esi_cache=esi_cache._replace(etag=esi_cache.etag or etag),
+                hash_num=hash_num,
+            )
+            return None, None
+
+        esi_cache = EsiCacheHeaders.from_response(response)
+        if etag and esi_cache.etag == etag:
+            # response was unchanged, e.g. when served from the response cache
+            update_status.update_esi_cache(esi_cache=esi_cache, hash_num=hash_num)
+            return None, None
+
+        return data, esi_cache
 
     def reset_update_section(
         self, section: str, root_task_id: str = None, parent_task_id: str = None
@@ -321,32 +436,21 @@ class Character(models.Model):
 
         return section.is_updating
 
-    def _preload_all_locations(self, token: Token, incoming_ids: set) -> list:
+    def _preload_all_locations(self, token: Token, incoming_ids: set) -> set:
         """loads location objects specified by given set
 
-        returns list of existing location IDs after preload
+        returns set of given location IDs, which exist after preload
         """
-        existing_ids = set(Location.objects.values_list("id", flat=True))
-        missing_ids = incoming_ids.difference(existing_ids)
-        if missing_ids:
-            logger.info(
-                "%s: Loading %s missing locations from ESI", self, len(missing_ids)
-            )
-            for location_id in missing_ids:
-                try:
-                    Location.objects.get_or_create_esi_async(
-                        id=location_id, token=token
-                    )
-                except ValueError:
-                    pass
-                else:
-                    existing_ids.add(location_id)
-
-        return existing_ids
+        return Location.objects.bulk_get_or_create_esi_async(
+            ids=incoming_ids, token=token
+        )
 
     def fetch_token(self, scopes=None) -> Token:
         """returns valid token for character
 
+        The found token is cached for the given scopes for a short time,
+        so consecutive section updates do not need to search it again.
+
         Args:
         - scopes: Optionally provide the required scopes.
         Otherwise will use all scopes defined for this character.
@@ -358,14 +462,32 @@ class Character(models.Model):
             raise TokenError(
                 f"Can not find token for orphaned character: {self}"
             ) from None
+        if not scopes:
+            scopes = self.get_esi_scopes()
+        elif isinstance(scopes, str):
+            scopes = [scopes]
+        scopes_key = " ".join(sorted(scopes))
+        cached_tokens = cache.get(self._token_cache_key()) or {}
+        token_pk = cached_tokens.get(scopes_key)
+        if token_pk:
+            token = Token.objects.filter(pk=token_pk, user=self.user).first()
+            if token:
+                return token
         token = (
             Token.objects.prefetch_related("scopes")
             .filter(user=self.user, character_id=self.eve_character.character_id)
-            .require_scopes(scopes if scopes else self.get_esi_scopes())
+            .require_scopes(scopes)
             .require_valid()
             .first()
         )
-        if not token:
+        if token:
+            cached_tokens[scopes_key] = token.pk
+            cache.set(
+                self._token_cache_key(),
+                cached_tokens,
+                timeout=MEMBERAUDIT_TASKS_TOKEN_CACHE_TIMEOUT,
+            )
+        else:
             message_id = f"{__title__}-fetch_token-{self.pk}-TokenError"
             title = f"{__title__}: Invalid or missing token for {self.eve_character}"
             message = (
@@ -380,6 +502,37 @@ class Character(models.Model):
             raise TokenError(f"Could not find a matching token for {self}")
         return token
 
+    def invalidate_token_cache(self) -> None:
+        """removes cached tokens of this character, e.g. after a failed refresh"""
+        cache.delete(self._token_cache_key())
+
+    def _token_cache_key(self) -> str:
+        return f"memberaudit-character-tokens-{self.pk}"
+
+    def fetch_section_data(self, token: Token, section: str) -> Any:
+        """Fetches the data of a bundled section from ESI.
+
+        Does not access the database, so it can be called from worker threads.
+
+        Raises:
+        - ValueError if section can not be bundled
+        """
+        if section not in self.BUNDLED_UPDATE_SECTIONS:
+            raise ValueError(f"Section can not be bundled: {section}")
+        return getattr(self, f"_fetch_{section}")(token)
+
+    def store_section_data(
+        self, token: Token, section: str, data: Any, force_update: bool = False
+    ) -> None:
+        """Stores the data of a bundled section fetched with fetch_section_data().
+
+        Raises:
+        - ValueError if section can not be bundled
+        """
+        if section not in self.BUNDLED_UPDATE_SECTIONS:
+            raise ValueError(f"Section can not be bundled: {section}")
+        getattr(self, f"_store_{section}")(token, data, force_update)
+
     @fetch_token_for_character("esi-assets.read_assets.v1")
     def assets_build_list_from_esi(
         self, token: Token, force_update=False
@@ -389,26 +542,26 @@ class Character(models.Model):
         returns the asset_list or None if no update is required
         """
         logger.info("%s: Fetching assets from ESI", self)
-        asset_list = esi.client.Assets.get_characters_character_id_assets(
+        assets_flat = dict()
+        for page in iter_esi_pages(
+            esi.client.Assets.get_characters_character_id_assets,
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
-        ).results()
-        assets_flat = {int(x["item_id"]): x for x in asset_list}
+        ):
+            assets_flat.update({int(x["item_id"]): x for x in page})
 
         logger.info("%s: Fetching asset names from ESI", self)
-        names = list()
         for asset_ids_chunk in chunks(list(assets_flat.keys()), 999):
-            names += esi.client.Assets.post_characters_character_id_assets_names(
+            names = esi.client.Assets.post_characters_character_id_assets_names(
                 character_id=self.eve_character.character_id,
                 token=token.valid_access_token(),
                 item_ids=asset_ids_chunk,
             ).results()
-
-        asset_names = {
-            int(x["item_id"]): x["name"] for x in names if x["name"] != "None"
-        }
-        for item_id in assets_flat.keys():
-            assets_flat[item_id]["name"] = asset_names.get(item_id, "")
+            asset_names = {
+                int(x["item_id"]): x["name"] for x in names if x["name"] != "None"
+            }
+            for item_id in asset_ids_chunk:
+                assets_flat[item_id]["name"] = asset_names.get(item_id, "")
 
         if MEMBERAUDIT_DEVELOPER_MODE:
             self._store_list_to_disk(assets_flat, "asset_list")
@@ -449,40 +602,64 @@ class Character(models.Model):
         from .sections import CharacterDetails
 
         logger.info("%s: Fetching character details from ESI", self)
-        details = esi.client.Character.get_characters_character_id(
+        details, esi_cache = self._fetch_section_from_esi(
+            section=self.UpdateSection.CHARACTER_DETAILS,
+            esi_method=esi.client.Character.get_characters_character_id,
+            force_update=force_update,
             character_id=self.eve_character.character_id,
-        ).results()
+        )
         if MEMBERAUDIT_DEVELOPER_MODE:
             self._store_list_to_disk(details, "character_details")
 
-        if force_update or self.has_section_changed(
-            section=self.UpdateSection.CHARACTER_DETAILS, content=details
+        if details is not None and (
+            force_update
+            or self.has_section_changed(
+                section=self.UpdateSection.CHARACTER_DETAILS, content=details
+            )
         ):
             CharacterDetails.objects.update_for_character(self, details)
             self.update_section_content_hash(
-                section=self.UpdateSection.CHARACTER_DETAILS, content=details
+                section=self.UpdateSection.CHARACTER_DETAILS,
+                content=details,
+                esi_cache=esi_cache,
             )
 
         else:
+            self.update_section_esi_cache(
+                section=self.UpdateSection.CHARACTER_DETAILS, esi_cache=esi_cache
+            )
             logger.info("%s: Character details have not changed", self)
 
     @fetch_token_for_character("esi-characters.read_contacts.v1")
     def update_contact_labels(self, token: Token, force_update: bool = False):
         logger.info("%s: Fetching contact labels from ESI", self)
-        labels = esi.client.Contacts.get_characters_character_id_contacts_labels(
+        labels, esi_cache = self._fetch_section_from_esi(
+            section=self.UpdateSection.CONTACTS,
+            esi_method=esi.client.Contacts.get_characters_character_id_contacts_labels,
+            force_update=force_update,
+            hash_num=2,
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
-        ).results()
+        )
         if MEMBERAUDIT_DEVELOPER_MODE:
             self._store_list_to_disk(labels, "contact_labels")
-        if force_update or self.has_section_changed(
-            section=self.UpdateSection.CONTACTS, content=labels, hash_num=2
+        if labels is not None and (
+            force_update
+            or self.has_section_changed(
+                section=self.UpdateSection.CONTACTS, content=labels, hash_num=2
+            )
         ):
             self.contact_labels.update_for_character(self, labels)
             self.update_section_content_hash(
-                section=self.UpdateSection.CONTACTS, content=labels, hash_num=2
+                section=self.UpdateSection.CONTACTS,
+                content=labels,
+                hash_num=2,
+                esi_cache=esi_cache,
             )
         else:
+            self.update_section_esi_cache(
+                section=self.UpdateSection.CONTACTS, esi_cache=esi_cache, hash_num=2
+            )
             logger.info("%s: Contact labels have not changed", self)
 
     @fetch_token_for_character("esi-characters.read_contacts.v1")
@@ -607,29 +784,48 @@ class Character(models.Model):
     def update_corporation_history(self, force_update: bool = False):
         """syncs the character's corporation history"""
         logger.info("%s: Fetching corporation history from ESI", self)
-        history = esi.client.Character.get_characters_character_id_corporationhistory(
+        history, esi_cache = self._fetch_section_from_esi(
+            section=self.UpdateSection.CORPORATION_HISTORY,
+            esi_method=esi.client.Character.get_characters_character_id_corporationhistory,
+            force_update=force_update,
             character_id=self.eve_character.character_id,
-        ).results()
+        )
         if MEMBERAUDIT_DEVELOPER_MODE:
             self._store_list_to_disk(history, "corporation_history")
-        if force_update or self.has_section_changed(
-            section=self.UpdateSection.CORPORATION_HISTORY, content=history
+        if history is not None and (
+            force_update
+            or self.has_section_changed(
+                section=self.UpdateSection.CORPORATION_HISTORY, content=history
+            )
         ):
             self.corporation_history.update_for_character(self, history)
             self.update_section_content_hash(
-                section=self.UpdateSection.CORPORATION_HISTORY, content=history
+                section=self.UpdateSection.CORPORATION_HISTORY,
+                content=history,
+                esi_cache=esi_cache,
             )
         else:
+            self.update_section_esi_cache(
+                section=self.UpdateSection.CORPORATION_HISTORY, esi_cache=esi_cache
+            )
             logger.info("%s: Corporation history has not changed", self)
 
     @fetch_token_for_character("esi-clones.read_implants.v1")
     def update_implants(self, token: Token, force_update: bool = False):
         """update the character's implants"""
+        implants_data = self._fetch_implants(token)
+        self._store_implants(token, implants_data, force_update)
+
+    def _fetch_implants(self, token: Token) -> list:
         logger.info("%s: Fetching implants from ESI", self)
-        implants_data = esi.client.Clones.get_characters_character_id_implants(
+        return esi.client.Clones.get_characters_character_id_implants(
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
         ).results()
+
+    def _store_implants(
+        self, token: Token, implants_data: list, force_update: bool = False
+    ):
         if MEMBERAUDIT_DEVELOPER_MODE:
             self._store_list_to_disk(implants_data, "implants")
         if force_update or self.has_section_changed(
@@ -649,36 +845,55 @@ class Character(models.Model):
     )
     def update_location(self, token: Token):
         """update the location for the given character"""
-        from .sections import CharacterLocation
+        location_info = self._fetch_location(token)
+        self._store_location(token, location_info)
 
+    def _fetch_location(self, token: Token) -> dict:
         logger.info("%s: Fetching location from ESI", self)
-        location_info = esi.client.Location.get_characters_character_id_location(
+        return esi.client.Location.get_characters_character_id_location(
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
         ).results()
+
+    def _store_location(
+        self, token: Token, location_info: dict, force_update: bool = False
+    ):
+        from .sections import CharacterLocation
+
         CharacterLocation.objects.update_for_character(self, token, location_info)
 
     @fetch_token_for_character("esi-characters.read_loyalty.v1")
     def update_loyalty(self, token: Token, force_update: bool = False):
         """syncs the character's loyalty entries"""
         logger.info("%s: Fetching loyalty entries from ESI", self)
-        loyalty_entries = esi.client.Loyalty.get_characters_character_id_loyalty_points(
+        loyalty_entries, esi_cache = self._fetch_section_from_esi(
+            section=self.UpdateSection.LOYALTY,
+            esi_method=esi.client.Loyalty.get_characters_character_id_loyalty_points,
+            force_update=force_update,
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
-        ).results()
+        )
         if MEMBERAUDIT_DEVELOPER_MODE:
             self._store_list_to_disk(loyalty_entries, "loyalty")
 
-        if force_update or self.has_section_changed(
-            section=self.UpdateSection.LOYALTY, content=loyalty_entries
+        if loyalty_entries is not None and (
+            force_update
+            or self.has_section_changed(
+                section=self.UpdateSection.LOYALTY, content=loyalty_entries
+            )
         ):
             self.loyalty_entries.update_for_character(self, loyalty_entries)
             self.update_section_content_hash(
-                section=self.UpdateSection.LOYALTY, content=loyalty_entries
+                section=self.UpdateSection.LOYALTY,
+                content=loyalty_entries,
+                esi_cache=esi_cache,
             )
             EveEntity.objects.bulk_update_new_esi()
 
         else:
+            self.update_section_esi_cache(
+                section=self.UpdateSection.LOYALTY, esi_cache=esi_cache
+            )
             logger.info("%s: Loyalty entries have not changed", self)
 
     @fetch_token_for_character(
@@ -687,15 +902,21 @@ class Character(models.Model):
     def update_jump_clones(self, token: Token, force_update: bool = False):
         """updates the character's jump clones"""
         logger.info("%s: Fetching jump clones from ESI", self)
-        jump_clones_info = esi.client.Clones.get_characters_character_id_clones(
+        jump_clones_info, esi_cache = self._fetch_section_from_esi(
+            section=self.UpdateSection.JUMP_CLONES,
+            esi_method=esi.client.Clones.get_characters_character_id_clones,
+            force_update=force_update,
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
-        ).results()
+        )
         if MEMBERAUDIT_DEVELOPER_MODE:
             self._store_list_to_disk(jump_clones_info, "jump_clones")
 
-        if force_update or self.has_section_changed(
-            section=self.UpdateSection.JUMP_CLONES, content=jump_clones_info
+        if jump_clones_info is not None and (
+            force_update
+            or self.has_section_changed(
+                section=self.UpdateSection.JUMP_CLONES, content=jump_clones_info
+            )
         ):
             jump_clones_list = jump_clones_info.get("jump_clones")
             # fetch related objects ahead of transaction
@@ -715,10 +936,15 @@ class Character(models.Model):
 
             self.jump_clones.update_for_character(self, jump_clones_list)
             self.update_section_content_hash(
-                section=self.UpdateSection.JUMP_CLONES, content=jump_clones_info
+                section=self.UpdateSection.JUMP_CLONES,
+                content=jump_clones_info,
+                esi_cache=esi_cache,
             )
 
         else:
+            self.update_section_esi_cache(
+                section=self.UpdateSection.JUMP_CLONES, esi_cache=esi_cache
+            )
             logger.info("%s: Jump clones have not changed", self)
 
     @fetch_token_for_character("esi-industry.read_character_mining.v1")
@@ -746,13 +972,21 @@ class Character(models.Model):
     @fetch_token_for_character("esi-location.read_online.v1")
     def update_online_status(self, token):
         """Update the character's online status"""
-        from .sections import CharacterOnlineStatus
+        online_info = self._fetch_online_status(token)
+        self._store_online_status(token, online_info)
 
+    def _fetch_online_status(self, token: Token) -> dict:
         logger.info("%s: Fetching online status from ESI", self)
-        online_info = esi.client.Location.get_characters_character_id_online(
+        return esi.client.Location.get_characters_character_id_online(
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
         ).results()
+
+    def _store_online_status(
+        self, token: Token, online_info: dict, force_update: bool = False
+    ):
+        from .sections import CharacterOnlineStatus
+
         CharacterOnlineStatus.objects.update_or_create(
             character=self,
             defaults={
@@ -765,23 +999,37 @@ class Character(models.Model):
     @fetch_token_for_character("esi-location.read_ship_type.v1")
     def update_ship(self, token: Token):
         """Update the ship for the given character."""
-        from .sections import CharacterShip
+        ship_info = self._fetch_ship(token)
+        self._store_ship(token, ship_info)
 
+    def _fetch_ship(self, token: Token) -> dict:
         logger.info("%s: Fetching ship from ESI", self)
-        ship_info = esi.client.Location.get_characters_character_id_ship(
+        return esi.client.Location.get_characters_character_id_ship(
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
         ).results()
+
+    def _store_ship(self, token: Token, ship_info: dict, force_update: bool = False):
+        from .sections import CharacterShip
+
         CharacterShip.objects.update_for_character(self, ship_info)
 
     @fetch_token_for_character("esi-skills.read_skillqueue.v1")
     def update_skill_queue(self, token: Token, force_update: bool = False):
         """update the character's skill queue"""
+        skillqueue = self._fetch_skill_queue(token)
+        self._store_skill_queue(token, skillqueue, force_update)
+
+    def _fetch_skill_queue(self, token: Token) -> list:
         logger.info("%s: Fetching skill queue from ESI", self)
-        skillqueue = esi.client.Skills.get_characters_character_id_skillqueue(
+        return esi.client.Skills.get_characters_character_id_skillqueue(
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
         ).results()
+
+    def _store_skill_queue(
+        self, token: Token, skillqueue: list, force_update: bool = False
+    ):
         if MEMBERAUDIT_DEVELOPER_MODE:
             self._store_list_to_disk(skillqueue, "skill_queue")
 
@@ -805,27 +1053,42 @@ class Character(models.Model):
     @fetch_token_for_character("esi-skills.read_skills.v1")
     def update_skills(self, token, force_update: bool = False):
         """update the character's skill"""
-        skills_list = self._fetch_skills_from_esi(token)
-        if force_update or self.has_section_changed(
-            section=self.UpdateSection.SKILLS, content=skills_list
+        skills_list, esi_cache = self._fetch_skills_from_esi(token, force_update)
+        if skills_list is not None and (
+            force_update
+            or self.has_section_changed(
+                section=self.UpdateSection.SKILLS, content=skills_list
+            )
         ):
             self._preload_types(skills_list)
             self.skills.update_for_character(self, skills_list)
             self.update_section_content_hash(
-                section=self.UpdateSection.SKILLS, content=skills_list
+                section=self.UpdateSection.SKILLS,
+                content=skills_list,
+                esi_cache=esi_cache,
             )
 
         else:
+            self.update_section_esi_cache(
+                section=self.UpdateSection.SKILLS, esi_cache=esi_cache
+            )
             logger.info("%s: Skills have not changed", self)
 
-    def _fetch_skills_from_esi(self, token: Token) -> dict:
+    def _fetch_skills_from_esi(
+        self, token: Token, force_update: bool = False
+    ) -> Tuple[Optional[dict], Optional[EsiCacheHeaders]]:
         from .sections import CharacterSkillpoints
 
         logger.info("%s: Fetching skills from ESI", self)
-        skills_info = esi.client.Skills.get_characters_character_id_skills(
+        skills_info, esi_cache = self._fetch_section_from_esi(
+            section=self.UpdateSection.SKILLS,
+            esi_method=esi.client.Skills.get_characters_character_id_skills,
+            force_update=force_update,
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
-        ).results()
+        )
+        if skills_info is None:
+            return None, None
         if MEMBERAUDIT_DEVELOPER_MODE:
             self._store_list_to_disk(skills_info, "skills")
 
@@ -845,7 +1108,7 @@ class Character(models.Model):
         else:
             skills_list = dict()
 
-        return skills_list
+        return skills_list, esi_cache
 
     def _preload_types(self, skills_list: dict):
         if skills_list:
@@ -857,13 +1120,21 @@ class Character(models.Model):
     @fetch_token_for_character("esi-wallet.read_character_wallet.v1")
     def update_wallet_balance(self, token):
         """syncs the character's wallet balance"""
-        from .sections import CharacterWalletBalance
+        balance = self._fetch_wallet_balance(token)
+        self._store_wallet_balance(token, balance)
 
+    def _fetch_wallet_balance(self, token: Token) -> float:
         logger.info("%s: Fetching wallet balance from ESI", self)
-        balance = esi.client.Wallet.get_characters_character_id_wallet(
+        return esi.client.Wallet.get_characters_character_id_wallet(
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
         ).results()
+
+    def _store_wallet_balance(
+        self, token: Token, balance: float, force_update: bool = False
+    ):
+        from .sections import CharacterWalletBalance
+
         if MEMBERAUDIT_DEVELOPER_MODE:
             self._store_list_to_disk(balance, "balance")
 
@@ -878,15 +1149,19 @@ class Character(models.Model):
         Note: Does not update unknown EvEntities.
         """
         logger.info("%s: Fetching wallet journal from ESI", self)
-        journal = esi.client.Wallet.get_characters_character_id_wallet_journal(
+        pages = iter_esi_pages(
+            esi.client.Wallet.get_characters_character_id_wallet_journal,
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
-        ).results()
+        )
         if MEMBERAUDIT_DEVELOPER_MODE:
-            self._store_list_to_disk(journal, "wallet_journal")
+            pages = list(pages)
+            self._store_list_to_disk(
+                [row for page in pages for row in page], "wallet_journal"
+            )
 
-        self.wallet_journal.update_for_character(
-            character=self, cutoff_datetime=data_retention_cutoff(), journal=journal
+        self.wallet_journal.update_pages_for_character(
+            character=self, cutoff_datetime=data_retention_cutoff(), pages=pages
         )
 
     @fetch_token_for_character("esi-wallet.read_character_wallet.v1")
@@ -968,13 +1243,21 @@ class Character(models.Model):
     @fetch_token_for_character("esi-skills.read_skills.v1")
     def update_attributes(self, token: Token, force_update: bool = False):
         """update the character's attributes"""
-        logger.info("%s: Fetching attributes from ESI", self)
-        from .sections import CharacterAttributes
+        attribute_data = self._fetch_attributes(token)
+        self._store_attributes(token, attribute_data, force_update)
 
-        attribute_data = esi.client.Skills.get_characters_character_id_attributes(
+    def _fetch_attributes(self, token: Token) -> dict:
+        logger.info("%s: Fetching attributes from ESI", self)
+        return esi.client.Skills.get_characters_character_id_attributes(
             character_id=self.eve_character.character_id,
             token=token.valid_access_token(),
         ).results()
+
+    def _store_attributes(
+        self, token: Token, attribute_data: dict, force_update: bool = False
+    ):
+        from .sections import CharacterAttributes
+
         if MEMBERAUDIT_DEVELOPER_MODE:
             self._store_list_to_disk(attribute_data, "attributes")
 
@@ -1019,6 +1302,12 @@ class CharacterUpdateStatus(models.Model):
     content_hash_1 = models.CharField(max_length=32, default="")
     content_hash_2 = models.CharField(max_length=32, default="")
     content_hash_3 = models.CharField(max_length=32, default="")
+    esi_etag_1 = models.CharField(max_length=128, default="")
+    esi_etag_2 = models.CharField(max_length=128, default="")
+    esi_etag_3 = models.CharField(max_length=128, default="")
+    esi_expires_1 = models.DateTimeField(null=True, default=None)
+    esi_expires_2 = models.DateTimeField(null=True, default=None)
+    esi_expires_3 = models.DateTimeField(null=True, default=None)
     last_error_message = models.TextField()
     root_task_id = models.CharField(
         max_length=36,
@@ -1068,7 +1357,12 @@ class CharacterUpdateStatus(models.Model):
 
         return new_hash != content_hash
 
-    def update_content_hash(self, content: Any, hash_num: int = 1):
+    def update_content_hash(
+        self,
+        content: Any,
+        hash_num: int = 1,
+        esi_cache: Optional[EsiCacheHeaders] = None,
+    ):
         new_hash = self._calculate_hash(content)
         if hash_num == 2:
             self.content_hash_2 = new_hash
@@ -1077,8 +1371,34 @@ class CharacterUpdateStatus(models.Model):
         else:
             self.content_hash_1 = new_hash
 
+        if esi_cache:
+            self._set_esi_cache(esi_cache, hash_num)
         self.save()
 
+    def is_esi_cache_valid(self, hash_num: int = 1) -> bool:
+        """returns True if the last ESI response for this hash has not expired yet"""
+        expires = getattr(self, f"esi_expires_{self._esi_cache_num(hash_num)}")
+        return expires is not None and expires > now()
+
+    def esi_etag(self, hash_num: int = 1) -> str:
+        """returns the ETag of the last ESI response for this hash"""
+        return getattr(self, f"esi_etag_{self._esi_cache_num(hash_num)}")
+
+    def update_esi_cache(self, esi_cache: EsiCacheHeaders, hash_num: int = 1):
+        """stores the caching headers of the last ESI response for this hash"""
+        self._set_esi_cache(esi_cache, hash_num)
+        num = self._esi_cache_num(hash_num)
+        self.save(update_fields=[f"esi_etag_{num}", f"esi_expires_{num}"])
+
+    def _set_esi_cache(self, esi_cache: EsiCacheHeaders, hash_num: int):
+        num = self._esi_cache_num(hash_num)
+        setattr(self, f"esi_etag_{num}", esi_cache.etag)
+        setattr(self, f"esi_expires_{num}", esi_cache.expires)
+
+    @staticmethod
+    def _esi_cache_num(hash_num: int) -> int:
+        return hash_num if hash_num in (2, 3) else 1
+
     @staticmethod
     def _calculate_hash(content: Any) -> str:
         return hashlib.md5(
@@ -170,6 +170,16 @@ class Location(models.Model):
         related_name="+",
         help_text="corporation this station or structure belongs to",
     )
+    access_errors = models.PositiveIntegerField(
+        default=0,
+        help_text="Count of consecutive access errors when fetching this structure",
+    )
+    access_retry_at = models.DateTimeField(
+        default=None,
+        null=True,
+        blank=True,
+        help_text="This structure will not be fetched from ESI again before this time",
+    )
     updated_at = models.DateTimeField(auto_now=True)
 
     objects = LocationManager()
@@ -234,6 +244,30 @@ class Location(models.Model):
         return location_id == cls._ASSET_SAFETY_ID
 
 
+class LocationAccess(models.Model):
+    """Whether a character had access to a structure, when last fetched from ESI"""
+
+    location = models.ForeignKey(
+        Location, on_delete=models.CASCADE, related_name="accesses"
+    )
+    character = models.ForeignKey(
+        "Character", on_delete=models.CASCADE, related_name="+"
+    )
+    has_access = models.BooleanField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(
+                fields=["location", "character"], name="functional_pk_locationaccess"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.location}-{self.character}"
+
+
 class EveShipType(EveType):
     """Subset of EveType for all ship types"""
 
@@ -382,4 +416,4 @@ class SkillSetSkill(models.Model):
 
     def _skill_str(self, level) -> str:
         level_str = MAP_ARABIC_TO_ROMAN_NUMBERS[level]
-        return f"{self.eve_type.name} {level_str}"
\ No newline at end of file
+        return f"{self.eve_type.name} {level_str}"
@@ -25,6 +25,7 @@ from .. import __title__
 from ..core.xml_converter import eve_xml_to_html
 from ..managers.sections import (
     CharacterAssetManager,
+    CharacterAssetValuationManager,
     CharacterAttributesManager,
     CharacterContactLabelManager,
     CharacterContactManager,
@@ -42,6 +43,7 @@ from ..managers.sections import (
     CharacterSkillManager,
     CharacterSkillqueueEntryManager,
     CharacterSkillSetCheckManager,
+    CharacterSkillSetReportRowManager,
     CharacterWalletJournalEntryManager,
     CharacterWalletTransactionManager,
 )
@@ -78,6 +80,34 @@ class CharacterAsset(models.Model):
     name = models.CharField(max_length=NAMES_MAX_LENGTH, default="")
     quantity = models.PositiveIntegerField()
 
+    path = models.CharField(
+        max_length=255,
+        default="",
+        help_text=(
+            "Item IDs of all parents of this asset from the top most parent, "
+            "e.g. '/1/2/' for an asset in container 2 within ship 1"
+        ),
+    )
+    root_location = models.ForeignKey(
+        Location,
+        on_delete=models.CASCADE,
+        default=None,
+        null=True,
+        related_name="+",
+        help_text="Location of the top most parent of this asset",
+    )
+
+    contents_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of assets inside this asset, including nested containers",
+    )
+    contents_total = models.FloatField(
+        default=0, help_text="Estimated value of all assets inside this asset"
+    )
+    contents_volume = models.FloatField(
+        default=0, help_text="Volume of all assets inside this asset"
+    )
+
     objects = CharacterAssetManager()
 
     class Meta:
@@ -88,6 +118,15 @@ class CharacterAsset(models.Model):
                 name="functional_pk_characterasset",
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["character", "path"], name="memberaudit_asset_path_idx"
+            ),
+            models.Index(
+                fields=["eve_type", "character", "root_location"],
+                name="memberaudit_asset_search_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.character}-{self.item_id}-{self.name_display}"
@@ -111,6 +150,48 @@ class CharacterAsset(models.Model):
         return self.eve_type.name if self.name else self.eve_type.eve_group.name
 
 
+class CharacterAssetValuation(models.Model):
+    """Snapshot of the estimated value of all assets of a character.
+
+    There is one snapshot per character and day, which is refreshed
+    whenever the asset tree is rebuilt or market prices are updated.
+    Older snapshots are kept as history.
+    """
+
+    character = models.ForeignKey(
+        Character, on_delete=models.CASCADE, related_name="asset_valuations"
+    )
+    date = models.DateField(db_index=True)
+
+    items_count = models.PositiveIntegerField(default=0)
+    total = models.FloatField(default=0)
+    location_totals = models.JSONField(
+        default=dict,
+        help_text=(
+            "Total value of assets by location ID, "
+            "including all assets inside containers and ships"
+        ),
+    )
+    category_totals = models.JSONField(
+        default=dict, help_text="Total value of assets by Eve category ID"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CharacterAssetValuationManager()
+
+    class Meta:
+        default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(
+                fields=["character", "date"],
+                name="functional_pk_characterassetvaluation",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.character}-{self.date}"
+
+
 class CharacterContactLabel(models.Model):
     """An Eve Online contact label belonging to a Character"""
 
@@ -692,6 +773,7 @@ class CharacterJumpCloneImplant(models.Model):
     def __str__(self) -> str:
         return str(f"{self.jump_clone}-{self.eve_type}")
 
+
 class CharacterMiningLedgerEntry(models.Model):
     """Mining ledger entry of a character."""
 
@@ -875,6 +957,69 @@ class CharacterSkillSetCheck(models.Model):
         return self.failed_required_skills.count() == 0
 
 
+class CharacterSkillSetReportRow(models.Model):
+    """Pre-computed row of the skill sets report for a character and skill set group.
+
+    Rows are refreshed whenever the skill set checks of a character change,
+    so the report can be served page by page from this table alone.
+    """
+
+    character = models.ForeignKey(
+        Character, on_delete=models.CASCADE, related_name="skill_set_report_rows"
+    )
+    group = models.ForeignKey(
+        "SkillSetGroup",
+        on_delete=models.CASCADE,
+        default=None,
+        null=True,
+        related_name="+",
+        help_text="Skill set group of this row or None for ungrouped skill sets",
+    )
+
+    group_name = models.CharField(max_length=NAMES_MAX_LENGTH, default="")
+    is_doctrine = models.BooleanField(default=False)
+    character_name = models.CharField(max_length=NAMES_MAX_LENGTH)
+    character_eve_id = models.PositiveIntegerField()
+    is_main = models.BooleanField(default=False)
+    main_name = models.CharField(max_length=NAMES_MAX_LENGTH, default="")
+    main_eve_id = models.PositiveIntegerField(default=None, null=True)
+    state_name = models.CharField(max_length=NAMES_MAX_LENGTH, default="")
+    corporation_name = models.CharField(max_length=NAMES_MAX_LENGTH, default="")
+    alliance_name = models.CharField(max_length=NAMES_MAX_LENGTH, default="")
+    alliance_ticker = models.CharField(max_length=NAMES_MAX_LENGTH, default="")
+    has_required = models.BooleanField(
+        default=False,
+        help_text="Whether the character has the required skills for any skill set",
+    )
+    skill_sets = models.JSONField(
+        default=list,
+        help_text=(
+            "Name and ship type ID of each skill set the character "
+            "has the required skills for"
+        ),
+    )
+
+    objects = CharacterSkillSetReportRowManager()
+
+    class Meta:
+        default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(
+                fields=["character", "group"],
+                name="functional_pk_characterskillsetreportrow",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["group_name", "main_name", "character_name"],
+                name="memberaudit_skill_report_idx",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.character}-{self.group_name}"
+
+
 class CharacterWalletBalance(models.Model):
     """Wallet balance of a character"""
 
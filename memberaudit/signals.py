@@ -1,9 +1,22 @@
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models.signals import pre_save
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_save,
+)
 from django.dispatch import receiver
 
+from allianceauth.authentication.models import CharacterOwnership, UserProfile
+from allianceauth.eveonline.models import EveCharacter
 from allianceauth.groupmanagement.models import AuthGroup
 
+from . import tasks
+from .models import Character, SkillSet, SkillSetGroup, SkillSetSkill
+
 
 @receiver(pre_save, sender=AuthGroup)
 def ensure_compliance_groups_stay_internal(instance, **kwargs):
@@ -14,3 +27,165 @@ def ensure_compliance_groups_stay_internal(instance, **kwargs):
         pass
     else:
         instance.internal = True
+
+
+@receiver(post_save, sender=Character)
+@receiver(post_delete, sender=Character)
+def clear_character_cache(instance, **kwargs):
+    """Remove a changed character from the object caches."""
+    Character.objects.clear_cache(pk=instance.pk)
+
+
+@receiver(post_save, sender=CharacterOwnership)
+@receiver(post_delete, sender=CharacterOwnership)
+def clear_character_cache_for_ownership(instance, **kwargs):
+    """Remove a character from the object caches after its ownership changed."""
+    _clear_character_cache_for_eve_character(instance.character_id)
+
+
+@receiver(post_save, sender=EveCharacter)
+@receiver(post_delete, sender=EveCharacter)
+def clear_character_cache_for_eve_character(instance, **kwargs):
+    """Remove a character from the object caches after its Eve character changed."""
+    _clear_character_cache_for_eve_character(instance.pk)
+
+
+def _clear_character_cache_for_eve_character(eve_character_pk: int):
+    for pk in Character.objects.filter(eve_character_id=eve_character_pk).values_list(
+        "pk", flat=True
+    ):
+        Character.objects.clear_cache(pk=pk)
+
+
+@receiver(post_save, sender=SkillSet)
+@receiver(post_delete, sender=SkillSet)
+@receiver(post_save, sender=SkillSetSkill)
+@receiver(post_delete, sender=SkillSetSkill)
+def clear_skill_set_requirement_matrix(**kwargs):
+    """Recompile skill set requirements after a skill set has changed.
+
+    The cache is cleared again after commit, because other processes
+    may have compiled the old requirements before the change was committed.
+    """
+    SkillSet.objects.clear_requirement_matrix_cache()
+    transaction.on_commit(SkillSet.objects.clear_requirement_matrix_cache)
+
+
+@receiver(post_save, sender=SkillSet)
+def update_skill_set_checks_for_skill_set(instance, **kwargs):
+    """Recompute checks of a changed skill set for all characters."""
+    _update_skill_set_checks_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=SkillSetSkill)
+@receiver(post_delete, sender=SkillSetSkill)
+def update_skill_set_checks_for_skill(instance, **kwargs):
+    """Recompute checks of the skill set of a changed skill for all characters."""
+    _update_skill_set_checks_on_commit(instance.skill_set_id)
+
+
+def _update_skill_set_checks_on_commit(skill_set_pk: int):
+    transaction.on_commit(
+        lambda: tasks.update_skill_set_checks.delay(skill_set_pk=skill_set_pk)
+    )
+
+
+@receiver(post_delete, sender=SkillSet)
+@receiver(post_save, sender=SkillSetGroup)
+@receiver(post_delete, sender=SkillSetGroup)
+def update_skill_sets_report(**kwargs):
+    """Recompute the skill sets report after skill sets were deleted or regrouped."""
+    _update_skill_sets_report_on_commit()
+
+
+@receiver(m2m_changed, sender=SkillSetGroup.skill_sets.through)
+def update_skill_sets_report_for_group_members(action, **kwargs):
+    """Recompute the skill sets report after skill sets of a group have changed."""
+    if action in {"post_add", "post_remove", "post_clear"}:
+        _update_skill_sets_report_on_commit()
+
+
+def _update_skill_sets_report_on_commit():
+    transaction.on_commit(lambda: tasks.update_skill_sets_report.delay())
+
+
+@receiver(post_save, sender=CharacterOwnership)
+@receiver(post_delete, sender=CharacterOwnership)
+def update_skill_sets_report_for_ownership(instance, **kwargs):
+    """Recompute report rows of a character after its owner has changed."""
+    _update_skill_sets_report_for_characters_on_commit(
+        Character.objects.filter(eve_character_id=instance.character_id)
+    )
+
+
+@receiver(post_save, sender=UserProfile)
+def update_skill_sets_report_for_user_profile(instance, **kwargs):
+    """Recompute report rows of all characters of a user
+    after the main or the state of the user may have changed.
+    """
+    _update_skill_sets_report_for_characters_on_commit(
+        Character.objects.filter(
+            eve_character__character_ownership__user_id=instance.user_id
+        )
+    )
+
+
+@receiver(post_save, sender=EveCharacter)
+def update_skill_sets_report_for_eve_character(instance, **kwargs):
+    """Recompute report rows of a character and of all characters of its user,
+    when it is a main, after its name or affiliation may have changed.
+    """
+    _update_skill_sets_report_for_characters_on_commit(
+        Character.objects.filter(
+            Q(eve_character_id=instance.pk)
+            | Q(
+                eve_character__character_ownership__user__profile__main_character_id=(
+                    instance.pk
+                )
+            )
+        )
+    )
+
+
+def _update_skill_sets_report_for_characters_on_commit(characters):
+    character_pks = list(characters.values_list("pk", flat=True))
+    if character_pks:
+        transaction.on_commit(
+            lambda: tasks.update_skill_sets_report_for_characters.delay(
+                character_pks=character_pks
+            )
+        )
+
+
+@receiver(post_migrate)
+def update_asset_valuations_after_migrate(sender, apps, **kwargs):
+    """Start creating valuation snapshots when characters with assets have none,
+    e.g. after upgrading to a version with valuations.
+    """
+    if sender.label != "memberaudit":
+        return
+    try:
+        character_model = apps.get_model("memberaudit", "Character")
+        apps.get_model("memberaudit", "CharacterAssetValuation")
+    except LookupError:
+        return
+    if character_model.objects.filter(
+        assets__isnull=False, asset_valuations__isnull=True
+    ).exists():
+        tasks.update_asset_valuations.delay()
+
+
+@receiver(post_migrate)
+def update_skill_sets_report_after_migrate(sender, apps, **kwargs):
+    """Start filling the skill sets report when it is empty despite skill set checks,
+    e.g. after upgrading to a version with a pre-computed report.
+    """
+    if sender.label != "memberaudit":
+        return
+    try:
+        check_model = apps.get_model("memberaudit", "CharacterSkillSetCheck")
+        row_model = apps.get_model("memberaudit", "CharacterSkillSetReportRow")
+    except LookupError:
+        return
+    if check_model.objects.exists() and not row_model.objects.exists():
+        tasks.update_skill_sets_report.delay()
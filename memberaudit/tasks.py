@@ -1,12 +1,15 @@
 import inspect
 import random
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
 
 from celery import chain, shared_task
 
 from django.contrib.auth.models import Group, User
-from django.db import transaction
+from django.core.cache import cache
+from django.db import connections
 from django.utils.timezone import now
+from esi.errors import TokenError
 from esi.models import Token
 from eveuniverse.models import EveEntity, EveMarketPrice
 
@@ -18,18 +21,25 @@ from app_utils.logging import LoggerAddTag
 
 from . import __title__, helpers
 from .app_settings import (
-    MEMBERAUDIT_BULK_METHODS_BATCH_SIZE,
     MEMBERAUDIT_LOG_UPDATE_STATS,
-    MEMBERAUDIT_TASKS_MAX_ASSETS_PER_PASS,
+    MEMBERAUDIT_TASKS_BUNDLED_MAX_WORKERS,
+    MEMBERAUDIT_TASKS_BUNDLED_UPDATES,
     MEMBERAUDIT_TASKS_OBJECT_CACHE_TIMEOUT,
+    MEMBERAUDIT_TASKS_SPREAD_UPDATES,
     MEMBERAUDIT_TASKS_TIME_LIMIT,
+    MEMBERAUDIT_UPDATE_STALE_OFFSET,
+    MEMBERAUDIT_UPDATE_STALE_RING_1,
     MEMBERAUDIT_UPDATE_STALE_RING_2,
 )
 from .core import data_exporters
+from .core.update_schedule import character_tick, next_tick_capacity, tick_capacity
 from .models import (
     Character,
     CharacterAsset,
+    CharacterAssetValuation,
     CharacterContract,
+    CharacterSkillSetCheck,
+    CharacterSkillSetReportRow,
     CharacterUpdateStatus,
     ComplianceGroupDesignation,
     General,
@@ -46,6 +56,15 @@ TASK_DEFAULT_KWARGS = {"time_limit": MEMBERAUDIT_TASKS_TIME_LIMIT, "max_retries"
 # default params for all tasks that make ESI calls
 TASK_ESI_KWARGS = {**TASK_DEFAULT_KWARGS, **{"bind": True}}
 
+# max number of asset IDs to include in log messages
+ASSET_LOG_SAMPLE_SIZE = 10
+
+# length of a tick when spreading character updates in minutes
+SPREAD_TICK_MINUTES = 5
+
+# cache key for characters deferred beyond the last tick of an update cycle
+SPREAD_BACKLOG_CACHE_KEY = "memberaudit-spread-updates-backlog"
+
 
 @shared_task(**TASK_DEFAULT_KWARGS)
 def run_regular_updates() -> None:
@@ -59,22 +78,237 @@ def run_regular_updates() -> None:
 def update_all_characters(self, force_update: bool = False) -> None:
     """Start the update of all registered characters
 
+    Stale sections of all characters are determined at once
+    and their update tasks are started directly.
+
+    When spreading updates is enabled, characters are instead updated
+    in ticks across the time until their sections become stale again.
+
     Args:
     - force_update: When set to True will always update regardless of stale status
     """
     retry_task_if_esi_is_down(self)
+    stats = None
     if MEMBERAUDIT_LOG_UPDATE_STATS:
         stats = CharacterUpdateStatus.objects.statistics()
         logger.info(f"Update statistics: {stats}")
 
     characters_with_owners = Character.objects.filter(
         eve_character__character_ownership__isnull=False
-    ).values_list("pk", flat=True)
-    for character_pk in characters_with_owners:
-        update_character.apply_async(
-            kwargs={"character_pk": character_pk, "force_update": force_update},
+    )
+    if MEMBERAUDIT_TASKS_SPREAD_UPDATES and not force_update:
+        backlog = cache.get(SPREAD_BACKLOG_CACHE_KEY) or {}
+        cache.delete(SPREAD_BACKLOG_CACHE_KEY)
+        if not backlog.get("capacity"):
+            if not stats:
+                stats = CharacterUpdateStatus.objects.statistics()
+            backlog["capacity"] = tick_capacity(
+                tick_minutes=SPREAD_TICK_MINUTES,
+                throughputs_per_hour=[
+                    ring["total"]["throughput_est"]
+                    for ring in stats["update_statistics"].values()
+                ],
+            )
+        ticks = _spread_ticks_count()
+        logger.info(
+            "Spreading character updates over %d ticks with capacity %s "
+            "and %d deferred characters",
+            ticks,
+            backlog["capacity"],
+            len(backlog.get("deferred_pks", [])),
+        )
+        update_characters_tick.apply_async(
+            kwargs={
+                **backlog,
+                "tick": 0,
+                "ticks": ticks,
+                "root_task_id": self.request.id,
+            },
+            priority=DEFAULT_TASK_PRIORITY,
+        )
+        return
+
+    if force_update:
+        all_sections = set(Character.UpdateSection.values)
+        stale_sections = {
+            character_pk: all_sections
+            for character_pk in characters_with_owners.values_list("pk", flat=True)
+        }
+    else:
+        stale_sections = CharacterUpdateStatus.objects.stale_sections_matrix(
+            characters_with_owners.values_list("pk", flat=True)
+        )
+    shared_character_pks = set(
+        characters_with_owners.filter(is_shared=True).values_list("pk", flat=True)
+    )
+    updated_count = _start_character_updates(
+        stale_sections=stale_sections,
+        shared_character_pks=shared_character_pks,
+        force_update=force_update,
+        root_task_id=self.request.id,
+        parent_task_id=self.request.id,
+    )
+    logger.info(
+        "Started update for %s of %s characters", updated_count, len(stale_sections)
+    )
+
+
+@shared_task(**{**TASK_DEFAULT_KWARGS, **{"bind": True}})
+def update_characters_tick(
+    self,
+    tick: int,
+    ticks: int,
+    capacity: Optional[int],
+    root_task_id: str,
+    deferred_pks: Optional[List[int]] = None,
+    last_tick_id: Optional[str] = None,
+    last_released_count: int = 0,
+    last_released_sections: int = 0,
+) -> None:
+    """Start the update of all characters of one tick and schedule the next tick
+
+    Staleness is determined when the tick runs. At most `capacity` characters
+    are updated per tick and remaining characters are deferred to the next tick.
+    Characters remaining after the last tick are deferred to the next cycle.
+    The capacity is adjusted to how many sections released by the last tick
+    the workers have finished.
+
+    Args:
+    - tick: Number of this tick, starting with 0
+    - ticks: Total number of ticks in this cycle
+    - capacity: Maximum number of characters to update or None for no limit
+    - root_task_id: ID of the task, which started this cycle
+    - deferred_pks: PKs of characters deferred from earlier ticks
+    - last_tick_id: ID of the last tick task
+    - last_released_count: Number of characters released by the last tick
+    - last_released_sections: Number of sections released by the last tick
+    """
+    retry_task_if_esi_is_down(self)
+    if last_tick_id:
+        finished_sections = CharacterUpdateStatus.objects.filter(
+            parent_task_id=last_tick_id, finished_at__isnull=False
+        ).count()
+        new_capacity = next_tick_capacity(
+            capacity=capacity,
+            released_count=last_released_count,
+            released_sections=last_released_sections,
+            finished_sections=finished_sections,
+        )
+        if new_capacity != capacity:
+            logger.info(
+                "Tick %d of %d: Finished %d of %d released sections. "
+                "Changing capacity from %s to %s",
+                tick + 1,
+                ticks,
+                finished_sections,
+                last_released_sections,
+                capacity,
+                new_capacity,
+            )
+            capacity = new_capacity
+    characters_with_owners = Character.objects.filter(
+        eve_character__character_ownership__isnull=False
+    )
+    all_character_pks = set(characters_with_owners.values_list("pk", flat=True))
+    deferred_pks = [pk for pk in deferred_pks or [] if pk in all_character_pks]
+    tick_character_pks = sorted(
+        pk
+        for pk in all_character_pks.difference(deferred_pks)
+        if character_tick(pk, ticks) == tick
+    )
+    candidate_pks = deferred_pks + tick_character_pks
+    stale_sections = CharacterUpdateStatus.objects.stale_sections_matrix(candidate_pks)
+    stale_pks = [pk for pk in candidate_pks if stale_sections[pk]]
+    if capacity:
+        release_pks, deferred_pks = stale_pks[:capacity], stale_pks[capacity:]
+    else:
+        release_pks, deferred_pks = stale_pks, []
+
+    shared_character_pks = set(
+        characters_with_owners.filter(
+            pk__in=tick_character_pks, is_shared=True
+        ).values_list("pk", flat=True)
+    )
+    _start_character_updates(
+        stale_sections={pk: stale_sections[pk] for pk in release_pks},
+        shared_character_pks=shared_character_pks,
+        force_update=False,
+        root_task_id=root_task_id,
+        parent_task_id=self.request.id,
+    )
+    for character_pk in shared_character_pks.difference(release_pks):
+        check_character_consistency.apply_async(
+            kwargs={"character_pk": character_pk}, priority=DEFAULT_TASK_PRIORITY
+        )
+    logger.info(
+        "Tick %d of %d: Started update for %d characters and deferred %d",
+        tick + 1,
+        ticks,
+        len(release_pks),
+        len(deferred_pks),
+    )
+    next_kwargs = {
+        "capacity": capacity,
+        "deferred_pks": deferred_pks,
+        "last_tick_id": self.request.id,
+        "last_released_count": len(release_pks),
+        "last_released_sections": sum(len(stale_sections[pk]) for pk in release_pks),
+    }
+    if tick < ticks - 1:
+        update_characters_tick.apply_async(
+            kwargs={
+                **next_kwargs,
+                "tick": tick + 1,
+                "ticks": ticks,
+                "root_task_id": root_task_id,
+            },
+            countdown=SPREAD_TICK_MINUTES * 60,
             priority=DEFAULT_TASK_PRIORITY,
         )
+    else:
+        cache.set(
+            SPREAD_BACKLOG_CACHE_KEY,
+            next_kwargs,
+            timeout=MEMBERAUDIT_UPDATE_STALE_RING_1 * 60 * 2,
+        )
+
+
+def _spread_ticks_count() -> int:
+    """Number of ticks that fit into the time until ring 1 sections become stale."""
+    minutes = MEMBERAUDIT_UPDATE_STALE_RING_1 - MEMBERAUDIT_UPDATE_STALE_OFFSET
+    return max(1, minutes // SPREAD_TICK_MINUTES)
+
+
+def _start_character_updates(
+    stale_sections: Dict[int, Set[str]],
+    shared_character_pks: Set[int],
+    force_update: bool,
+    root_task_id: Optional[str],
+    parent_task_id: Optional[str],
+) -> int:
+    """Start updates for the stale sections of the given characters.
+
+    Also starts a consistency check for given shared characters.
+
+    Returns the number of characters with started updates.
+    """
+    updated_count = 0
+    for character_pk, sections in stale_sections.items():
+        if sections:
+            _start_section_updates(
+                character_pk=character_pk,
+                sections=sections,
+                force_update=force_update,
+                root_task_id=root_task_id,
+                parent_task_id=parent_task_id,
+            )
+            updated_count += 1
+        if character_pk in shared_character_pks:
+            check_character_consistency.apply_async(
+                kwargs={"character_pk": character_pk},
+                priority=DEFAULT_TASK_PRIORITY,
+            )
+    return updated_count
 
 
 # Main character update tasks
@@ -98,115 +332,141 @@ def update_character(self, character_pk: int, force_update: bool = False) -> boo
     if character.is_orphan:
         logger.info("%s: Skipping update for orphaned character", character)
         return False
-    all_sections = set(Character.UpdateSection.values)
-    needs_update = force_update
-    for section in all_sections:
-        needs_update |= character.is_update_section_stale(section)
+    if force_update:
+        sections = set(Character.UpdateSection.values)
+    else:
+        stale_sections = CharacterUpdateStatus.objects.stale_sections_matrix(
+            [character.pk]
+        )
+        sections = stale_sections[character.pk]
 
-    if not needs_update:
+    if not sections:
         logger.info("%s: No update required", character)
         return False
 
     logger.info(
         "%s: Starting %s character update", character, "forced" if force_update else ""
     )
-    sections = all_sections.difference(
-        {
-            Character.UpdateSection.ASSETS,
-            Character.UpdateSection.CONTACTS,
-            Character.UpdateSection.CONTRACTS,
-            Character.UpdateSection.SKILL_SETS,
-            Character.UpdateSection.SKILLS,
-            Character.UpdateSection.WALLET_JOURNAL,
-        }
+    _start_section_updates(
+        character_pk=character.pk,
+        sections=sections,
+        force_update=force_update,
+        root_task_id=self.request.parent_id,
+        parent_task_id=self.request.id,
     )
-    for section in sorted(sections):
-        if force_update or character.is_update_section_stale(section):
-            update_character_section.apply_async(
+    if character.is_shared:
+        check_character_consistency.apply_async(
+            kwargs={"character_pk": character.pk},
+            priority=DEFAULT_TASK_PRIORITY,
+        )
+    return True
+
+
+def _start_section_updates(
+    character_pk: int,
+    sections: Set[str],
+    force_update: bool,
+    root_task_id: Optional[str],
+    parent_task_id: Optional[str],
+) -> None:
+    """Start update tasks for the given sections of a character."""
+    special_sections = {
+        Character.UpdateSection.ASSETS,
+        Character.UpdateSection.CONTACTS,
+        Character.UpdateSection.CONTRACTS,
+        Character.UpdateSection.SKILL_SETS,
+        Character.UpdateSection.SKILLS,
+        Character.UpdateSection.WALLET_JOURNAL,
+    }
+    generic_sections = set(sections).difference(special_sections)
+    if MEMBERAUDIT_TASKS_BUNDLED_UPDATES:
+        bundled_sections = generic_sections.intersection(
+            Character.BUNDLED_UPDATE_SECTIONS
+        )
+        if bundled_sections:
+            update_character_sections_bundled.apply_async(
                 kwargs={
-                    "character_pk": character.pk,
-                    "section": section,
+                    "character_pk": character_pk,
+                    "sections": sorted(bundled_sections),
                     "force_update": force_update,
-                    "root_task_id": self.request.parent_id,
-                    "parent_task_id": self.request.id,
+                    "root_task_id": root_task_id,
+                    "parent_task_id": parent_task_id,
                 },
                 priority=DEFAULT_TASK_PRIORITY,
             )
+        generic_sections = generic_sections.difference(bundled_sections)
 
-    if force_update or character.is_update_section_stale(
-        Character.UpdateSection.CONTACTS
-    ):
+    for section in sorted(generic_sections):
+        update_character_section.apply_async(
+            kwargs={
+                "character_pk": character_pk,
+                "section": section,
+                "force_update": force_update,
+                "root_task_id": root_task_id,
+                "parent_task_id": parent_task_id,
+            },
+            priority=DEFAULT_TASK_PRIORITY,
+        )
+
+    if Character.UpdateSection.CONTACTS in sections:
         update_character_contacts.apply_async(
             kwargs={
-                "character_pk": character.pk,
+                "character_pk": character_pk,
                 "force_update": force_update,
-                "root_task_id": self.request.parent_id,
-                "parent_task_id": self.request.id,
+                "root_task_id": root_task_id,
+                "parent_task_id": parent_task_id,
             },
             priority=DEFAULT_TASK_PRIORITY,
         )
-    if force_update or character.is_update_section_stale(
-        Character.UpdateSection.CONTRACTS
-    ):
+    if Character.UpdateSection.CONTRACTS in sections:
         update_character_contracts.apply_async(
             kwargs={
-                "character_pk": character.pk,
+                "character_pk": character_pk,
                 "force_update": force_update,
-                "root_task_id": self.request.parent_id,
-                "parent_task_id": self.request.id,
+                "root_task_id": root_task_id,
+                "parent_task_id": parent_task_id,
             },
             priority=DEFAULT_TASK_PRIORITY,
         )
-    if force_update or character.is_update_section_stale(
-        Character.UpdateSection.WALLET_JOURNAL
-    ):
+    if Character.UpdateSection.WALLET_JOURNAL in sections:
         update_character_wallet_journal.apply_async(
             kwargs={
-                "character_pk": character.pk,
-                "root_task_id": self.request.parent_id,
-                "parent_task_id": self.request.id,
+                "character_pk": character_pk,
+                "root_task_id": root_task_id,
+                "parent_task_id": parent_task_id,
             },
             priority=DEFAULT_TASK_PRIORITY,
         )
-    if force_update or character.is_update_section_stale(
-        Character.UpdateSection.ASSETS
-    ):
+    if Character.UpdateSection.ASSETS in sections:
         update_character_assets.apply_async(
             kwargs={
-                "character_pk": character.pk,
+                "character_pk": character_pk,
                 "force_update": force_update,
-                "root_task_id": self.request.parent_id,
-                "parent_task_id": self.request.id,
+                "root_task_id": root_task_id,
+                "parent_task_id": parent_task_id,
             },
             priority=DEFAULT_TASK_PRIORITY,
         )
     if (
-        force_update
-        or character.is_update_section_stale(Character.UpdateSection.SKILLS)
-        or character.is_update_section_stale(Character.UpdateSection.SKILL_SETS)
+        Character.UpdateSection.SKILLS in sections
+        or Character.UpdateSection.SKILL_SETS in sections
     ):
         chain(
             update_character_section.si(
-                character.pk,
+                character_pk,
                 Character.UpdateSection.SKILLS,
                 force_update,
-                self.request.parent_id,
-                self.request.id,
+                root_task_id,
+                parent_task_id,
             ),
             update_character_section.si(
-                character.pk,
+                character_pk,
                 Character.UpdateSection.SKILL_SETS,
                 force_update,
-                self.request.parent_id,
-                self.request.id,
+                root_task_id,
+                parent_task_id,
             ),
         ).apply_async(priority=DEFAULT_TASK_PRIORITY)
-    if character.is_shared:
-        check_character_consistency.apply_async(
-            kwargs={"character_pk": character.pk},
-            priority=DEFAULT_TASK_PRIORITY,
-        )
-    return True
 
 
 # Update sections
@@ -244,6 +504,72 @@ def update_character_section(
     _log_character_update_success(character, section)
 
 
+@shared_task(
+    **{
+        **TASK_ESI_KWARGS,
+        **{"base": QueueOnce, "once": {"keys": ["character_pk"], "graceful": True}},
+    }
+)
+def update_character_sections_bundled(
+    self,
+    character_pk: int,
+    sections: List[str],
+    force_update: bool = False,
+    root_task_id: str = None,
+    parent_task_id: str = None,
+) -> None:
+    """Task that updates several light sections of a character at once.
+
+    The token is fetched once and the data of all sections is fetched from ESI
+    concurrently. The data is then stored one section after the other.
+    """
+    retry_task_if_esi_is_down(self)
+    character = Character.objects.get_cached(
+        pk=character_pk, timeout=MEMBERAUDIT_TASKS_OBJECT_CACHE_TIMEOUT
+    )
+    for section in sections:
+        character.reset_update_section(section, root_task_id, parent_task_id)
+    try:
+        token = character.fetch_token()
+        token.valid_access_token()  # refresh ahead of worker threads if needed
+    except Exception as ex:
+        if isinstance(ex, TokenError):
+            character.invalidate_token_cache()
+        for section in sections:
+            _log_character_update_error(character, section, ex)
+        raise ex
+
+    logger.info("%s: Updating %s sections bundled", character, len(sections))
+    with ThreadPoolExecutor(
+        max_workers=MEMBERAUDIT_TASKS_BUNDLED_MAX_WORKERS
+    ) as executor:
+        futures = {
+            section: executor.submit(
+                _fetch_section_data_in_thread, character, token, section
+            )
+            for section in sections
+        }
+
+    for section in sections:
+        try:
+            data = futures[section].result()
+            character.store_section_data(token, section, data, force_update)
+        except Exception as ex:
+            _log_character_update_error(character, section, ex)
+        else:
+            _log_character_update_success(character, section)
+
+
+def _fetch_section_data_in_thread(
+    character: Character, token: Token, section: str
+) -> Any:
+    """Fetch data for a section and release DB connections of the worker thread."""
+    try:
+        return character.fetch_section_data(token, section)
+    finally:
+        connections.close_all()
+
+
 def _character_update_with_error_logging(
     self, character: Character, section: str, method: object, *args, **kwargs
 ):
@@ -253,26 +579,31 @@ def _character_update_with_error_logging(
     try:
         return method(*args, **kwargs)
     except Exception as ex:
-        error_message = f"{type(ex).__name__}: {str(ex)}"
-        logger.error(
-            "%s: %s: Error ocurred: %s",
-            character,
-            Character.UpdateSection.display_name(section),
-            error_message,
-            exc_info=True,
-        )
-        CharacterUpdateStatus.objects.update_or_create(
-            character=character,
-            section=section,
-            defaults={
-                "is_success": False,
-                "last_error_message": error_message,
-                "finished_at": now(),
-            },
-        )
+        _log_character_update_error(character, section, ex)
         raise ex
 
 
+def _log_character_update_error(character: Character, section: str, ex: Exception):
+    """Logs character update error for a section"""
+    error_message = f"{type(ex).__name__}: {str(ex)}"
+    logger.error(
+        "%s: %s: Error ocurred: %s",
+        character,
+        Character.UpdateSection.display_name(section),
+        error_message,
+        exc_info=True,
+    )
+    CharacterUpdateStatus.objects.update_or_create(
+        character=character,
+        section=section,
+        defaults={
+            "is_success": False,
+            "last_error_message": error_message,
+            "finished_at": now(),
+        },
+    )
+
+
 def _log_character_update_success(character: Character, section: str):
     """Logs character update success for a section"""
     logger.info(
@@ -332,7 +663,7 @@ def update_character_assets(
     chain(
         assets_build_list_from_esi.s(character.pk, force_update),
         assets_preload_objects.s(character.pk),
-        assets_create_parents.s(character.pk),
+        assets_build_tree.s(character.pk),
     ).apply_async(priority=DEFAULT_TASK_PRIORITY)
 
 
@@ -374,17 +705,17 @@ def assets_preload_objects(self, asset_list: dict, character_pk: int) -> Optiona
     return asset_list
 
 
-@shared_task(**TASK_ESI_KWARGS)
-def assets_create_parents(
-    self, asset_list: list, character_pk: int, cycle: int = 1
-) -> None:
-    """creates the parent assets from given asset_list
-
-    Parent assets are assets attached directly to a Location object (e.g. station)
+@shared_task(
+    **{
+        **TASK_ESI_KWARGS,
+        **{"base": QueueOnce, "once": {"keys": ["character_pk"], "graceful": True}},
+    }
+)
+def assets_build_tree(self, asset_list: list, character_pk: int) -> None:
+    """Builds the asset tree from given asset list within one task.
 
-    This task will recursively call itself until all possible parent assets
-    from the asset list have been created.
-    Then call another task to create child assets.
+    Assets attached directly to a Location object (e.g. station) become parents
+    and all other assets are placed into their containers.
     """
     character = Character.objects.get_cached(
         pk=character_pk, timeout=MEMBERAUDIT_TASKS_OBJECT_CACHE_TIMEOUT
@@ -393,149 +724,29 @@ def assets_create_parents(
         _log_character_update_success(character, Character.UpdateSection.ASSETS)
         return
 
-    logger.info("%s: Creating parent assets - pass %s", character, cycle)
-
-    assets_flat = {int(x["item_id"]): x for x in asset_list}
-    new_assets = list()
-    with transaction.atomic():
-        if cycle == 1:
-            character.assets.all().delete()
-
-        location_ids = set(Location.objects.values_list("id", flat=True))
-        parent_asset_ids = {
-            item_id
-            for item_id, asset_info in assets_flat.items()
-            if asset_info.get("location_id")
-            and asset_info["location_id"] in location_ids
-        }
-        for item_id in parent_asset_ids:
-            item = assets_flat[item_id]
-            new_assets.append(
-                CharacterAsset(
-                    character=character,
-                    item_id=item_id,
-                    location_id=item["location_id"],
-                    eve_type_id=item.get("type_id"),
-                    name=item.get("name"),
-                    is_blueprint_copy=item.get("is_blueprint_copy"),
-                    is_singleton=item.get("is_singleton"),
-                    location_flag=item.get("location_flag"),
-                    quantity=item.get("quantity"),
-                )
-            )
-            assets_flat.pop(item_id)
-            if len(new_assets) >= MEMBERAUDIT_TASKS_MAX_ASSETS_PER_PASS:
-                break
-
-        logger.info("%s: Writing %s parent assets", character, len(new_assets))
-        # TODO: `ignore_conflicts=True` needed as workaround to compensate for
-        # occasional duplicate FK constraint errors. Needs to be investigated
-        CharacterAsset.objects.bulk_create(
-            new_assets,
-            batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE,
-            ignore_conflicts=True,
-        )
-
-    if len(parent_asset_ids) > len(new_assets):
-        # there are more parent assets to create
-        assets_create_parents.apply_async(
-            kwargs={
-                "asset_list": list(assets_flat.values()),
-                "character_pk": character.pk,
-                "cycle": cycle + 1,
-            },
-            priority=DEFAULT_TASK_PRIORITY,
-        )
-    else:
-        # all parent assets created
-        if assets_flat:
-            assets_create_children.apply_async(
-                kwargs={
-                    "asset_list": list(assets_flat.values()),
-                    "character_pk": character.pk,
-                },
-                priority=DEFAULT_TASK_PRIORITY,
-            )
-        else:
-            _log_character_update_success(character, Character.UpdateSection.ASSETS)
-
-
-@shared_task(**TASK_ESI_KWARGS)
-def assets_create_children(
-    self, asset_list: dict, character_pk: int, cycle: int = 1
-) -> None:
-    """Created child assets from given asset list
-
-    Child assets are assets located within other assets (aka containers)
-
-    This task will recursively call itself until all possible assets from the
-    asset list are included into the asset tree
-    """
-    character = Character.objects.get_cached(
-        pk=character_pk, timeout=MEMBERAUDIT_TASKS_OBJECT_CACHE_TIMEOUT
+    logger.info("%s: Building asset tree with %s assets", character, len(asset_list))
+    tree = _character_update_with_error_logging(
+        self,
+        character,
+        Character.UpdateSection.ASSETS,
+        CharacterAsset.objects.update_for_character,
+        character,
+        asset_list,
     )
-    logger.info("%s: Creating child assets - pass %s", character, cycle)
-
-    # for debug
-    # character._store_list_to_disk(asset_list, f"child_asset_list_{cycle}")
-
-    new_assets = list()
-    assets_flat = {int(x["item_id"]): x for x in asset_list}
-    with transaction.atomic():
-        parent_asset_ids = set(character.assets.values_list("item_id", flat=True))
-        child_asset_ids = {
-            item_id
-            for item_id, item in assets_flat.items()
-            if item.get("location_id") and item["location_id"] in parent_asset_ids
-        }
-        for item_id in child_asset_ids:
-            item = assets_flat[item_id]
-            new_assets.append(
-                CharacterAsset(
-                    character=character,
-                    item_id=item_id,
-                    parent=character.assets.get(item_id=item["location_id"]),
-                    eve_type_id=item.get("type_id"),
-                    name=item.get("name"),
-                    is_blueprint_copy=item.get("is_blueprint_copy"),
-                    is_singleton=item.get("is_singleton"),
-                    location_flag=item.get("location_flag"),
-                    quantity=item.get("quantity"),
-                )
-            )
-            assets_flat.pop(item_id)
-            if len(new_assets) >= MEMBERAUDIT_TASKS_MAX_ASSETS_PER_PASS:
-                break
-
-        if new_assets:
-            logger.info("%s: Writing %s child assets", character, len(new_assets))
-            # TODO: `ignore_conflicts=True` needed as workaround to compensate for
-            # occasional duplicate FK constraint errors. Needs to be investigated
-            CharacterAsset.objects.bulk_create(
-                new_assets,
-                batch_size=MEMBERAUDIT_BULK_METHODS_BATCH_SIZE,
-                ignore_conflicts=True,
-            )
-
-    if new_assets and assets_flat:
-        # there are more child assets to create
-        assets_create_children.apply_async(
-            kwargs={
-                "asset_list": list(assets_flat.values()),
-                "character_pk": character.pk,
-                "cycle": cycle + 1,
-            },
-            priority=DEFAULT_TASK_PRIORITY,
+    if tree.has_failed_items:
+        logger.warning(
+            "%s: Failed to add %s assets to the tree. "
+            "Orphaned: %s (e.g. %s), cyclic: %s (e.g. %s)",
+            character,
+            len(tree.orphaned_ids) + len(tree.cyclic_ids),
+            len(tree.orphaned_ids),
+            sorted(tree.orphaned_ids)[:ASSET_LOG_SAMPLE_SIZE],
+            len(tree.cyclic_ids),
+            sorted(tree.cyclic_ids)[:ASSET_LOG_SAMPLE_SIZE],
         )
-    else:
-        _log_character_update_success(character, Character.UpdateSection.ASSETS)
-        if len(assets_flat) > 0:
-            logger.warning(
-                "%s: Failed to add %s assets to the tree: %s",
-                character,
-                len(assets_flat),
-                assets_flat.keys(),
-            )
+    CharacterAssetValuation.objects.update_for_character(character)
+    _log_character_update_success(character, Character.UpdateSection.ASSETS)
+
 
 # special tasks for updating contacts
 
@@ -770,6 +981,46 @@ def update_market_prices(self):
     EveMarketPrice.objects.update_from_esi(
         minutes_until_stale=MEMBERAUDIT_UPDATE_STALE_RING_2
     )
+    update_asset_valuations.apply_async(priority=DEFAULT_TASK_PRIORITY)
+
+
+@shared_task(
+    **{
+        **TASK_DEFAULT_KWARGS,
+        **{
+            "base": QueueOnce,
+            "once": {"keys": [], "graceful": True, "unlock_before_run": True},
+        },
+    }
+)
+def update_asset_valuations() -> None:
+    """Start refreshing asset contents and valuation snapshots
+    of all characters with assets.
+    """
+    character_pks = (
+        Character.objects.filter(assets__isnull=False)
+        .distinct()
+        .values_list("pk", flat=True)
+    )
+    for character_pk in character_pks:
+        update_character_asset_valuation.apply_async(
+            kwargs={"character_pk": character_pk}, priority=DEFAULT_TASK_PRIORITY
+        )
+
+
+@shared_task(
+    **{
+        **TASK_DEFAULT_KWARGS,
+        **{"base": QueueOnce, "once": {"keys": ["character_pk"], "graceful": True}},
+    }
+)
+def update_character_asset_valuation(character_pk: int) -> None:
+    """Refresh asset contents and valuation snapshot of a character."""
+    character = Character.objects.get_cached(
+        pk=character_pk, timeout=MEMBERAUDIT_TASKS_OBJECT_CACHE_TIMEOUT
+    )
+    CharacterAsset.objects.update_contents(character)
+    CharacterAssetValuation.objects.update_for_character(character)
 
 
 @shared_task(
@@ -844,22 +1095,65 @@ def update_structure_esi(self, id: int, token_pk: int):
         # raise self.retry(countdown=ex.retry_in)
 
 
+@shared_task(
+    **{
+        **TASK_DEFAULT_KWARGS,
+        **{
+            "base": QueueOnce,
+            "once": {
+                "keys": ["skill_set_pk"],
+                "graceful": True,
+                "unlock_before_run": True,
+            },
+        },
+    }
+)
+def update_skill_set_checks(skill_set_pk: int) -> None:
+    """Update checks of a skill set for all characters in one pass."""
+    CharacterSkillSetCheck.objects.update_for_skill_sets([skill_set_pk])
+
+
+@shared_task(
+    **{
+        **TASK_DEFAULT_KWARGS,
+        **{
+            "base": QueueOnce,
+            "once": {"keys": [], "graceful": True, "unlock_before_run": True},
+        },
+    }
+)
+def update_skill_sets_report() -> None:
+    """Recompute the skill sets report for all characters."""
+    CharacterSkillSetReportRow.objects.update_for_characters(
+        Character.objects.values_list("pk", flat=True)
+    )
+
+
+@shared_task(**TASK_DEFAULT_KWARGS)
+def update_skill_sets_report_for_characters(character_pks: List[int]) -> None:
+    """Recompute the skill sets report rows of the given characters."""
+    CharacterSkillSetReportRow.objects.update_for_characters(character_pks)
+
+
 @shared_task(**TASK_DEFAULT_KWARGS)
 def update_characters_skill_checks(force_update: bool = False) -> None:
     """Start the update of skill checks for all registered characters
 
     Args:
-    - force_update: When set to True will always update regardless of stale status
+    - force_update: When set to True will update all characters in one pass \
+        regardless of stale status
     """
     section = Character.UpdateSection.SKILL_SETS
-    for character in Character.objects.all():
-        if force_update or character.is_update_section_stale(section):
+    character_pks = Character.objects.values_list("pk", flat=True)
+    if force_update:
+        CharacterSkillSetCheck.objects.update_for_characters(character_pks)
+        return
+
+    stale_sections = CharacterUpdateStatus.objects.stale_sections_matrix(character_pks)
+    for character_pk, sections in stale_sections.items():
+        if section in sections:
             update_character_section.apply_async(
-                kwargs={
-                    "character_pk": character.pk,
-                    "section": section,
-                    "force_update": force_update,
-                },
+                kwargs={"character_pk": character_pk, "section": section},
                 priority=DEFAULT_TASK_PRIORITY,
             )
 
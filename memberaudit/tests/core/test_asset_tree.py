@@ -0,0 +1,69 @@
+from app_utils.testing import NoSocketsTestCase
+
+from ...core.asset_tree import build_asset_tree
+
+
+def make_item(item_id: int, location_id: int) -> dict:
+    return {"item_id": item_id, "location_id": location_id, "type_id": 603}
+
+
+class TestBuildAssetTree(NoSocketsTestCase):
+    def test_should_order_items_into_levels(self):
+        # given
+        asset_list = [
+            make_item(3, 2),
+            make_item(2, 1),
+            make_item(4, 1),
+            make_item(1, 100),
+            make_item(5, 200),
+        ]
+        # when
+        tree = build_asset_tree(asset_list, location_ids={100, 200})
+        # then
+        levels = [{item["item_id"] for item in level} for level in tree.levels]
+        self.assertListEqual(levels, [{1, 5}, {2, 4}, {3}])
+        self.assertEqual(len(tree), 5)
+        self.assertFalse(tree.has_failed_items)
+
+    def test_should_return_items_with_parents_first(self):
+        # given
+        asset_list = [make_item(3, 2), make_item(2, 1), make_item(1, 100)]
+        # when
+        tree = build_asset_tree(asset_list, location_ids={100})
+        # then
+        item_ids = [item["item_id"] for item in tree.items()]
+        self.assertListEqual(item_ids, [1, 2, 3])
+
+    def test_should_report_items_with_unknown_location_as_orphans(self):
+        # given
+        asset_list = [make_item(1, 100), make_item(2, 999), make_item(3, 2)]
+        # when
+        tree = build_asset_tree(asset_list, location_ids={100})
+        # then
+        self.assertEqual(len(tree), 1)
+        self.assertSetEqual(tree.orphaned_ids, {2, 3})
+        self.assertSetEqual(tree.cyclic_ids, set())
+        self.assertTrue(tree.has_failed_items)
+
+    def test_should_report_items_in_location_loops_as_cyclic(self):
+        # given
+        asset_list = [
+            make_item(1, 100),
+            make_item(2, 3),
+            make_item(3, 2),
+            make_item(4, 3),
+            make_item(5, 5),
+        ]
+        # when
+        tree = build_asset_tree(asset_list, location_ids={100})
+        # then
+        self.assertEqual(len(tree), 1)
+        self.assertSetEqual(tree.cyclic_ids, {2, 3, 5})
+        self.assertSetEqual(tree.orphaned_ids, {4})
+
+    def test_should_handle_empty_list(self):
+        # when
+        tree = build_asset_tree([], location_ids={100})
+        # then
+        self.assertEqual(len(tree), 0)
+        self.assertFalse(tree.has_failed_items)
@@ -0,0 +1,57 @@
+from unittest.mock import patch
+
+from app_utils.testing import NoSocketsTestCase
+
+from ...core.local_cache import LocalLRUCache
+
+MODULE_PATH = "memberaudit.core.local_cache"
+
+
+class TestLocalLRUCache(NoSocketsTestCase):
+    def test_should_return_stored_value(self):
+        # given
+        cache = LocalLRUCache(max_size=2)
+        cache.set("a", 1)
+        # when/then
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("b", 2), 2)
+
+    def test_should_evict_least_recently_used_entry(self):
+        # given
+        cache = LocalLRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        # when
+        cache.set("c", 3)
+        # then
+        self.assertEqual(len(cache), 2)
+        self.assertListEqual(cache.keys(), ["a", "c"])
+
+    @patch(MODULE_PATH + ".time")
+    def test_should_expire_entries_after_timeout(self, mock_time):
+        # given
+        cache = LocalLRUCache(max_size=2)
+        mock_time.monotonic.return_value = 100
+        cache.set("a", 1, timeout=10)
+        cache.set("b", 2)
+        # when
+        mock_time.monotonic.return_value = 110
+        # then
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+        self.assertListEqual(cache.keys(), ["b"])
+
+    def test_should_delete_entries(self):
+        # given
+        cache = LocalLRUCache(max_size=3)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+        # when
+        cache.delete_many(["a", "c", "x"])
+        # then
+        self.assertListEqual(cache.keys(), ["b"])
+        cache.clear()
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,55 @@
+from django.test import TestCase
+
+from ...core.skill_set_matrix import SkillRequirement, SkillSetMatrix
+
+
+class TestSkillSetMatrix(TestCase):
+    def setUp(self) -> None:
+        self.matrix = SkillSetMatrix(
+            [
+                SkillRequirement(1, 11, 101, 3, 5),
+                SkillRequirement(1, 12, 102, 1, None),
+                SkillRequirement(2, 21, 101, None, 4),
+            ],
+            skill_set_ids=[3],
+        )
+
+    def test_should_report_all_skill_sets_and_skill_types(self):
+        # then
+        self.assertEqual(self.matrix.skill_set_ids, (1, 2, 3))
+        self.assertSetEqual(self.matrix.eve_type_ids, {101, 102})
+        self.assertEqual(len(self.matrix), 3)
+
+    def test_should_pass_all_skill_sets(self):
+        # when
+        results = self.matrix.check({101: 5, 102: 1})
+        # then
+        for result in results.values():
+            self.assertListEqual(result.failed_required_skill_ids, [])
+            self.assertListEqual(result.failed_recommended_skill_ids, [])
+
+    def test_should_report_failed_skills(self):
+        # when
+        results = self.matrix.check({101: 3})
+        # then
+        self.assertListEqual(results[1].failed_required_skill_ids, [12])
+        self.assertListEqual(results[1].failed_recommended_skill_ids, [11])
+        self.assertListEqual(results[2].failed_required_skill_ids, [])
+        self.assertListEqual(results[2].failed_recommended_skill_ids, [21])
+
+    def test_should_pass_skill_sets_without_skills(self):
+        # when
+        results = self.matrix.check(dict())
+        # then
+        self.assertListEqual(results[3].failed_required_skill_ids, [])
+        self.assertListEqual(results[3].failed_recommended_skill_ids, [])
+
+    def test_should_create_subset_for_given_skill_sets(self):
+        # when
+        subset = self.matrix.subset([2, 3, 4])
+        # then
+        self.assertEqual(subset.skill_set_ids, (2, 3))
+        self.assertSetEqual(subset.eve_type_ids, {101})
+        results = subset.check(dict())
+        self.assertSetEqual(set(results.keys()), {2, 3})
+        self.assertListEqual(results[2].failed_recommended_skill_ids, [21])
@@ -0,0 +1,106 @@
+from collections import Counter
+
+from app_utils.testing import NoSocketsTestCase
+
+from ...core.update_schedule import (
+    character_tick,
+    next_tick_capacity,
+    tick_capacity,
+)
+
+
+class TestCharacterTick(NoSocketsTestCase):
+    def test_should_always_return_same_tick_for_character(self):
+        # when
+        ticks = {character_tick(42, 11) for _ in range(3)}
+        # then
+        self.assertEqual(len(ticks), 1)
+
+    def test_should_spread_sequential_pks_evenly(self):
+        # when
+        counts = Counter(character_tick(pk, 11) for pk in range(1, 1101))
+        # then
+        self.assertSetEqual(set(counts.keys()), set(range(11)))
+        self.assertLessEqual(max(counts.values()) - min(counts.values()), 2)
+
+    def test_should_return_first_tick_when_only_one(self):
+        self.assertEqual(character_tick(42, 1), 0)
+
+
+class TestTickCapacity(NoSocketsTestCase):
+    def test_should_return_none_without_throughput(self):
+        # when
+        result = tick_capacity(tick_minutes=5, throughputs_per_hour=[None, None])
+        # then
+        self.assertIsNone(result)
+
+    def test_should_use_lowest_throughput(self):
+        # when
+        result = tick_capacity(tick_minutes=5, throughputs_per_hour=[1200, 600, None])
+        # then
+        self.assertEqual(result, 50)
+
+    def test_should_allow_capacity_below_even_share(self):
+        # when
+        result = tick_capacity(tick_minutes=5, throughputs_per_hour=[12])
+        # then
+        self.assertEqual(result, 1)
+
+    def test_should_be_at_least_one(self):
+        # when
+        result = tick_capacity(tick_minutes=5, throughputs_per_hour=[6])
+        # then
+        self.assertEqual(result, 1)
+
+
+class TestNextTickCapacity(NoSocketsTestCase):
+    def test_should_keep_capacity_when_nothing_was_released(self):
+        # when
+        result = next_tick_capacity(
+            capacity=10, released_count=0, released_sections=0, finished_sections=0
+        )
+        # then
+        self.assertEqual(result, 10)
+
+    def test_should_shrink_to_share_of_finished_sections(self):
+        # when
+        result = next_tick_capacity(
+            capacity=10, released_count=10, released_sections=100, finished_sections=40
+        )
+        # then
+        self.assertEqual(result, 4)
+
+    def test_should_shrink_to_at_least_one(self):
+        # when
+        result = next_tick_capacity(
+            capacity=10, released_count=10, released_sections=100, finished_sections=0
+        )
+        # then
+        self.assertEqual(result, 1)
+
+    def test_should_grow_after_full_tick_was_finished(self):
+        # when
+        result = next_tick_capacity(
+            capacity=10, released_count=10, released_sections=100, finished_sections=100
+        )
+        # then
+        self.assertEqual(result, 15)
+
+    def test_should_keep_capacity_after_partial_tick_was_finished(self):
+        # when
+        result = next_tick_capacity(
+            capacity=10, released_count=5, released_sections=50, finished_sections=50
+        )
+        # then
+        self.assertEqual(result, 10)
+
+    def test_should_set_capacity_when_unlimited_tick_was_not_finished(self):
+        # when
+        result = next_tick_capacity(
+            capacity=None,
+            released_count=20,
+            released_sections=200,
+            finished_sections=50,
+        )
+        # then
+        self.assertEqual(result, 5)
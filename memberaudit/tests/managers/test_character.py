@@ -1,11 +1,15 @@
 import datetime as dt
+from unittest.mock import patch
 
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils.timezone import now
 
+from allianceauth.authentication.models import CharacterOwnership
 from allianceauth.eveonline.models import EveAllianceInfo
 from allianceauth.tests.auth_utils import AuthUtils
 
+from ...core.local_cache import LocalLRUCache
 from ...models import Character, CharacterUpdateStatus
 from ..testdata.load_entities import load_entities
 from ..utils import add_memberaudit_character_to_user, create_memberaudit_character
@@ -50,6 +54,114 @@ class TestCharacterManager(TestCase):
         self.assertSetEqual(character_ids, set())
 
 
+class TestCharacterManagerCache(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        load_entities()
+
+    def setUp(self) -> None:
+        cache.clear()
+        Character.objects._local_cache.clear()
+
+    def test_should_return_character_from_local_cache(self):
+        # given
+        character = create_memberaudit_character(1001)
+        obj_1 = Character.objects.get_cached(pk=character.pk, timeout=60)
+        # when
+        with patch("app_utils.caching.cache") as mock_cache:
+            obj_2 = Character.objects.get_cached(pk=character.pk, timeout=60)
+        # then
+        self.assertEqual(obj_1.pk, obj_2.pk)
+        self.assertFalse(mock_cache.get_or_set.called)
+
+    def test_should_return_new_copy_from_local_cache(self):
+        # given
+        character = create_memberaudit_character(1001)
+        obj_1 = Character.objects.get_cached(pk=character.pk, timeout=60)
+        self.assertIsNotNone(obj_1.user)
+        # when
+        obj_2 = Character.objects.get_cached(pk=character.pk, timeout=60)
+        # then
+        self.assertIsNot(obj_1, obj_2)
+        self.assertNotIn("user", obj_2.__dict__)
+        self.assertFalse(obj_2._state.fields_cache)
+
+    def test_should_see_ownership_changes_made_elsewhere(self):
+        # given
+        character = create_memberaudit_character(1001)
+        other_user = AuthUtils.create_user("Other User")
+        obj_1 = Character.objects.get_cached(pk=character.pk, timeout=60)
+        self.assertNotEqual(obj_1.user, other_user)
+        # when
+        CharacterOwnership.objects.filter(character=character.eve_character).update(
+            user=other_user
+        )  # does not send signals
+        # then
+        obj_2 = Character.objects.get_cached(pk=character.pk, timeout=60)
+        self.assertEqual(obj_2.user, other_user)
+
+    def test_should_fetch_character_again_after_clearing_cache(self):
+        # given
+        character = create_memberaudit_character(1001)
+        obj_1 = Character.objects.get_cached(pk=character.pk, timeout=60)
+        Character.objects.filter(pk=character.pk).update(is_shared=True)
+        # when
+        Character.objects.clear_cache(pk=character.pk)
+        obj_2 = Character.objects.get_cached(pk=character.pk, timeout=60)
+        # then
+        self.assertIsNot(obj_1, obj_2)
+        self.assertTrue(obj_2.is_shared)
+
+    def test_should_clear_cache_when_character_changes(self):
+        # given
+        character = create_memberaudit_character(1001)
+        Character.objects.get_cached(pk=character.pk, timeout=60)
+        # when
+        character.is_shared = True
+        character.save()
+        # then
+        obj = Character.objects.get_cached(pk=character.pk, timeout=60)
+        self.assertTrue(obj.is_shared)
+
+    def test_should_clear_cache_when_ownership_changes(self):
+        # given
+        character = create_memberaudit_character(1001)
+        obj_1 = Character.objects.get_cached(pk=character.pk, timeout=60)
+        self.assertIsNotNone(obj_1.user)
+        # when
+        character.character_ownership.delete()
+        # then
+        obj_2 = Character.objects.get_cached(pk=character.pk, timeout=60)
+        self.assertIsNone(obj_2.user)
+
+    def test_should_clear_cache_when_eve_character_changes(self):
+        # given
+        character = create_memberaudit_character(1001)
+        Character.objects.get_cached(pk=character.pk, timeout=60)
+        eve_character = character.eve_character
+        # when
+        eve_character.character_name = "Bruce Wayne II"
+        eve_character.save()
+        # then
+        obj = Character.objects.get_cached(pk=character.pk, timeout=60)
+        self.assertEqual(obj.eve_character.character_name, "Bruce Wayne II")
+
+    def test_should_fetch_character_again_after_another_process_changed_it(self):
+        # given
+        character = create_memberaudit_character(1001)
+        Character.objects.get_cached(pk=character.pk, timeout=60)
+        # when
+        with patch.object(
+            Character.objects, "_local_cache", LocalLRUCache(max_size=10)
+        ):  # another process with its own in-process cache
+            character.is_shared = True
+            character.save()
+        # then
+        obj = Character.objects.get_cached(pk=character.pk, timeout=60)
+        self.assertTrue(obj.is_shared)
+
+
 class TestCharacterManagerUserHasScope(TestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -387,3 +499,91 @@ class TestCharacterUpdateStatusManager(TestCase):
         self.assertEqual(stats["ring_2"]["last"]["section"], "skills")
         self.assertEqual(stats["ring_3"]["max"]["section"], "assets")
         self.assertEqual(stats["ring_3"]["max"]["duration"], 90)
+
+
+class TestCharacterUpdateStatusManagerStaleSections(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        load_entities()
+        cls.character_1001 = create_memberaudit_character(1001)
+        cls.character_1002 = create_memberaudit_character(1002)
+        cls.all_sections = set(Character.UpdateSection.values)
+
+    def _create_status(self, character, section, started_at, is_success=True):
+        CharacterUpdateStatus.objects.create(
+            character=character,
+            section=section,
+            is_success=is_success,
+            started_at=started_at,
+            finished_at=started_at + dt.timedelta(seconds=5),
+        )
+
+    def test_should_report_all_sections_as_stale_without_status(self):
+        # when
+        result = CharacterUpdateStatus.objects.stale_sections_matrix(
+            [self.character_1001.pk]
+        )
+        # then
+        self.assertDictEqual(result, {self.character_1001.pk: self.all_sections})
+
+    def test_should_report_stale_sections_per_character(self):
+        # given
+        my_now = now()
+        self._create_status(
+            self.character_1001, Character.UpdateSection.LOCATION, my_now
+        )
+        self._create_status(
+            self.character_1001,
+            Character.UpdateSection.ONLINE_STATUS,
+            my_now - dt.timedelta(hours=2),
+        )
+        self._create_status(
+            self.character_1001,
+            Character.UpdateSection.ASSETS,
+            my_now - dt.timedelta(hours=2),
+        )
+        self._create_status(
+            self.character_1002, Character.UpdateSection.SHIP, my_now, is_success=False
+        )
+        # when
+        result = CharacterUpdateStatus.objects.stale_sections_matrix(
+            [self.character_1001.pk, self.character_1002.pk]
+        )
+        # then
+        self.assertSetEqual(
+            result[self.character_1001.pk],
+            self.all_sections
+            - {Character.UpdateSection.LOCATION, Character.UpdateSection.ASSETS},
+        )
+        self.assertSetEqual(result[self.character_1002.pk], self.all_sections)
+
+    def test_should_match_staleness_of_character(self):
+        # given
+        my_now = now()
+        for num, section in enumerate(sorted(self.all_sections)):
+            self._create_status(
+                self.character_1001, section, my_now - dt.timedelta(minutes=num * 30)
+            )
+        # when
+        result = CharacterUpdateStatus.objects.stale_sections_matrix(
+            [self.character_1001.pk]
+        )
+        # then
+        expected = {
+            section
+            for section in self.all_sections
+            if self.character_1001.is_update_section_stale(section)
+        }
+        self.assertSetEqual(result[self.character_1001.pk], expected)
+
+    def test_should_need_one_query_for_many_characters(self):
+        # given
+        character_pks = Character.objects.values_list("pk", flat=True)
+        # when
+        with self.assertNumQueries(2):
+            result = CharacterUpdateStatus.objects.stale_sections_matrix(character_pks)
+        # then
+        self.assertSetEqual(
+            set(result.keys()), {self.character_1001.pk, self.character_1002.pk}
+        )
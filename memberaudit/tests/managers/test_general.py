@@ -22,8 +22,10 @@ from app_utils.testing import (
 from memberaudit.models import (
     ComplianceGroupDesignation,
     Location,
+    LocationAccess,
     MailEntity,
     SkillSet,
+    SkillSetSkill,
 )
 
 from ..testdata.esi_client_stub import esi_client_stub
@@ -32,7 +34,9 @@ from ..testdata.factories import (
     create_fitting,
     create_skill,
     create_skill_plan,
+    create_skill_set,
     create_skill_set_group,
+    create_skill_set_skill,
 )
 from ..testdata.load_entities import load_entities
 from ..testdata.load_eveuniverse import load_eveuniverse
@@ -729,6 +733,242 @@ class TestLocationManager(NoSocketsTestCase):
         )
         self.assertTrue(created)
 
+    @patch(MANAGERS_PATH + ".fetch_esi_status")
+    def test_should_back_off_from_structure_after_access_error(
+        self, mock_fetch_esi_status, mock_esi
+    ):
+        # given
+        mock_fetch_esi_status.return_value = EsiStatus(True, 99, 60)
+        mock_esi.client.Universe.get_universe_structures_structure_id.side_effect = (
+            HTTPForbidden(response=BravadoResponseStub(403, "Test exception"))
+        )
+        # when
+        Location.objects.structure_update_or_create_esi(1000000000099, self.token)
+        Location.objects.structure_update_or_create_esi(1000000000099, self.token)
+        # then
+        self.assertEqual(
+            mock_esi.client.Universe.get_universe_structures_structure_id.call_count,
+            1,
+        )
+        obj = Location.objects.get(id=1000000000099)
+        self.assertEqual(obj.access_errors, 1)
+        self.assertAlmostEqual(
+            obj.access_retry_at,
+            now() + dt.timedelta(minutes=15),
+            delta=dt.timedelta(seconds=30),
+        )
+        access = obj.accesses.get()
+        self.assertEqual(access.character, self.character)
+        self.assertFalse(access.has_access)
+
+    @patch(MANAGERS_PATH + ".fetch_esi_status")
+    def test_should_not_refresh_empty_structure_on_access_error(
+        self, mock_fetch_esi_status, mock_esi
+    ):
+        # given
+        mock_fetch_esi_status.return_value = EsiStatus(True, 99, 60)
+        mock_esi.client.Universe.get_universe_structures_structure_id.side_effect = (
+            HTTPForbidden(response=BravadoResponseStub(403, "Test exception"))
+        )
+        updated_at = now() - dt.timedelta(hours=1)
+        with patch("django.utils.timezone.now", Mock(return_value=updated_at)):
+            Location.objects.create(id=1000000000099)
+        # when
+        Location.objects.structure_update_or_create_esi(1000000000099, self.token)
+        # then
+        obj = Location.objects.get(id=1000000000099)
+        self.assertEqual(obj.access_errors, 1)
+        self.assertEqual(obj.updated_at, updated_at)
+
+    @patch(MANAGERS_PATH + ".fetch_esi_status")
+    def test_should_increase_backoff_with_repeated_access_errors(
+        self, mock_fetch_esi_status, mock_esi
+    ):
+        # given
+        mock_fetch_esi_status.return_value = EsiStatus(True, 99, 60)
+        mock_esi.client.Universe.get_universe_structures_structure_id.side_effect = (
+            HTTPForbidden(response=BravadoResponseStub(403, "Test exception"))
+        )
+        Location.objects.create(
+            id=1000000000099, access_errors=3, access_retry_at=now()
+        )
+        # when
+        Location.objects.structure_update_or_create_esi(1000000000099, self.token)
+        # then
+        obj = Location.objects.get(id=1000000000099)
+        self.assertEqual(obj.access_errors, 4)
+        self.assertAlmostEqual(
+            obj.access_retry_at,
+            now() + dt.timedelta(minutes=120),
+            delta=dt.timedelta(seconds=30),
+        )
+
+    @patch(MANAGERS_PATH + ".fetch_esi_status")
+    def test_should_reset_backoff_and_remember_access_on_success(
+        self, mock_fetch_esi_status, mock_esi
+    ):
+        # given
+        mock_fetch_esi_status.return_value = EsiStatus(True, 99, 60)
+        mock_esi.client = esi_client_stub
+        Location.objects.create(
+            id=1000000000001,
+            access_errors=3,
+            access_retry_at=now() - dt.timedelta(minutes=1),
+        )
+        # when
+        obj, _ = Location.objects.structure_update_or_create_esi(
+            1000000000001, self.token
+        )
+        # then
+        obj.refresh_from_db()
+        self.assertEqual(obj.name, "Amamake - Test Structure Alpha")
+        self.assertEqual(obj.access_errors, 0)
+        self.assertIsNone(obj.access_retry_at)
+        self.assertTrue(obj.accesses.get(character=self.character).has_access)
+
+    @patch("esi.models.Token.valid_access_token", autospec=True)
+    @patch(MANAGERS_PATH + ".fetch_esi_status")
+    def test_should_prefer_token_of_character_with_access(
+        self, mock_fetch_esi_status, mock_valid_access_token, mock_esi
+    ):
+        # given
+        mock_fetch_esi_status.return_value = EsiStatus(True, 99, 60)
+        mock_valid_access_token.side_effect = lambda token: f"{token.character_id}"
+        endpoint = mock_esi.client.Universe.get_universe_structures_structure_id
+        endpoint.return_value.results.return_value = {
+            "name": "Amamake - Test Structure Alpha",
+            "solar_system_id": 30002537,
+            "type_id": 35832,
+        }
+        character_1002 = create_memberaudit_character(1002)
+        location = Location.objects.create(id=1000000000001)
+        LocationAccess.objects.create(
+            location=location, character=character_1002, has_access=True
+        )
+        LocationAccess.objects.create(
+            location=location, character=self.character, has_access=False
+        )
+        # when
+        Location.objects.structure_update_or_create_esi(1000000000001, self.token)
+        # then
+        self.assertEqual(endpoint.call_args[1]["token"], "1002")
+
+    @patch("esi.models.Token.valid_access_token", autospec=True)
+    @patch(MANAGERS_PATH + ".fetch_esi_status")
+    def test_should_not_notify_characters_with_access_but_without_token(
+        self, mock_fetch_esi_status, mock_valid_access_token, mock_esi
+    ):
+        # given
+        mock_fetch_esi_status.return_value = EsiStatus(True, 99, 60)
+        mock_valid_access_token.side_effect = lambda token: f"{token.character_id}"
+        endpoint = mock_esi.client.Universe.get_universe_structures_structure_id
+        endpoint.return_value.results.return_value = {
+            "name": "Amamake - Test Structure Alpha",
+            "solar_system_id": 30002537,
+            "type_id": 35832,
+        }
+        character_1002 = create_memberaudit_character(1002)
+        character_1002.eve_character.character_ownership.user.token_set.all().delete()
+        location = Location.objects.create(id=1000000000001)
+        LocationAccess.objects.create(
+            location=location, character=character_1002, has_access=True
+        )
+        # when
+        with patch("memberaudit.models.character.notify_throttled") as mock_notify:
+            Location.objects.structure_update_or_create_esi(1000000000001, self.token)
+        # then
+        self.assertEqual(endpoint.call_args[1]["token"], "1001")
+        self.assertFalse(mock_notify.called)
+
+    @patch("esi.models.Token.valid_access_token", autospec=True)
+    @patch(MANAGERS_PATH + ".fetch_esi_status")
+    def test_should_back_off_from_repeated_access_errors_of_different_characters(
+        self, mock_fetch_esi_status, mock_valid_access_token, mock_esi
+    ):
+        # given
+        mock_fetch_esi_status.return_value = EsiStatus(True, 99, 60)
+        mock_valid_access_token.side_effect = lambda token: f"{token.character_id}"
+        endpoint = mock_esi.client.Universe.get_universe_structures_structure_id
+        endpoint.side_effect = HTTPForbidden(
+            response=BravadoResponseStub(403, "Forbidden")
+        )
+        character_1002 = create_memberaudit_character(1002)
+        token_1002 = (
+            character_1002.eve_character.character_ownership.user.token_set.first()
+        )
+        # when
+        Location.objects.structure_update_or_create_esi(1000000000099, self.token)
+        Location.objects.structure_update_or_create_esi(1000000000099, token_1002)
+        Location.objects.filter(id=1000000000099).update(
+            access_retry_at=now() - dt.timedelta(minutes=1)
+        )
+        Location.objects.structure_update_or_create_esi(1000000000099, token_1002)
+        # then
+        self.assertEqual(endpoint.call_count, 2)
+        obj = Location.objects.get(id=1000000000099)
+        self.assertEqual(obj.access_errors, 2)
+        self.assertAlmostEqual(
+            obj.access_retry_at,
+            now() + dt.timedelta(minutes=30),
+            delta=dt.timedelta(seconds=30),
+        )
+        self.assertFalse(obj.accesses.filter(has_access=True).exists())
+        self.assertEqual(obj.accesses.count(), 2)
+
+    @patch("esi.models.Token.valid_access_token", autospec=True)
+    @patch(MANAGERS_PATH + ".fetch_esi_status")
+    def test_should_use_token_of_character_with_access_during_backoff(
+        self, mock_fetch_esi_status, mock_valid_access_token, mock_esi
+    ):
+        # given
+        mock_fetch_esi_status.return_value = EsiStatus(True, 99, 60)
+        mock_valid_access_token.side_effect = lambda token: f"{token.character_id}"
+        endpoint = mock_esi.client.Universe.get_universe_structures_structure_id
+        endpoint.return_value.results.return_value = {
+            "name": "Amamake - Test Structure Alpha",
+            "solar_system_id": 30002537,
+            "type_id": 35832,
+        }
+        character_1002 = create_memberaudit_character(1002)
+        location = Location.objects.create(
+            id=1000000000001,
+            access_errors=3,
+            access_retry_at=now() + dt.timedelta(hours=1),
+        )
+        LocationAccess.objects.create(
+            location=location, character=character_1002, has_access=True
+        )
+        # when
+        obj, _ = Location.objects.structure_update_or_create_esi(
+            1000000000001, self.token
+        )
+        # then
+        self.assertEqual(endpoint.call_args[1]["token"], "1002")
+        obj.refresh_from_db()
+        self.assertEqual(obj.name, "Amamake - Test Structure Alpha")
+        self.assertEqual(obj.access_errors, 0)
+        self.assertIsNone(obj.access_retry_at)
+
+    @patch("esi.models.Token.valid_access_token", autospec=True)
+    @patch(MANAGERS_PATH + ".fetch_esi_status")
+    def test_should_allow_other_characters_to_try_after_access_error(
+        self, mock_fetch_esi_status, mock_valid_access_token, mock_esi
+    ):
+        # given
+        mock_fetch_esi_status.return_value = EsiStatus(True, 99, 60)
+        mock_valid_access_token.side_effect = lambda token: f"{token.character_id}"
+        mock_esi.client.Universe.get_universe_structures_structure_id.side_effect = (
+            HTTPForbidden(response=BravadoResponseStub(403, "Forbidden"))
+        )
+        cache_key = (
+            f"{Location.objects.STRUCTURE_UPDATE_CACHE_KEY_PREFIX}-1000000000001"
+        )
+        cache.set(cache_key, self.token.pk)
+        # when
+        Location.objects.structure_update_or_create_esi(1000000000001, self.token)
+        # then
+        self.assertIsNone(cache.get(cache_key))
+
     # Stations
 
     def test_can_create_station(self, mock_esi):
@@ -849,6 +1089,64 @@ class TestLocationManagerAsync(TestCase):
 
         self.assertTrue(mock_fetch_esi_status.called)  # proofs task was called
 
+    @patch(MANAGERS_PATH + ".MEMBERAUDIT_LOCATION_STALE_HOURS", 24)
+    @patch("memberaudit.tasks.update_structure_esi")
+    def test_should_bulk_create_missing_and_update_stale_locations(
+        self, mock_update_structure_esi, mock_esi
+    ):
+        # given
+        mock_esi.client = esi_client_stub
+        Location.objects.create(id=30000142, name="Jita", eve_type=self.jita_trade_hub)
+        Location.objects.create(id=60003760, name="Old name")
+        Location.objects.filter(id=60003760).update(
+            updated_at=now() - dt.timedelta(hours=25)
+        )
+        # when
+        with self.assertNumQueries(1):
+            Location.objects.bulk_get_or_create_esi_async(
+                ids=[30000142], token=self.token
+            )
+        result = Location.objects.bulk_get_or_create_esi_async(
+            ids=[30000142, 60003760, 1000000000001, None], token=self.token
+        )
+        # then
+        self.assertSetEqual(result, {30000142, 60003760, 1000000000001})
+        station = Location.objects.get(id=60003760)
+        self.assertEqual(station.name, "Jita IV - Moon 4 - Caldari Navy Assembly Plant")
+        self.assertEqual(station.eve_solar_system, self.jita)
+        self.assertEqual(station.eve_type, self.jita_trade_hub)
+        self.assertEqual(station.owner, self.corporation_2002)
+        self.assertGreater(station.updated_at, now() - dt.timedelta(hours=1))
+        self.assertTrue(Location.objects.get(id=1000000000001).is_empty)
+        self.assertEqual(mock_update_structure_esi.apply_async.call_count, 1)
+
+    @patch("memberaudit.tasks.update_structure_esi")
+    def test_should_update_shared_structure_only_once(
+        self, mock_update_structure_esi, mock_esi
+    ):
+        # given
+        character_1002 = create_memberaudit_character(1002)
+        token_1002 = (
+            character_1002.eve_character.character_ownership.user.token_set.first()
+        )
+        # when
+        Location.objects.bulk_get_or_create_esi_async(
+            ids=[1000000000001, 1000000000002], token=self.token
+        )
+        Location.objects.bulk_get_or_create_esi_async(
+            ids=[1000000000001], token=token_1002
+        )
+        Location.objects.get_or_create_esi_async(id=1000000000002, token=token_1002)
+        # then
+        self.assertSetEqual(
+            {
+                call[1]["kwargs"]["id"]
+                for call in mock_update_structure_esi.apply_async.call_args_list
+            },
+            {1000000000001, 1000000000002},
+        )
+        self.assertEqual(mock_update_structure_esi.apply_async.call_count, 2)
+
 
 class TestSkillSetManager(NoSocketsTestCase):
     @classmethod
@@ -942,3 +1240,50 @@ class TestSkillSetManager(NoSocketsTestCase):
         # then
         self.assertTrue(created)
         self.assertIn(skill_set, skill_set_group.skill_sets.all())
+
+    def test_should_compile_requirement_matrix_once(self):
+        # given
+        skill_set = create_skill_set()
+        create_skill_set_skill(
+            skill_set, EveType.objects.get(name="Gunnery"), required_level=3
+        )
+        SkillSet.objects.requirement_matrix()
+        # when
+        with self.assertNumQueries(0):
+            matrix = SkillSet.objects.requirement_matrix()
+        # then
+        self.assertEqual(matrix.skill_set_ids, (skill_set.pk,))
+
+    def test_should_recompile_requirement_matrix_when_skill_changes(self):
+        # given
+        skill_set = create_skill_set()
+        skill = create_skill_set_skill(
+            skill_set, EveType.objects.get(name="Gunnery"), required_level=3
+        )
+        SkillSet.objects.requirement_matrix()
+        # when
+        skill.required_level = 5
+        skill.save()
+        matrix = SkillSet.objects.requirement_matrix()
+        # then
+        result = matrix.check({skill.eve_type_id: 4})
+        self.assertListEqual(result[skill_set.pk].failed_required_skill_ids, [skill.pk])
+
+    def test_should_recompile_requirement_matrix_after_bulk_changes(self):
+        # given
+        skill_set = create_skill_set()
+        SkillSet.objects.requirement_matrix()
+        # when
+        SkillSetSkill.objects.bulk_create(
+            [
+                SkillSetSkill(
+                    skill_set=skill_set,
+                    eve_type=EveType.objects.get(name="Gunnery"),
+                    required_level=3,
+                )
+            ]
+        )
+        SkillSet.objects.clear_requirement_matrix_cache()
+        matrix = SkillSet.objects.requirement_matrix()
+        # then
+        self.assertEqual(len(matrix), 1)
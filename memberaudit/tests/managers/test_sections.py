@@ -1,14 +1,55 @@
+import datetime as dt
+import tracemalloc
+from importlib import import_module
+from unittest.mock import patch
+
+from django.apps import apps
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
 from eveuniverse.models import EveEntity, EveMarketPrice, EveSolarSystem, EveType
 
+from allianceauth.eveonline.models import EveAllianceInfo
+from allianceauth.tests.auth_utils import AuthUtils
 from app_utils.testing import NoSocketsTestCase
 
-from ...models import CharacterAsset, CharacterMailLabel, Location
+from ...models import (
+    CharacterAsset,
+    CharacterAssetValuation,
+    CharacterMailLabel,
+    CharacterSkill,
+    CharacterSkillSetCheck,
+    CharacterSkillSetReportRow,
+    CharacterWalletJournalEntry,
+    CharacterWalletTransaction,
+    Location,
+    SkillSet,
+    SkillSetSkill,
+)
+from ..testdata.factories import (
+    create_skill_set,
+    create_skill_set_group,
+    create_skill_set_skill,
+    create_wallet_journal_entry,
+)
 from ..testdata.load_entities import load_entities
 from ..testdata.load_eveuniverse import load_eveuniverse
 from ..testdata.load_locations import load_locations
 from ..utils import create_memberaudit_character
 
+HELPERS_PATH = "memberaudit.helpers"
+
+
+def create_character_skill(character, eve_type, level: int) -> CharacterSkill:
+    return CharacterSkill.objects.create(
+        character=character,
+        eve_type=eve_type,
+        active_skill_level=level,
+        skillpoints_in_skill=10,
+        trained_skill_level=level,
+    )
+
 
 class TestCharacterAssetManager(NoSocketsTestCase):
     @classmethod
@@ -50,6 +91,575 @@ class TestCharacterAssetManager(NoSocketsTestCase):
         self.assertIsNone(asset.price)
         self.assertIsNone(asset.total)
 
+    def test_should_calculate_totals_by_location(self):
+        # given
+        structure = Location.objects.get(id=1000000000001)
+        EveMarketPrice.objects.create(eve_type=self.merlin, average_price=1000)
+        ship = CharacterAsset.objects.create(
+            character=self.character,
+            item_id=1,
+            location=self.jita_44,
+            eve_type=self.merlin,
+            is_singleton=True,
+            quantity=1,
+        )
+        CharacterAsset.objects.create(
+            character=self.character,
+            item_id=2,
+            location=self.jita_44,
+            eve_type=self.merlin,
+            is_singleton=False,
+            quantity=3,
+        )
+        CharacterAsset.objects.create(
+            character=self.character,
+            item_id=3,
+            location=structure,
+            eve_type=self.merlin,
+            is_blueprint_copy=True,
+            is_singleton=False,
+            quantity=1,
+        )
+        CharacterAsset.objects.create(
+            character=self.character,
+            item_id=4,
+            parent=ship,
+            eve_type=self.merlin,
+            is_singleton=False,
+            quantity=5,
+        )
+        # when
+        result = self.character.assets.location_totals()
+        # then
+        self.assertDictEqual(
+            result,
+            {
+                self.jita_44.id: {"items_count": 2, "total": 4000},
+                structure.id: {"items_count": 1, "total": None},
+            },
+        )
+
+    def test_should_create_asset_tree_from_list(self):
+        # given
+        asset_list = [
+            self._make_asset_item(1100000000003, 1100000000002),
+            self._make_asset_item(1100000000002, 1100000000001),
+            self._make_asset_item(1100000000001, self.jita_44.id),
+        ]
+        # when
+        tree = CharacterAsset.objects.update_for_character(self.character, asset_list)
+        # then
+        self.assertEqual(len(tree), 3)
+        asset_1 = self.character.assets.get(item_id=1100000000001)
+        self.assertEqual(asset_1.location, self.jita_44)
+        self.assertIsNone(asset_1.parent)
+        asset_2 = self.character.assets.get(item_id=1100000000002)
+        self.assertEqual(asset_2.parent, asset_1)
+        self.assertIsNone(asset_2.location)
+        asset_3 = self.character.assets.get(item_id=1100000000003)
+        self.assertEqual(asset_3.parent, asset_2)
+        self.assertEqual(asset_3.name, "Dummy")
+        self.assertEqual(asset_3.quantity, 1)
+
+    def test_should_replace_existing_assets(self):
+        # given
+        CharacterAsset.objects.create(
+            character=self.character,
+            item_id=1100000000666,
+            location=self.jita_44,
+            eve_type=self.merlin,
+            is_singleton=False,
+            quantity=5,
+        )
+        asset_list = [self._make_asset_item(1100000000001, self.jita_44.id)]
+        # when
+        CharacterAsset.objects.update_for_character(self.character, asset_list)
+        # then
+        self.assertSetEqual(
+            set(self.character.assets.values_list("item_id", flat=True)),
+            {1100000000001},
+        )
+
+    def test_should_keep_unchanged_assets(self):
+        # given
+        asset_list = [
+            self._make_asset_item(1100000000002, 1100000000001),
+            self._make_asset_item(1100000000001, self.jita_44.id),
+        ]
+        CharacterAsset.objects.update_for_character(self.character, asset_list)
+        old_pks = dict(self.character.assets.values_list("item_id", "pk"))
+        # when
+        with CaptureQueriesContext(connection) as ctx:
+            CharacterAsset.objects.update_for_character(self.character, asset_list)
+        # then
+        self.assertDictEqual(
+            dict(self.character.assets.values_list("item_id", "pk")), old_pks
+        )
+        self.assertFalse(
+            any(
+                query["sql"].lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE"))
+                for query in ctx.captured_queries
+            )
+        )
+
+    def test_should_update_changed_assets_only(self):
+        # given
+        asset_list = [
+            self._make_asset_item(1100000000002, 1100000000001),
+            self._make_asset_item(1100000000001, self.jita_44.id),
+        ]
+        CharacterAsset.objects.update_for_character(self.character, asset_list)
+        old_pks = dict(self.character.assets.values_list("item_id", "pk"))
+        asset_list[0]["quantity"] = 5
+        asset_list[0]["name"] = "Changed"
+        # when
+        CharacterAsset.objects.update_for_character(self.character, asset_list)
+        # then
+        self.assertDictEqual(
+            dict(self.character.assets.values_list("item_id", "pk")), old_pks
+        )
+        asset_2 = self.character.assets.get(item_id=1100000000002)
+        self.assertEqual(asset_2.quantity, 5)
+        self.assertEqual(asset_2.name, "Changed")
+        self.assertEqual(asset_2.parent.item_id, 1100000000001)
+
+    def test_should_move_assets_into_new_parent_and_delete_vanished_assets(self):
+        # given
+        CharacterAsset.objects.update_for_character(
+            self.character,
+            [
+                self._make_asset_item(1100000000001, self.jita_44.id),
+                self._make_asset_item(1100000000002, 1100000000001),
+            ],
+        )
+        asset_list = [
+            self._make_asset_item(1100000000003, self.jita_44.id),
+            self._make_asset_item(1100000000002, 1100000000003),
+        ]
+        # when
+        CharacterAsset.objects.update_for_character(self.character, asset_list)
+        # then
+        self.assertSetEqual(
+            set(self.character.assets.values_list("item_id", flat=True)),
+            {1100000000002, 1100000000003},
+        )
+        asset_2 = self.character.assets.get(item_id=1100000000002)
+        self.assertEqual(asset_2.parent.item_id, 1100000000003)
+
+    def test_should_move_child_asset_to_location(self):
+        # given
+        CharacterAsset.objects.update_for_character(
+            self.character,
+            [
+                self._make_asset_item(1100000000001, self.jita_44.id),
+                self._make_asset_item(1100000000002, 1100000000001),
+            ],
+        )
+        asset_list = [
+            self._make_asset_item(1100000000001, self.jita_44.id),
+            self._make_asset_item(1100000000002, self.jita_44.id),
+        ]
+        # when
+        CharacterAsset.objects.update_for_character(self.character, asset_list)
+        # then
+        asset_2 = self.character.assets.get(item_id=1100000000002)
+        self.assertIsNone(asset_2.parent)
+        self.assertEqual(asset_2.location, self.jita_44)
+
+    def test_should_skip_and_report_assets_which_can_not_be_placed(self):
+        # given
+        asset_list = [
+            self._make_asset_item(1100000000001, self.jita_44.id),
+            self._make_asset_item(1100000000002, 1100000000099),
+            self._make_asset_item(1100000000003, 1100000000004),
+            self._make_asset_item(1100000000004, 1100000000003),
+        ]
+        # when
+        tree = CharacterAsset.objects.update_for_character(self.character, asset_list)
+        # then
+        self.assertSetEqual(
+            set(self.character.assets.values_list("item_id", flat=True)),
+            {1100000000001},
+        )
+        self.assertSetEqual(tree.orphaned_ids, {1100000000002})
+        self.assertSetEqual(tree.cyclic_ids, {1100000000003, 1100000000004})
+
+    def test_should_resolve_parents_with_constant_number_of_lookups(self):
+        # given
+        small_tree = self._make_synthetic_asset_list(ships=1, containers=1, items=1)
+        large_tree = self._make_synthetic_asset_list(ships=100, containers=9, items=10)
+        self.assertEqual(len(large_tree), 10000)
+        # when
+        small_selects = self._count_select_queries(small_tree)
+        large_selects = self._count_select_queries(large_tree)
+        # then
+        self.assertEqual(large_selects, small_selects)
+        self.assertEqual(self.character.assets.count(), 10000)
+        self.assertEqual(
+            self.character.assets.filter(parent__parent__isnull=False).count(), 9000
+        )
+
+    def test_should_resolve_parents_with_constant_number_of_lookups_fallback(self):
+        # given
+        small_tree = self._make_synthetic_asset_list(ships=1, containers=1, items=1)
+        large_tree = self._make_synthetic_asset_list(ships=100, containers=9, items=10)
+        # when
+        with patch.object(
+            type(connection.features), "can_return_rows_from_bulk_insert", False
+        ):
+            small_selects = self._count_select_queries(small_tree)
+            large_selects = self._count_select_queries(large_tree)
+        # then
+        self.assertEqual(large_selects, small_selects)
+        self.assertEqual(
+            self.character.assets.filter(parent__parent__isnull=False).count(), 9000
+        )
+
+    def _count_select_queries(self, asset_list: list) -> int:
+        self.character.assets.all().delete()
+        with CaptureQueriesContext(connection) as ctx:
+            CharacterAsset.objects.update_for_character(self.character, asset_list)
+        return sum(
+            1
+            for query in ctx.captured_queries
+            if query["sql"].lstrip().upper().startswith("SELECT")
+        )
+
+    def _make_synthetic_asset_list(
+        self, ships: int, containers: int, items: int
+    ) -> list:
+        """Make asset list for a tree of ships with containers with items."""
+        asset_list = []
+        item_id = 1100000000000
+        for _ in range(ships):
+            item_id += 1
+            ship_id = item_id
+            asset_list.append(self._make_asset_item(ship_id, self.jita_44.id))
+            for _ in range(containers):
+                item_id += 1
+                container_id = item_id
+                asset_list.append(self._make_asset_item(container_id, ship_id))
+                for _ in range(items):
+                    item_id += 1
+                    asset_list.append(self._make_asset_item(item_id, container_id))
+
+        return asset_list
+
+    def test_should_roll_up_contents_of_nested_assets(self):
+        # given
+        EveMarketPrice.objects.create(eve_type=self.merlin, average_price=1000)
+        asset_list = [
+            self._make_asset_item(1, self.jita_44.id),
+            self._make_asset_item(2, 1),
+            self._make_asset_item(3, 2),
+            {**self._make_asset_item(4, 2), "is_blueprint_copy": True},
+            self._make_asset_item(5, self.jita_44.id),
+        ]
+        # when
+        CharacterAsset.objects.update_for_character(self.character, asset_list)
+        # then
+        contents = {
+            obj[0]: obj[1:]
+            for obj in self.character.assets.values_list(
+                "item_id", "contents_count", "contents_total", "contents_volume"
+            )
+        }
+        volume = self.merlin.volume
+        self.assertDictEqual(
+            contents,
+            {
+                1: (3, 2000, 3 * volume),
+                2: (2, 1000, 2 * volume),
+                3: (0, 0, 0),
+                4: (0, 0, 0),
+                5: (0, 0, 0),
+            },
+        )
+
+    def test_should_update_contents_when_prices_change(self):
+        # given
+        asset_list = [
+            self._make_asset_item(1, self.jita_44.id),
+            self._make_asset_item(2, 1),
+        ]
+        CharacterAsset.objects.update_for_character(self.character, asset_list)
+        EveMarketPrice.objects.create(eve_type=self.merlin, average_price=1000)
+        # when
+        CharacterAsset.objects.update_contents(self.character)
+        # then
+        ship = self.character.assets.get(item_id=1)
+        self.assertEqual(ship.contents_total, 1000)
+
+    def test_should_not_write_contents_which_only_differ_by_rounding(self):
+        # given
+        EveMarketPrice.objects.create(eve_type=self.merlin, average_price=0.1)
+        asset_list = [
+            self._make_asset_item(1, self.jita_44.id),
+            self._make_asset_item(2, 1),
+            self._make_asset_item(3, 1),
+            self._make_asset_item(4, 1),
+        ]
+        CharacterAsset.objects.update_for_character(self.character, asset_list)
+        self.character.assets.filter(item_id=1).update(contents_total=0.3)
+        # when
+        with CaptureQueriesContext(connection) as ctx:
+            CharacterAsset.objects.update_contents(self.character)
+        # then
+        self.assertFalse(
+            any(
+                query["sql"].lstrip().upper().startswith("UPDATE")
+                for query in ctx.captured_queries
+            )
+        )
+
+    def test_should_store_hierarchy_of_assets(self):
+        # given
+        asset_list = [
+            self._make_asset_item(1, self.jita_44.id),
+            self._make_asset_item(2, 1),
+            self._make_asset_item(3, 2),
+        ]
+        # when
+        CharacterAsset.objects.update_for_character(self.character, asset_list)
+        # then
+        self.assertDictEqual(
+            {
+                obj[0]: obj[1:]
+                for obj in self.character.assets.values_list(
+                    "item_id", "path", "root_location_id"
+                )
+            },
+            {
+                1: ("/", self.jita_44.id),
+                2: ("/1/", self.jita_44.id),
+                3: ("/1/2/", self.jita_44.id),
+            },
+        )
+
+    def test_should_fill_hierarchy_of_existing_assets_on_upgrade(self):
+        # given
+        asset_list = [
+            self._make_asset_item(1, self.jita_44.id),
+            self._make_asset_item(2, 1),
+            self._make_asset_item(3, 2),
+        ]
+        CharacterAsset.objects.update_for_character(self.character, asset_list)
+        self.character.assets.update(path="", root_location=None)
+        migration = import_module(
+            "memberaudit.migrations.0006_character_asset_hierarchy"
+        )
+        # when
+        migration.fill_asset_hierarchy(apps, None)
+        # then
+        self.assertDictEqual(
+            {
+                obj[0]: obj[1:]
+                for obj in self.character.assets.values_list(
+                    "item_id", "path", "root_location_id"
+                )
+            },
+            {
+                1: ("/", self.jita_44.id),
+                2: ("/1/", self.jita_44.id),
+                3: ("/1/2/", self.jita_44.id),
+            },
+        )
+
+    def test_should_answer_hierarchy_queries_with_one_query(self):
+        # given
+        structure = Location.objects.get(id=1000000000001)
+        asset_list = [
+            self._make_asset_item(1, self.jita_44.id),
+            self._make_asset_item(2, 1),
+            self._make_asset_item(3, 2),
+            self._make_asset_item(4, 1),
+            self._make_asset_item(5, structure.id),
+            self._make_asset_item(6, 5),
+            self._make_asset_item(10, self.jita_44.id),
+        ]
+        CharacterAsset.objects.update_for_character(self.character, asset_list)
+        ship = self.character.assets.get(item_id=1)
+        container = self.character.assets.get(item_id=2)
+        item = self.character.assets.get(item_id=3)
+        # when/then
+        with self.assertNumQueries(1):
+            self.assertSetEqual(
+                set(
+                    CharacterAsset.objects.descendants_of(ship).values_list(
+                        "item_id", flat=True
+                    )
+                ),
+                {2, 3, 4},
+            )
+        with self.assertNumQueries(1):
+            self.assertSetEqual(
+                set(
+                    CharacterAsset.objects.ancestors_of(item).values_list(
+                        "item_id", flat=True
+                    )
+                ),
+                {1, 2},
+            )
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                CharacterAsset.objects.root_location_of(container), self.jita_44
+            )
+        with self.assertNumQueries(1):
+            self.assertSetEqual(
+                set(
+                    CharacterAsset.objects.located_in(structure).values_list(
+                        "item_id", flat=True
+                    )
+                ),
+                {5, 6},
+            )
+
+    def _make_asset_item(self, item_id: int, location_id: int) -> dict:
+        return {
+            "is_singleton": True,
+            "item_id": item_id,
+            "location_flag": "Hangar",
+            "location_id": location_id,
+            "name": "Dummy",
+            "quantity": 1,
+            "type_id": self.merlin.id,
+        }
+
+
+class TestCharacterAssetValuationManager(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        load_eveuniverse()
+        load_entities()
+        load_locations()
+        cls.character = create_memberaudit_character(1001)
+        cls.jita_44 = Location.objects.get(id=60003760)
+        cls.structure_1 = Location.objects.get(id=1000000000001)
+        cls.merlin = EveType.objects.get(id=603)
+        cls.implant = EveType.objects.get(id=19540)
+        EveMarketPrice.objects.create(eve_type=cls.merlin, average_price=1000)
+        EveMarketPrice.objects.create(eve_type=cls.implant, average_price=10)
+
+    def setUp(self) -> None:
+        ship = CharacterAsset.objects.create(
+            character=self.character,
+            item_id=1,
+            location=self.jita_44,
+            path="/",
+            root_location=self.jita_44,
+            eve_type=self.merlin,
+            is_singleton=True,
+            quantity=1,
+        )
+        container = CharacterAsset.objects.create(
+            character=self.character,
+            item_id=2,
+            parent=ship,
+            path="/1/",
+            root_location=self.jita_44,
+            eve_type=self.merlin,
+            is_singleton=True,
+            quantity=1,
+        )
+        CharacterAsset.objects.create(
+            character=self.character,
+            item_id=3,
+            parent=container,
+            path="/1/2/",
+            root_location=self.jita_44,
+            eve_type=self.implant,
+            is_singleton=False,
+            quantity=5,
+        )
+        CharacterAsset.objects.create(
+            character=self.character,
+            item_id=4,
+            location=self.structure_1,
+            path="/",
+            root_location=self.structure_1,
+            eve_type=self.merlin,
+            is_blueprint_copy=True,
+            is_singleton=False,
+            quantity=1,
+        )
+
+    def test_should_create_snapshot(self):
+        # when
+        valuation = CharacterAssetValuation.objects.update_for_character(self.character)
+        # then
+        self.assertEqual(valuation.date, now().date())
+        self.assertEqual(valuation.items_count, 4)
+        self.assertEqual(valuation.total, 2050)
+        self.assertDictEqual(valuation.location_totals, {str(self.jita_44.id): 2050})
+        self.assertDictEqual(
+            valuation.category_totals,
+            {
+                str(self.merlin.eve_group.eve_category_id): 2000,
+                str(self.implant.eve_group.eve_category_id): 50,
+            },
+        )
+
+    def test_should_not_report_location_of_assets_without_location(self):
+        # given
+        CharacterAsset.objects.create(
+            character=self.character,
+            item_id=5,
+            path="/",
+            eve_type=self.merlin,
+            is_singleton=True,
+            quantity=1,
+        )
+        # when
+        valuation = CharacterAssetValuation.objects.update_for_character(self.character)
+        # then
+        self.assertEqual(valuation.total, 3050)
+        self.assertDictEqual(valuation.location_totals, {str(self.jita_44.id): 2050})
+
+    def test_should_update_snapshot_of_today(self):
+        # given
+        CharacterAssetValuation.objects.update_for_character(self.character)
+        self.character.assets.get(item_id=3).delete()
+        # when
+        CharacterAssetValuation.objects.update_for_character(self.character)
+        # then
+        valuation = self.character.asset_valuations.get()
+        self.assertEqual(valuation.total, 2000)
+        self.assertEqual(valuation.items_count, 3)
+
+    def test_should_keep_snapshots_of_earlier_days(self):
+        # given
+        CharacterAssetValuation.objects.create(
+            character=self.character,
+            date=now().date() - dt.timedelta(days=1),
+            total=42,
+        )
+        # when
+        CharacterAssetValuation.objects.update_for_character(self.character)
+        # then
+        self.assertListEqual(
+            list(
+                self.character.asset_valuations.order_by("date").values_list(
+                    "total", flat=True
+                )
+            ),
+            [42, 2050],
+        )
+
+    def test_should_not_write_unchanged_snapshot(self):
+        # given
+        CharacterAssetValuation.objects.update_for_character(self.character)
+        # when
+        with CaptureQueriesContext(connection) as ctx:
+            CharacterAssetValuation.objects.update_for_character(self.character)
+        # then
+        self.assertFalse(
+            any(
+                query["sql"].lstrip().upper().startswith(("INSERT", "UPDATE"))
+                for query in ctx.captured_queries
+            )
+        )
+
 
 class TestCharacterUpdateBase(TestCase):
     @classmethod
@@ -87,3 +697,453 @@ class TestCharacterMailLabelManager(TestCharacterUpdateBase):
     def test_empty(self):
         labels = CharacterMailLabel.objects.get_all_labels()
         self.assertDictEqual(labels, dict())
+
+
+class TestCharacterSkillSetCheckManager(TestCharacterUpdateBase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.gunnery = EveType.objects.get(name="Gunnery")
+        cls.drones = EveType.objects.get(name="Drones")
+
+    def _create_skill_sets(self, count: int) -> list:
+        skills = []
+        for _ in range(count):
+            skill_set = create_skill_set()
+            skills.append(
+                create_skill_set_skill(skill_set, self.gunnery, required_level=3)
+            )
+            skills.append(
+                create_skill_set_skill(
+                    skill_set, self.drones, required_level=1, recommended_level=5
+                )
+            )
+        return skills
+
+    def test_should_check_all_characters_in_one_pass(self):
+        # given
+        gunnery_skill, drones_skill = self._create_skill_sets(1)
+        create_character_skill(self.character_1001, self.gunnery, 5)
+        create_character_skill(self.character_1001, self.drones, 5)
+        create_character_skill(self.character_1002, self.drones, 3)
+        # when
+        CharacterSkillSetCheck.objects.update_for_characters(
+            [self.character_1001.pk, self.character_1002.pk]
+        )
+        # then
+        check_1001 = self.character_1001.skill_set_checks.get()
+        self.assertFalse(check_1001.failed_required_skills.exists())
+        self.assertFalse(check_1001.failed_recommended_skills.exists())
+        check_1002 = self.character_1002.skill_set_checks.get()
+        self.assertQuerysetEqual(
+            check_1002.failed_required_skills.all(), [gunnery_skill]
+        )
+        self.assertQuerysetEqual(
+            check_1002.failed_recommended_skills.all(), [drones_skill]
+        )
+
+    def test_should_replace_existing_checks(self):
+        # given
+        self._create_skill_sets(1)
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        create_character_skill(self.character_1001, self.gunnery, 5)
+        create_character_skill(self.character_1001, self.drones, 5)
+        # when
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        # then
+        check = self.character_1001.skill_set_checks.get()
+        self.assertFalse(check.failed_required_skills.exists())
+
+    def test_should_not_write_anything_when_outcome_has_not_changed(self):
+        # given
+        self._create_skill_sets(2)
+        create_character_skill(self.character_1001, self.drones, 3)
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        check_pks = set(
+            self.character_1001.skill_set_checks.values_list("pk", flat=True)
+        )
+        # when
+        with CaptureQueriesContext(connection) as queries:
+            CharacterSkillSetCheck.objects.update_for_characters(
+                [self.character_1001.pk]
+            )
+        # then
+        writes = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+        self.assertListEqual(writes, [])
+        self.assertSetEqual(
+            set(self.character_1001.skill_set_checks.values_list("pk", flat=True)),
+            check_pks,
+        )
+
+    def test_should_only_change_links_of_changed_outcomes(self):
+        # given
+        gunnery_skill, drones_skill = self._create_skill_sets(1)
+        create_character_skill(self.character_1001, self.drones, 1)
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        check = self.character_1001.skill_set_checks.get()
+        through = CharacterSkillSetCheck.failed_recommended_skills.through
+        link_pk = through.objects.get(characterskillsetcheck=check).pk
+        create_character_skill(self.character_1001, self.gunnery, 5)
+        # when
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        # then
+        check_after = self.character_1001.skill_set_checks.get()
+        self.assertEqual(check_after.pk, check.pk)
+        self.assertFalse(check_after.failed_required_skills.exists())
+        self.assertEqual(through.objects.get(characterskillsetcheck=check).pk, link_pk)
+
+    def test_should_remove_checks_when_no_skill_sets_are_defined(self):
+        # given
+        skill_set_skill, _ = self._create_skill_sets(1)
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        skill_set_skill.skill_set.delete()
+        # when
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        # then
+        self.assertFalse(self.character_1001.skill_set_checks.exists())
+
+    def test_should_update_checks_of_given_skill_sets_only(self):
+        # given
+        skill_1, _, skill_2, _ = self._create_skill_sets(2)
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        other_check = self.character_1001.skill_set_checks.get(
+            skill_set=skill_2.skill_set
+        )
+        create_character_skill(self.character_1001, self.gunnery, 5)
+        create_character_skill(self.character_1001, self.drones, 5)
+        # when
+        CharacterSkillSetCheck.objects.update_for_skill_sets([skill_1.skill_set_id])
+        # then
+        check = self.character_1001.skill_set_checks.get(skill_set=skill_1.skill_set)
+        self.assertFalse(check.failed_required_skills.exists())
+        self.assertTrue(other_check.failed_required_skills.exists())
+        self.assertTrue(
+            self.character_1002.skill_set_checks.filter(
+                skill_set=skill_1.skill_set
+            ).exists()
+        )
+        self.assertFalse(
+            self.character_1002.skill_set_checks.filter(
+                skill_set=skill_2.skill_set
+            ).exists()
+        )
+
+    def test_should_not_use_cached_requirements_for_given_skill_sets(self):
+        # given
+        gunnery_skill, _ = self._create_skill_sets(1)
+        create_character_skill(self.character_1001, self.gunnery, 3)
+        create_character_skill(self.character_1001, self.drones, 5)
+        SkillSet.objects.requirement_matrix()
+        SkillSetSkill.objects.filter(pk=gunnery_skill.pk).update(required_level=5)
+        # when
+        CharacterSkillSetCheck.objects.update_for_skill_sets(
+            [gunnery_skill.skill_set_id]
+        )
+        # then
+        check = self.character_1001.skill_set_checks.get()
+        self.assertTrue(
+            check.failed_required_skills.filter(pk=gunnery_skill.pk).exists()
+        )
+
+    def test_should_need_same_queries_regardless_of_skill_set_count(self):
+        # given
+        self._create_skill_sets(2)
+        character_pks = [self.character_1001.pk, self.character_1002.pk]
+        CharacterSkillSetCheck.objects.update_for_characters(character_pks)
+        with CaptureQueriesContext(connection) as few_skill_sets:
+            CharacterSkillSetCheck.objects.update_for_characters(character_pks)
+        self._create_skill_sets(20)
+        CharacterSkillSetCheck.objects.update_for_characters(character_pks)
+        # when
+        with CaptureQueriesContext(connection) as many_skill_sets:
+            CharacterSkillSetCheck.objects.update_for_characters(character_pks)
+        # then
+        self.assertEqual(len(many_skill_sets), len(few_skill_sets))
+        self.assertEqual(
+            CharacterSkillSetCheck.objects.filter(
+                character_id__in=character_pks
+            ).count(),
+            44,
+        )
+
+
+class TestCharacterSkillSetReportRowManager(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        load_eveuniverse()
+        load_entities()
+        member_state = AuthUtils.get_member_state()
+        member_state.member_alliances.add(EveAllianceInfo.objects.get(alliance_id=3001))
+        cls.character_1001 = create_memberaudit_character(1001)
+        cls.character_1103 = create_memberaudit_character(1103)  # guest
+        cls.gunnery = EveType.objects.get(name="Gunnery")
+
+    def setUp(self) -> None:
+        self.ship_1 = create_skill_set(name="Ship 1")
+        create_skill_set_skill(self.ship_1, self.gunnery, required_level=3)
+        self.ship_2 = create_skill_set(name="Ship 2")
+        self.group = create_skill_set_group(name="Alpha", is_doctrine=True)
+        self.group.skill_sets.add(self.ship_1, self.ship_2)
+        create_skill_set(name="Ship 3")
+
+    def test_should_create_one_row_per_group_and_character(self):
+        # when
+        CharacterSkillSetCheck.objects.update_for_characters(
+            [self.character_1001.pk, self.character_1103.pk]
+        )
+        # then
+        rows = {obj.group_id: obj for obj in CharacterSkillSetReportRow.objects.all()}
+        self.assertSetEqual(set(rows.keys()), {self.group.pk, None})
+        row = rows[self.group.pk]
+        self.assertEqual(row.character, self.character_1001)
+        self.assertEqual(row.group_name, "Alpha")
+        self.assertTrue(row.is_doctrine)
+        self.assertEqual(row.character_name, "Bruce Wayne")
+        self.assertEqual(row.main_name, "Bruce Wayne")
+        self.assertTrue(row.is_main)
+        self.assertEqual(row.state_name, "Member")
+        self.assertEqual(row.alliance_name, "Wayne Enterprises")
+        self.assertTrue(row.has_required)
+        self.assertListEqual(row.skill_sets, [["Ship 2", None]])
+        self.assertListEqual(rows[None].skill_sets, [["Ship 3", None]])
+        self.assertFalse(self.character_1103.skill_set_report_rows.exists())
+
+    def test_should_update_rows_when_checks_change(self):
+        # given
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        row = CharacterSkillSetReportRow.objects.get(group=self.group)
+        create_character_skill(self.character_1001, self.gunnery, 5)
+        # when
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        # then
+        row_after = CharacterSkillSetReportRow.objects.get(group=self.group)
+        self.assertEqual(row_after.pk, row.pk)
+        self.assertListEqual(row_after.skill_sets, [["Ship 1", None], ["Ship 2", None]])
+
+    def test_should_remove_rows_of_groups_without_checks(self):
+        # given
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        self.group.skill_sets.clear()
+        # when
+        CharacterSkillSetReportRow.objects.update_for_characters(
+            [self.character_1001.pk]
+        )
+        # then
+        self.assertFalse(
+            CharacterSkillSetReportRow.objects.filter(group=self.group).exists()
+        )
+        self.assertListEqual(
+            CharacterSkillSetReportRow.objects.get(group=None).skill_sets,
+            [["Ship 2", None], ["Ship 3", None]],
+        )
+
+    def test_should_update_rows_when_user_changes(self):
+        # given
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        eve_character = self.character_1001.eve_character
+        eve_character.corporation_name = "Wayne Technologies"
+        eve_character.save()
+        # when
+        CharacterSkillSetReportRow.objects.update_for_characters(
+            [self.character_1001.pk]
+        )
+        # then
+        row = CharacterSkillSetReportRow.objects.get(group=self.group)
+        self.assertEqual(row.corporation_name, "Wayne Technologies")
+
+    def test_should_remove_rows_of_characters_demoted_to_guest(self):
+        # given
+        CharacterSkillSetCheck.objects.update_for_characters([self.character_1001.pk])
+        user = self.character_1001.user
+        user.profile.state = AuthUtils.get_guest_state()
+        user.profile.save()
+        # when
+        CharacterSkillSetReportRow.objects.update_for_characters(
+            [self.character_1001.pk]
+        )
+        # then
+        self.assertFalse(self.character_1001.skill_set_report_rows.exists())
+
+
+class TestCharacterWalletJournalEntryManager(TestCharacterUpdateBase):
+    def test_should_add_new_entries_only(self):
+        # given
+        create_wallet_journal_entry(character=self.character_1001, entry_id=1)
+        journal = [self._make_journal_row(1), self._make_journal_row(2)]
+        # when
+        CharacterWalletJournalEntry.objects.update_for_character(
+            self.character_1001, None, journal
+        )
+        # then
+        self.assertSetEqual(
+            set(self.character_1001.wallet_journal.values_list("entry_id", flat=True)),
+            {1, 2},
+        )
+
+    def test_should_not_skip_entries_which_exist_for_other_characters(self):
+        # given
+        create_wallet_journal_entry(character=self.character_1002, entry_id=1)
+        journal = [self._make_journal_row(1)]
+        # when
+        CharacterWalletJournalEntry.objects.update_for_character(
+            self.character_1001, None, journal
+        )
+        # then
+        self.assertTrue(self.character_1001.wallet_journal.filter(entry_id=1).exists())
+
+    def test_should_write_each_page_before_fetching_the_next(self):
+        # given
+        def pages():
+            yield [self._make_journal_row(1), self._make_journal_row(2)]
+            self.assertEqual(self.character_1001.wallet_journal.count(), 2)
+            yield [self._make_journal_row(2), self._make_journal_row(3)]
+
+        # when
+        CharacterWalletJournalEntry.objects.update_pages_for_character(
+            self.character_1001, None, pages()
+        )
+        # then
+        self.assertSetEqual(
+            set(self.character_1001.wallet_journal.values_list("entry_id", flat=True)),
+            {1, 2, 3},
+        )
+
+    def test_memory_use_should_stay_flat_as_table_grows(self):
+        # given
+        journal = [self._make_journal_row(entry_id) for entry_id in range(1, 101)]
+        # when
+        peak_small = self._measure_peak_memory(journal, other_entries=1000)
+        peak_large = self._measure_peak_memory(journal, other_entries=20000)
+        # then
+        self.assertLess(peak_large, peak_small * 1.5)
+
+    def _measure_peak_memory(self, journal: list, other_entries: int) -> int:
+        """Measure peak memory of a journal update
+        with the given number of entries from another character in the table.
+        """
+        CharacterWalletJournalEntry.objects.all().delete()
+        CharacterWalletJournalEntry.objects.bulk_create(
+            [
+                CharacterWalletJournalEntry(
+                    character=self.character_1002,
+                    entry_id=entry_id,
+                    amount=1.0,
+                    balance=1.0,
+                    context_id_type=CharacterWalletJournalEntry.CONTEXT_ID_TYPE_UNDEFINED,
+                    date=now(),
+                    description="dummy",
+                    ref_type="player_donation",
+                )
+                for entry_id in range(1000000, 1000000 + other_entries)
+            ],
+            batch_size=500,
+        )
+        tracemalloc.start()
+        CharacterWalletJournalEntry.objects.update_for_character(
+            self.character_1001, None, journal
+        )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    @staticmethod
+    def _make_journal_row(entry_id: int) -> dict:
+        return {
+            "id": entry_id,
+            "amount": 1000000.0,
+            "balance": 20000000.0,
+            "context_id_type": "undefined",
+            "date": now(),
+            "description": "test description",
+            "ref_type": "player_donation",
+        }
+
+
+class TestCharacterWalletTransactionManager(TestCharacterUpdateBase):
+    def test_should_add_transactions_with_resolved_relations(self):
+        # given
+        journal_entry = create_wallet_journal_entry(
+            character=self.character_1001, entry_id=67890
+        )
+        transactions = [
+            self._make_transaction_row(1, journal_ref_id=67890),
+            self._make_transaction_row(2, client_id=1099),
+        ]
+        # when
+        with patch.object(EveEntity.objects, "bulk_update_new_esi"):
+            CharacterWalletTransaction.objects.update_for_character(
+                self.character_1001, None, transactions, self.token
+            )
+        # then
+        obj_1 = self.character_1001.wallet_transactions.get(transaction_id=1)
+        self.assertEqual(obj_1.journal_ref, journal_entry)
+        self.assertEqual(obj_1.location, self.jita_44)
+        self.assertEqual(obj_1.client_id, 1001)
+        obj_2 = self.character_1001.wallet_transactions.get(transaction_id=2)
+        self.assertIsNone(obj_2.journal_ref)
+        self.assertTrue(EveEntity.objects.filter(id=1099).exists())
+
+    def test_should_not_skip_transactions_which_exist_for_other_characters(self):
+        # given
+        CharacterWalletTransaction.objects.update_for_character(
+            self.character_1002, None, [self._make_transaction_row(1)], self.token
+        )
+        # when
+        CharacterWalletTransaction.objects.update_for_character(
+            self.character_1001, None, [self._make_transaction_row(1)], self.token
+        )
+        # then
+        self.assertTrue(
+            self.character_1001.wallet_transactions.filter(transaction_id=1).exists()
+        )
+
+    def test_should_resolve_relations_with_constant_number_of_lookups(self):
+        # given
+        create_wallet_journal_entry(character=self.character_1001, entry_id=1)
+        small_list = [self._make_transaction_row(1, journal_ref_id=1)]
+        large_list = small_list + [
+            self._make_transaction_row(transaction_id)
+            for transaction_id in range(2, 2501)
+        ]
+        # when
+        with patch(HELPERS_PATH + ".connections") as mock_connections:
+            # no limit for query params like on MySQL
+            mock_connections.__getitem__.return_value.features.max_query_params = None
+            small_selects = self._count_select_queries(small_list)
+            large_selects = self._count_select_queries(large_list)
+        # then
+        self.assertEqual(large_selects, small_selects)
+        self.assertEqual(self.character_1001.wallet_transactions.count(), 2500)
+
+    def _count_select_queries(self, transactions: list) -> int:
+        self.character_1001.wallet_transactions.all().delete()
+        with CaptureQueriesContext(connection) as ctx:
+            CharacterWalletTransaction.objects.update_for_character(
+                self.character_1001, None, transactions, self.token
+            )
+        return sum(
+            1
+            for query in ctx.captured_queries
+            if query["sql"].lstrip().upper().startswith("SELECT")
+        )
+
+    def _make_transaction_row(self, transaction_id: int, **kwargs) -> dict:
+        row = {
+            "client_id": 1001,
+            "date": now(),
+            "is_buy": True,
+            "is_personal": True,
+            "journal_ref_id": None,
+            "location_id": self.jita_44.id,
+            "quantity": 1,
+            "transaction_id": transaction_id,
+            "type_id": 603,
+            "unit_price": 1000.0,
+        }
+        row.update(kwargs)
+        return row
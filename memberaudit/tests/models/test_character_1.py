@@ -3,6 +3,7 @@ import hashlib
 import json
 from unittest.mock import Mock, patch
 
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils.timezone import now
 from esi.errors import TokenError
@@ -343,6 +344,9 @@ class TestCharacterFetchToken(TestCase):
         super().setUpClass()
         load_entities()
 
+    def setUp(self) -> None:
+        cache.clear()
+
     def test_should_return_token_with_default_scopes(self):
         # given
         character = create_memberaudit_character(1001)
@@ -383,6 +387,41 @@ class TestCharacterFetchToken(TestCase):
             kwargs["user"], character.eve_character.character_ownership.user
         )
 
+    def test_should_return_cached_token_for_same_scopes(self):
+        # given
+        character = create_memberaudit_character(1001)
+        token_1 = character.fetch_token("esi-assets.read_assets.v1")
+        # when
+        with patch.object(
+            Token.objects, "prefetch_related", wraps=Token.objects.prefetch_related
+        ) as m:
+            token_2 = character.fetch_token("esi-assets.read_assets.v1")
+        # then
+        self.assertEqual(token_1, token_2)
+        self.assertFalse(m.called)
+
+    def test_should_search_token_again_after_invalidation(self):
+        # given
+        character = create_memberaudit_character(1001)
+        character.fetch_token("esi-assets.read_assets.v1")
+        character.invalidate_token_cache()
+        # when
+        with patch.object(
+            Token.objects, "prefetch_related", wraps=Token.objects.prefetch_related
+        ) as m:
+            character.fetch_token("esi-assets.read_assets.v1")
+        # then
+        self.assertTrue(m.called)
+
+    def test_should_not_return_deleted_cached_token(self):
+        # given
+        character = create_memberaudit_character(1001)
+        token = character.fetch_token()
+        token.delete()
+        # when/then
+        with self.assertRaises(TokenError):
+            character.fetch_token()
+
 
 class TestCharacterSkillQueue(NoSocketsTestCase):
     @classmethod
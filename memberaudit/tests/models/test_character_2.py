@@ -1,6 +1,7 @@
 import datetime as dt
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
+from bravado.exception import HTTPNotModified
 from pytz import utc
 
 from django.test import override_settings
@@ -8,15 +9,18 @@ from django.utils.dateparse import parse_datetime
 from django.utils.timezone import now
 from eveuniverse.models import EveEntity, EveType
 
+from app_utils.esi_testing import BravadoOperationStub, BravadoResponseStub
 from app_utils.testing import NoSocketsTestCase
 
 from ...core.xml_converter import eve_xml_to_html
 from ...models import (
+    Character,
     CharacterContact,
     CharacterContactLabel,
     CharacterContract,
     CharacterContractBid,
     CharacterDetails,
+    CharacterUpdateStatus,
 )
 from ..testdata.esi_client_stub import esi_client_stub
 from ..utils import create_memberaudit_character
@@ -733,6 +737,102 @@ class TestCharacterUpdateCorporationHistory(
         obj = self.character_1001.corporation_history.get(record_id=500)
         self.assertEqual(obj.corporation, self.corporation_2001)
 
+    @staticmethod
+    def _history_operation(headers):
+        data = esi_client_stub.Character.get_characters_character_id_corporationhistory(
+            character_id=1001
+        ).results()
+        return BravadoOperationStub(data, headers=headers)
+
+    def test_should_store_esi_cache_headers(self, mock_esi):
+        # given
+        endpoint = (
+            mock_esi.client.Character.get_characters_character_id_corporationhistory
+        )
+        endpoint.return_value = self._history_operation(
+            {"ETag": '"abc"', "Expires": "Thu, 01 Jan 2037 12:00:00 GMT"}
+        )
+        # when
+        self.character_1001.update_corporation_history()
+        # then
+        status = self.character_1001.update_status_set.get(
+            section=Character.UpdateSection.CORPORATION_HISTORY
+        )
+        self.assertEqual(status.esi_etag_1, '"abc"')
+        self.assertEqual(status.esi_expires_1, dt.datetime(2037, 1, 1, 12, tzinfo=utc))
+        self.assertEqual(self.character_1001.corporation_history.count(), 2)
+
+    def test_should_skip_request_while_esi_cache_has_not_expired(self, mock_esi):
+        # given
+        CharacterUpdateStatus.objects.create(
+            character=self.character_1001,
+            section=Character.UpdateSection.CORPORATION_HISTORY,
+            esi_etag_1='"abc"',
+            esi_expires_1=now() + dt.timedelta(minutes=5),
+        )
+        # when
+        self.character_1001.update_corporation_history()
+        # then
+        self.assertFalse(
+            mock_esi.client.Character.get_characters_character_id_corporationhistory.called
+        )
+        self.assertEqual(self.character_1001.corporation_history.count(), 0)
+
+    def test_should_treat_not_modified_as_unchanged(self, mock_esi):
+        # given
+        operation = BravadoOperationStub([])
+        operation.results = Mock(
+            side_effect=HTTPNotModified(
+                response=BravadoResponseStub(
+                    304, headers={"Expires": "Thu, 01 Jan 2037 12:00:00 GMT"}
+                )
+            )
+        )
+        endpoint = (
+            mock_esi.client.Character.get_characters_character_id_corporationhistory
+        )
+        endpoint.return_value = operation
+        CharacterUpdateStatus.objects.create(
+            character=self.character_1001,
+            section=Character.UpdateSection.CORPORATION_HISTORY,
+            esi_etag_1='"abc"',
+            esi_expires_1=now() - dt.timedelta(minutes=5),
+        )
+        # when
+        self.character_1001.update_corporation_history()
+        # then
+        _, kwargs = endpoint.call_args
+        self.assertEqual(
+            kwargs["_request_options"], {"headers": {"If-None-Match": '"abc"'}}
+        )
+        self.assertEqual(self.character_1001.corporation_history.count(), 0)
+        status = self.character_1001.update_status_set.get(
+            section=Character.UpdateSection.CORPORATION_HISTORY
+        )
+        self.assertEqual(status.esi_etag_1, '"abc"')
+        self.assertEqual(status.esi_expires_1, dt.datetime(2037, 1, 1, 12, tzinfo=utc))
+
+    def test_should_ignore_esi_cache_when_update_is_forced(self, mock_esi):
+        # given
+        endpoint = (
+            mock_esi.client.Character.get_characters_character_id_corporationhistory
+        )
+        endpoint.return_value = self._history_operation(
+            {"ETag": '"abc"', "Expires": "Thu, 01 Jan 2037 12:00:00 GMT"}
+        )
+        CharacterUpdateStatus.objects.create(
+            character=self.character_1001,
+            section=Character.UpdateSection.CORPORATION_HISTORY,
+            esi_etag_1='"abc"',
+            esi_expires_1=now() + dt.timedelta(minutes=5),
+        )
+        # when
+        self.character_1001.update_corporation_history(force_update=True)
+        # then
+        _, kwargs = endpoint.call_args
+        self.assertNotIn("_request_options", kwargs)
+        self.assertEqual(self.character_1001.corporation_history.count(), 2)
+
 
 @patch(MODELS_PATH + ".character.esi")
 class TestCharacterUpdateImplants(CharacterUpdateTestDataMixin, NoSocketsTestCase):
@@ -238,22 +238,15 @@ class TestSkillSetAdmin(TestCase):
         load_entities()
         cls.user, _ = create_user_from_evecharacter_with_access(1001)
 
-    @patch(ADMIN_PATH + ".tasks.update_characters_skill_checks")
-    def test_save_model(self, mock_update_characters_skill_checks):
+    @patch("memberaudit.signals.tasks.update_skill_set_checks")
+    def test_save_model(self, mock_update_skill_set_checks):
         ship = SkillSet.objects.create(name="Dummy")
         request = MockRequest(self.user)
         form = self.modeladmin.get_form(request)
-        self.modeladmin.save_model(request, ship, form, True)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.modeladmin.save_model(request, ship, form, True)
 
-        self.assertTrue(mock_update_characters_skill_checks.delay.called)
-
-    @patch(ADMIN_PATH + ".tasks.update_characters_skill_checks")
-    def test_delete_model(self, mock_update_characters_skill_checks):
-        ship = SkillSet.objects.create(name="Dummy")
-        request = MockRequest(self.user)
-        self.modeladmin.delete_model(request, ship)
-
-        self.assertTrue(mock_update_characters_skill_checks.delay.called)
+        mock_update_skill_set_checks.delay.assert_called_with(skill_set_pk=ship.pk)
 
     # def test_ship_type_filter(self):
     #     class SkillSetAdminTest(SkillSetAdmin):
@@ -1,6 +1,7 @@
+from django.core.cache import cache
 from django.http import HttpResponse
 from django.test import RequestFactory, TestCase
-from esi.errors import TokenError
+from esi.errors import TokenError, TokenExpiredError
 from esi.models import Token
 
 from allianceauth.tests.auth_utils import AuthUtils
@@ -91,6 +92,7 @@ class TestFetchToken(TestCase):
         load_entities()
 
     def setUp(self) -> None:
+        cache.clear()
         self.character = create_memberaudit_character(1001)
 
     def test_defaults(self):
@@ -116,3 +118,13 @@ class TestFetchToken(TestCase):
 
         with self.assertRaises(TokenError):
             dummy(self.character)
+
+    def test_should_invalidate_token_cache_when_token_fails(self):
+        @fetch_token_for_character()
+        def dummy(character, token):
+            raise TokenExpiredError()
+
+        self.character.fetch_token()
+        with self.assertRaises(TokenExpiredError):
+            dummy(self.character)
+        self.assertIsNone(cache.get(self.character._token_cache_key()))
@@ -1,15 +1,26 @@
+from unittest.mock import Mock
+
 from django.contrib.auth.models import Group
 from django.db import models
 from django.test import TestCase
+from eveuniverse.models import EveEntity
 
 from allianceauth.eveonline.models import EveCorporationInfo
+from app_utils.esi_testing import BravadoOperationStub
 from app_utils.testing import (
     create_authgroup,
     create_state,
     create_user_from_evecharacter,
 )
 
-from ..helpers import clear_users_from_group, filter_groups_available_to_user
+from ..helpers import (
+    bulk_get_or_create_map,
+    clear_users_from_group,
+    filter_existing_values,
+    filter_groups_available_to_user,
+    filter_new_values,
+    iter_esi_pages,
+)
 from .testdata.load_entities import load_entities
 
 
@@ -76,3 +87,123 @@ class TestHelpers(TestCase):
         self.assertSetEqual(
             {group_2.pk}, set(user_1002.groups.values_list("pk", flat=True))
         )
+
+
+class TestFilterExistingValues(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        load_entities()
+
+    def test_should_return_existing_values_only(self):
+        # when
+        result = filter_existing_values(EveEntity.objects, "id", [1001, 1002, 9999])
+        # then
+        self.assertSetEqual(result, {1001, 1002})
+
+    def test_should_respect_queryset_filter(self):
+        # when
+        result = filter_existing_values(
+            EveEntity.objects.filter(id=1001), "id", [1001, 1002]
+        )
+        # then
+        self.assertSetEqual(result, {1001})
+
+    def test_should_handle_empty_values(self):
+        # when
+        result = filter_existing_values(EveEntity.objects, "id", [])
+        # then
+        self.assertSetEqual(result, set())
+
+
+class TestFilterNewValues(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        load_entities()
+
+    def test_should_return_new_values_only(self):
+        # when
+        result = filter_new_values(EveEntity.objects, "id", [1001, 1002, 9999])
+        # then
+        self.assertSetEqual(result, {9999})
+
+    def test_should_respect_queryset_filter(self):
+        # when
+        result = filter_new_values(
+            EveEntity.objects.filter(id=1001), "id", [1001, 1002]
+        )
+        # then
+        self.assertSetEqual(result, {1002})
+
+
+class TestBulkGetOrCreateMap(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        load_entities()
+
+    def test_should_return_existing_and_new_objects(self):
+        # given
+        rows = [
+            {"first_party_id": 1001, "second_party_id": 9991},
+            {"first_party_id": 1002, "second_party_id": None},
+        ]
+        # when
+        result = bulk_get_or_create_map(
+            ["first_party_id", "second_party_id"], rows, EveEntity
+        )
+        # then
+        self.assertSetEqual(set(result.keys()), {1001, 1002, 9991})
+        self.assertEqual(result[1001], EveEntity.objects.get(id=1001))
+        self.assertTrue(EveEntity.objects.filter(id=9991).exists())
+
+    def test_should_need_fixed_number_of_queries(self):
+        # given
+        rows = [{"client_id": id} for id in range(9000, 9100)] + [{"client_id": 1001}]
+        # when
+        with self.assertNumQueries(2):
+            result = bulk_get_or_create_map(["client_id"], rows, EveEntity)
+        # then
+        self.assertEqual(len(result), 101)
+
+    def test_should_return_empty_map_when_no_ids(self):
+        # when
+        with self.assertNumQueries(0):
+            result = bulk_get_or_create_map(
+                ["client_id"], [{"client_id": None}], EveEntity
+            )
+        # then
+        self.assertDictEqual(result, dict())
+
+
+class TestIterEsiPages(TestCase):
+    @staticmethod
+    def _esi_method(pages: list):
+        def esi_method(page, **kwargs):
+            return BravadoOperationStub(
+                pages[page - 1], headers={"X-Pages": str(len(pages))}
+            )
+
+        return Mock(side_effect=esi_method)
+
+    def test_should_yield_each_page_as_it_arrives(self):
+        # given
+        esi_method = self._esi_method([[1, 2], [3, 4], [5]])
+        # when
+        pages = iter_esi_pages(esi_method, character_id=1001)
+        # then
+        self.assertListEqual(next(pages), [1, 2])
+        self.assertEqual(esi_method.call_count, 1)
+        self.assertListEqual(list(pages), [[3, 4], [5]])
+        self.assertEqual(esi_method.call_count, 3)
+        _, kwargs = esi_method.call_args
+        self.assertDictEqual(kwargs, {"page": 3, "character_id": 1001})
+
+    def test_should_yield_one_page_when_endpoint_has_only_one(self):
+        # given
+        esi_method = self._esi_method([[1, 2]])
+        # when
+        result = list(iter_esi_pages(esi_method))
+        # then
+        self.assertListEqual(result, [[1, 2]])
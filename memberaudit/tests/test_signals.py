@@ -1,7 +1,29 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management.sql import emit_post_migrate_signal
+from django.utils.timezone import now
+from eveuniverse.models import EveType
+
+from allianceauth.eveonline.models import EveCharacter
+from allianceauth.tests.auth_utils import AuthUtils
 from app_utils.testing import NoSocketsTestCase, create_authgroup
 
-from .testdata.factories import create_compliance_group_designation
+from ..models import (
+    CharacterAsset,
+    CharacterAssetValuation,
+    CharacterSkillSetCheck,
+    SkillSet,
+)
+from .testdata.factories import (
+    create_compliance_group_designation,
+    create_skill_set,
+    create_skill_set_group,
+    create_skill_set_skill,
+)
 from .testdata.load_entities import load_entities
+from .testdata.load_eveuniverse import load_eveuniverse
+from .utils import add_memberaudit_character_to_user, create_memberaudit_character
 
 
 class TestSignals(NoSocketsTestCase):
@@ -37,3 +59,223 @@ class TestSignals(NoSocketsTestCase):
         # then
         group.refresh_from_db()
         self.assertFalse(group.authgroup.internal)
+
+
+@patch("memberaudit.signals.tasks", spec=True)
+class TestSkillSetSignals(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        load_eveuniverse()
+        cls.gunnery = EveType.objects.get(name="Gunnery")
+
+    def test_should_update_checks_when_skill_set_is_saved(self, mock_tasks):
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            skill_set = create_skill_set()
+        # then
+        mock_tasks.update_skill_set_checks.delay.assert_called_once_with(
+            skill_set_pk=skill_set.pk
+        )
+
+    def test_should_update_checks_when_skill_is_changed(self, mock_tasks):
+        # given
+        skill_set = create_skill_set()
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            skill = create_skill_set_skill(skill_set, self.gunnery, required_level=3)
+            skill.delete()
+        # then
+        self.assertEqual(mock_tasks.update_skill_set_checks.delay.call_count, 2)
+        mock_tasks.update_skill_set_checks.delay.assert_called_with(
+            skill_set_pk=skill_set.pk
+        )
+
+    def test_should_not_update_checks_before_commit(self, mock_tasks):
+        # when
+        with self.captureOnCommitCallbacks() as callbacks:
+            create_skill_set()
+        # then
+        self.assertEqual(len(callbacks), 2)
+        self.assertFalse(mock_tasks.update_skill_set_checks.delay.called)
+
+    def test_should_clear_requirement_matrix_again_after_commit(self, mock_tasks):
+        # given
+        skill_set = create_skill_set()
+        skill = create_skill_set_skill(skill_set, self.gunnery, required_level=3)
+        old_matrix = SkillSet.objects.requirement_matrix(use_cache=False)
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.required_level = 5
+            skill.save()
+            # another process caches the old requirements before the commit
+            cache.set(SkillSet.objects._requirement_matrix_cache_key(), old_matrix)
+        # then
+        matrix = SkillSet.objects.requirement_matrix()
+        result = matrix.check({self.gunnery.id: 4})
+        self.assertListEqual(result[skill_set.pk].failed_required_skill_ids, [skill.pk])
+
+    def test_should_update_report_when_group_members_change(self, mock_tasks):
+        # given
+        skill_set = create_skill_set()
+        group = create_skill_set_group()
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            group.skill_sets.add(skill_set)
+        # then
+        self.assertEqual(mock_tasks.update_skill_sets_report.delay.call_count, 1)
+
+    def test_should_update_report_when_skill_set_is_deleted(self, mock_tasks):
+        # given
+        skill_set = create_skill_set()
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            skill_set.delete()
+        # then
+        self.assertTrue(mock_tasks.update_skill_sets_report.delay.called)
+
+
+@patch("memberaudit.signals.tasks", spec=True)
+class TestSkillSetReportSignals(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        load_entities()
+
+    def setUp(self) -> None:
+        self.character_1001 = create_memberaudit_character(1001)
+        self.character_1101 = add_memberaudit_character_to_user(
+            self.character_1001.user, 1101
+        )
+
+    def test_should_update_report_for_characters_of_user_when_state_changes(
+        self, mock_tasks
+    ):
+        # given
+        profile = self.character_1001.user.profile
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.state = AuthUtils.get_guest_state()
+            profile.save()
+        # then
+        mock_tasks.update_skill_sets_report_for_characters.delay.assert_called()
+        _, kwargs = mock_tasks.update_skill_sets_report_for_characters.delay.call_args
+        self.assertSetEqual(
+            set(kwargs["character_pks"]),
+            {self.character_1001.pk, self.character_1101.pk},
+        )
+
+    def test_should_update_report_for_characters_of_user_when_main_character_changes(
+        self, mock_tasks
+    ):
+        # given
+        eve_character = self.character_1001.eve_character
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            eve_character.alliance_name = "Wayne Technologies"
+            eve_character.save()
+        # then
+        _, kwargs = mock_tasks.update_skill_sets_report_for_characters.delay.call_args
+        self.assertSetEqual(
+            set(kwargs["character_pks"]),
+            {self.character_1001.pk, self.character_1101.pk},
+        )
+
+    def test_should_update_report_for_character_when_alt_changes(self, mock_tasks):
+        # given
+        eve_character = self.character_1101.eve_character
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            eve_character.corporation_name = "Wayne Technologies"
+            eve_character.save()
+        # then
+        mock_tasks.update_skill_sets_report_for_characters.delay.assert_any_call(
+            character_pks=[self.character_1101.pk]
+        )
+
+    def test_should_update_report_for_character_when_owner_changes(self, mock_tasks):
+        # given
+        ownership = self.character_1101.eve_character.character_ownership
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            ownership.delete()
+        # then
+        mock_tasks.update_skill_sets_report_for_characters.delay.assert_any_call(
+            character_pks=[self.character_1101.pk]
+        )
+
+    def test_should_not_update_report_for_eve_characters_without_character(
+        self, mock_tasks
+    ):
+        # given
+        eve_character = EveCharacter.objects.get(character_id=1002)
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            eve_character.save()
+        # then
+        self.assertFalse(
+            mock_tasks.update_skill_sets_report_for_characters.delay.called
+        )
+
+
+@patch("memberaudit.signals.tasks", spec=True)
+class TestPostMigrateSignals(NoSocketsTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        load_eveuniverse()
+        load_entities()
+        cls.character = create_memberaudit_character(1001)
+        cls.merlin = EveType.objects.get(id=603)
+
+    def _emit_post_migrate(self):
+        emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+
+    def test_should_update_asset_valuations_of_characters_without_any(
+        self, mock_tasks
+    ):
+        # given
+        CharacterAsset.objects.create(
+            character=self.character,
+            item_id=1,
+            eve_type=self.merlin,
+            is_singleton=True,
+            quantity=1,
+        )
+        # when
+        self._emit_post_migrate()
+        # then
+        self.assertTrue(mock_tasks.update_asset_valuations.delay.called)
+
+    def test_should_not_update_asset_valuations_when_all_exist(self, mock_tasks):
+        # given
+        CharacterAsset.objects.create(
+            character=self.character,
+            item_id=1,
+            eve_type=self.merlin,
+            is_singleton=True,
+            quantity=1,
+        )
+        CharacterAssetValuation.objects.create(
+            character=self.character, date=now().date()
+        )
+        # when
+        self._emit_post_migrate()
+        # then
+        self.assertFalse(mock_tasks.update_asset_valuations.delay.called)
+
+    def test_should_fill_empty_skill_sets_report(self, mock_tasks):
+        # given
+        CharacterSkillSetCheck.objects.create(
+            character=self.character, skill_set=create_skill_set()
+        )
+        # when
+        self._emit_post_migrate()
+        # then
+        self.assertTrue(mock_tasks.update_skill_sets_report.delay.called)
+
+    def test_should_not_fill_skill_sets_report_without_checks(self, mock_tasks):
+        # when
+        self._emit_post_migrate()
+        # then
+        self.assertFalse(mock_tasks.update_skill_sets_report.delay.called)
@@ -1,11 +1,13 @@
 import datetime as dt
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from bravado.exception import HTTPInternalServerError
 from celery.exceptions import Retry as CeleryRetry
 
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 from django.utils.timezone import now
+from esi.errors import TokenError
 from esi.models import Token
 from eveuniverse.models import EveSolarSystem, EveType
 
@@ -15,21 +17,28 @@ from app_utils.testing import create_user_from_evecharacter, generate_invalid_pk
 
 from ..models import Character, CharacterAsset, CharacterUpdateStatus, Location
 from ..tasks import (
+    SPREAD_BACKLOG_CACHE_KEY,
     _export_data_for_topic,
     delete_character,
     export_data,
     run_regular_updates,
     update_all_characters,
+    update_asset_valuations,
     update_character,
+    update_character_asset_valuation,
     update_character_assets,
     update_character_contacts,
     update_character_contracts,
     update_character_mails,
+    update_character_sections_bundled,
     update_character_wallet_journal,
     update_characters_skill_checks,
+    update_characters_tick,
     update_compliance_groups_for_user,
     update_mail_entity_esi,
     update_market_prices,
+    update_skill_set_checks,
+    update_skill_sets_report,
     update_structure_esi,
 )
 from .testdata.esi_client_stub import esi_client_error_stub, esi_client_stub
@@ -64,9 +73,59 @@ class TestRegularUpdates(TestCase):
 @patch(TASKS_PATH + ".retry_task_if_esi_is_down", lambda x: None)
 class TestOtherTasks(TestCase):
     @patch(TASKS_PATH + ".EveMarketPrice.objects.update_from_esi")
-    def test_update_market_prices(self, mock_update_from_esi):
+    @patch(TASKS_PATH + ".update_asset_valuations")
+    def test_update_market_prices(
+        self, mock_update_asset_valuations, mock_update_from_esi
+    ):
         update_market_prices()
         self.assertTrue(mock_update_from_esi.called)
+        self.assertTrue(mock_update_asset_valuations.apply_async.called)
+
+    @patch(TASKS_PATH + ".update_character_asset_valuation")
+    def test_should_start_asset_valuation_for_characters_with_assets(
+        self, mock_update_character_asset_valuation
+    ):
+        # given
+        load_entities()
+        load_eveuniverse()
+        load_locations()
+        character_1001 = create_memberaudit_character(1001)
+        create_memberaudit_character(1002)
+        CharacterAsset.objects.create(
+            character=character_1001,
+            item_id=1,
+            location=Location.objects.get(id=60003760),
+            eve_type=EveType.objects.get(id=603),
+            is_singleton=True,
+            location_flag="Hangar",
+            quantity=1,
+        )
+        # when
+        update_asset_valuations()
+        # then
+        _, kwargs = mock_update_character_asset_valuation.apply_async.call_args
+        self.assertEqual(
+            mock_update_character_asset_valuation.apply_async.call_count, 1
+        )
+        self.assertEqual(kwargs["kwargs"], {"character_pk": character_1001.pk})
+
+    @patch(
+        MANAGERS_PATH + ".sections.CharacterAssetValuationManager.update_for_character"
+    )
+    @patch(MANAGERS_PATH + ".sections.CharacterAssetManagerBase.update_contents")
+    def test_should_update_asset_valuation_of_character(
+        self, mock_update_contents, mock_update_for_character
+    ):
+        # given
+        load_entities()
+        character = create_memberaudit_character(1001)
+        # when
+        update_character_asset_valuation(character_pk=character.pk)
+        # then
+        (obj,), _ = mock_update_contents.call_args
+        self.assertEqual(obj.pk, character.pk)
+        (obj,), _ = mock_update_for_character.call_args
+        self.assertEqual(obj.pk, character.pk)
 
 
 @override_settings(CELERY_ALWAYS_EAGER=True)  # need to ignore exceptions
@@ -108,6 +167,8 @@ class TestUpdateCharacterAssets(TestCase):
             },
         )
 
+        self.assertTrue(self.character_1001.asset_valuations.exists())
+
         asset = self.character_1001.assets.get(item_id=1100000000001)
         self.assertTrue(asset.is_blueprint_copy)
         self.assertTrue(asset.is_singleton)
@@ -284,8 +345,10 @@ class TestUpdateCharacterAssets(TestCase):
         mock_esi.client = esi_client_stub
 
         with patch(MODELS_PATH + ".character.Location") as m:
-            m.objects.get_or_create_esi_async.side_effect = HTTPInternalServerError(
-                response=BravadoResponseStub(500, "Test exception")
+            m.objects.bulk_get_or_create_esi_async.side_effect = (
+                HTTPInternalServerError(
+                    response=BravadoResponseStub(500, "Test exception")
+                )
             )
             with self.assertRaises(OSError):
                 update_character_assets(self.character_1001.pk)
@@ -663,6 +726,111 @@ class TestUpdateCharacter(TestCase):
         self.assertTrue(self.character_1001.is_update_status_ok())
 
 
+@patch(TASKS_PATH + ".retry_task_if_esi_is_down", lambda x: None)
+@patch(MANAGERS_PATH + ".general.fetch_esi_status", lambda: EsiStatus(True, 99, 60))
+@patch(MODELS_PATH + ".character.esi")
+@override_settings(CELERY_ALWAYS_EAGER=True, CELERY_EAGER_PROPAGATES_EXCEPTIONS=True)
+class TestUpdateCharacterSectionsBundled(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        load_eveuniverse()
+        load_entities()
+        load_locations()
+        cls.sections = sorted(Character.BUNDLED_UPDATE_SECTIONS)
+
+    def setUp(self) -> None:
+        self.character_1001 = create_memberaudit_character(1001)
+
+    def test_should_update_all_sections(self, mock_esi):
+        # given
+        mock_esi.client = esi_client_stub
+        # when
+        update_character_sections_bundled(self.character_1001.pk, self.sections)
+        # then
+        for section in self.sections:
+            status = self.character_1001.update_status_set.get(section=section)
+            self.assertTrue(status.is_success, section)
+            self.assertTrue(status.finished_at, section)
+        self.character_1001.refresh_from_db()
+        self.assertEqual(self.character_1001.ship.eve_type_id, 603)
+        self.assertEqual(self.character_1001.location.location_id, 60003760)
+        self.assertTrue(self.character_1001.online_status.last_login)
+
+    def test_should_fetch_token_only_once(self, mock_esi):
+        # given
+        mock_esi.client = esi_client_stub
+        # when
+        with patch(
+            TASKS_PATH + ".Character.fetch_token",
+            autospec=True,
+            side_effect=Character.fetch_token,
+        ) as mock_fetch_token:
+            update_character_sections_bundled(self.character_1001.pk, self.sections)
+        # then
+        self.assertEqual(mock_fetch_token.call_count, 1)
+
+    def test_should_report_error_for_failed_section_only(self, mock_esi):
+        # given
+        mock_esi.client = esi_client_stub
+        # when
+        with patch(
+            TASKS_PATH + ".Character._fetch_ship",
+            side_effect=HTTPInternalServerError(
+                response=BravadoResponseStub(500, "Test exception")
+            ),
+        ):
+            update_character_sections_bundled(self.character_1001.pk, self.sections)
+        # then
+        status = self.character_1001.update_status_set.get(
+            section=Character.UpdateSection.SHIP
+        )
+        self.assertFalse(status.is_success)
+        self.assertEqual(
+            status.last_error_message, "HTTPInternalServerError: 500 Test exception"
+        )
+        status = self.character_1001.update_status_set.get(
+            section=Character.UpdateSection.LOCATION
+        )
+        self.assertTrue(status.is_success)
+
+    def test_should_report_errors_for_all_sections_when_token_can_not_be_fetched(
+        self, mock_esi
+    ):
+        # given
+        mock_esi.client = esi_client_stub
+        self.character_1001.user.token_set.all().delete()
+        # when
+        with self.assertRaises(TokenError):
+            update_character_sections_bundled(self.character_1001.pk, self.sections)
+        # then
+        self.assertFalse(
+            self.character_1001.update_status_set.filter(is_success=True).exists()
+        )
+        self.assertEqual(
+            self.character_1001.update_status_set.filter(is_success=False).count(),
+            len(self.sections),
+        )
+
+    @patch(TASKS_PATH + ".MEMBERAUDIT_TASKS_BUNDLED_UPDATES", True)
+    def test_should_update_bundled_sections_from_character_update(self, mock_esi):
+        # given
+        mock_esi.client = esi_client_stub
+        # when
+        with patch(TASKS_PATH + ".update_character_section") as mock_update_section:
+            update_character(self.character_1001.pk)
+        # then
+        updated_sections = {
+            call[1]["kwargs"]["section"]
+            for call in mock_update_section.apply_async.call_args_list
+        }
+        self.assertTrue(updated_sections)
+        self.assertFalse(updated_sections & Character.BUNDLED_UPDATE_SECTIONS)
+        for section in self.sections:
+            status = self.character_1001.update_status_set.get(section=section)
+            self.assertTrue(status.is_success, section)
+
+
 @patch(
     TASKS_PATH + ".Character.objects.get_cached",
     lambda pk, timeout: Character.objects.get(pk=pk),
@@ -690,6 +858,200 @@ class TestUpdateAllCharacters(TestCase):
         # then
         self.assertTrue(character_1001.is_update_status_ok())
 
+    def test_should_start_updates_for_stale_sections_only(self, mock_esi):
+        # given
+        mock_esi.client = esi_client_stub
+        character_1001 = create_memberaudit_character(1001)
+        for section in Character.UpdateSection.values:
+            if section != Character.UpdateSection.LOYALTY:
+                CharacterUpdateStatus.objects.create(
+                    character=character_1001,
+                    section=section,
+                    is_success=True,
+                    started_at=now() - dt.timedelta(seconds=30),
+                    finished_at=now(),
+                )
+        # when
+        with patch(TASKS_PATH + ".update_character") as mock_update_character, patch(
+            TASKS_PATH + ".update_character_section"
+        ) as mock_update_section:
+            update_all_characters()
+        # then
+        self.assertFalse(mock_update_character.apply_async.called)
+        updated_sections = [
+            call[1]["kwargs"]["section"]
+            for call in mock_update_section.apply_async.call_args_list
+        ]
+        self.assertListEqual(updated_sections, [Character.UpdateSection.LOYALTY])
+
+
+@patch(TASKS_PATH + ".retry_task_if_esi_is_down", lambda x: None)
+@patch(TASKS_PATH + ".MEMBERAUDIT_LOG_UPDATE_STATS", False)
+@patch(TASKS_PATH + ".check_character_consistency", Mock())
+@patch(TASKS_PATH + "._start_section_updates")
+@patch(TASKS_PATH + ".update_characters_tick")
+class TestSpreadCharacterUpdates(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        load_entities()
+        cls.character_1001 = create_memberaudit_character(1001)
+        cls.character_1002 = create_memberaudit_character(1002)
+        cls.character_1003 = create_memberaudit_character(1003)
+
+    def setUp(self) -> None:
+        cache.delete(SPREAD_BACKLOG_CACHE_KEY)
+
+    @patch(TASKS_PATH + ".MEMBERAUDIT_TASKS_SPREAD_UPDATES", True)
+    @patch(TASKS_PATH + ".MEMBERAUDIT_UPDATE_STALE_RING_1", 60)
+    @patch(TASKS_PATH + ".MEMBERAUDIT_UPDATE_STALE_OFFSET", 5)
+    @patch(TASKS_PATH + ".CharacterUpdateStatus.objects.statistics")
+    def test_should_start_first_tick_with_capacity(
+        self, mock_statistics, mock_update_characters_tick, mock_start_section_updates
+    ):
+        # given
+        mock_statistics.return_value = {
+            "update_statistics": {
+                "ring_1": {"total": {"throughput_est": 120}},
+                "ring_2": {"total": {"throughput_est": 60}},
+                "ring_3": {"total": {"throughput_est": None}},
+            }
+        }
+        # when
+        update_all_characters()
+        # then
+        self.assertFalse(mock_start_section_updates.called)
+        _, kwargs = mock_update_characters_tick.apply_async.call_args
+        self.assertEqual(kwargs["kwargs"]["tick"], 0)
+        self.assertEqual(kwargs["kwargs"]["ticks"], 11)
+        self.assertEqual(kwargs["kwargs"]["capacity"], 5)
+
+    @patch(TASKS_PATH + ".MEMBERAUDIT_TASKS_SPREAD_UPDATES", True)
+    @patch(TASKS_PATH + ".MEMBERAUDIT_UPDATE_STALE_RING_1", 15)
+    @patch(TASKS_PATH + ".MEMBERAUDIT_UPDATE_STALE_OFFSET", 5)
+    @patch(TASKS_PATH + ".CharacterUpdateStatus.objects.statistics")
+    def test_should_start_first_tick_with_capacity_below_even_share(
+        self, mock_statistics, mock_update_characters_tick, mock_start_section_updates
+    ):
+        # given
+        mock_statistics.return_value = {
+            "update_statistics": {"ring_1": {"total": {"throughput_est": 12}}}
+        }
+        # when
+        update_all_characters()
+        # then
+        _, kwargs = mock_update_characters_tick.apply_async.call_args
+        self.assertEqual(kwargs["kwargs"]["ticks"], 2)
+        self.assertEqual(kwargs["kwargs"]["capacity"], 1)
+
+    @patch(TASKS_PATH + ".character_tick", lambda pk, ticks: 0)
+    def test_should_update_stale_characters_of_tick_up_to_capacity(
+        self, mock_update_characters_tick, mock_start_section_updates
+    ):
+        # given
+        for section in Character.UpdateSection.values:
+            CharacterUpdateStatus.objects.create(
+                character=self.character_1003,
+                section=section,
+                is_success=True,
+                started_at=now() - dt.timedelta(seconds=30),
+                finished_at=now(),
+            )
+        # when
+        update_characters_tick(tick=0, ticks=3, capacity=1, root_task_id="abc")
+        # then
+        updated_pks = [
+            call[1]["character_pk"]
+            for call in mock_start_section_updates.call_args_list
+        ]
+        self.assertListEqual(updated_pks, [self.character_1001.pk])
+        _, kwargs = mock_update_characters_tick.apply_async.call_args
+        self.assertEqual(kwargs["kwargs"]["tick"], 1)
+        self.assertListEqual(kwargs["kwargs"]["deferred_pks"], [self.character_1002.pk])
+        self.assertEqual(kwargs["countdown"], 300)
+
+    @patch(TASKS_PATH + ".character_tick", lambda pk, ticks: 2)
+    def test_should_defer_characters_beyond_capacity_to_next_cycle(
+        self, mock_update_characters_tick, mock_start_section_updates
+    ):
+        # when
+        update_characters_tick(
+            tick=2,
+            ticks=3,
+            capacity=1,
+            root_task_id="abc",
+            deferred_pks=[self.character_1002.pk, generate_invalid_pk(Character)],
+        )
+        # then
+        updated_pks = [
+            call[1]["character_pk"]
+            for call in mock_start_section_updates.call_args_list
+        ]
+        self.assertListEqual(updated_pks, [self.character_1002.pk])
+        self.assertFalse(mock_update_characters_tick.apply_async.called)
+        backlog = cache.get(SPREAD_BACKLOG_CACHE_KEY)
+        self.assertEqual(backlog["capacity"], 1)
+        self.assertListEqual(
+            backlog["deferred_pks"], [self.character_1001.pk, self.character_1003.pk]
+        )
+
+    @patch(TASKS_PATH + ".MEMBERAUDIT_TASKS_SPREAD_UPDATES", True)
+    @patch(TASKS_PATH + ".CharacterUpdateStatus.objects.statistics")
+    def test_should_start_first_tick_with_backlog_of_last_cycle(
+        self, mock_statistics, mock_update_characters_tick, mock_start_section_updates
+    ):
+        # given
+        cache.set(
+            SPREAD_BACKLOG_CACHE_KEY,
+            {"capacity": 2, "deferred_pks": [self.character_1003.pk]},
+        )
+        # when
+        update_all_characters()
+        # then
+        self.assertFalse(mock_statistics.called)
+        _, kwargs = mock_update_characters_tick.apply_async.call_args
+        self.assertEqual(kwargs["kwargs"]["tick"], 0)
+        self.assertEqual(kwargs["kwargs"]["capacity"], 2)
+        self.assertListEqual(kwargs["kwargs"]["deferred_pks"], [self.character_1003.pk])
+        self.assertIsNone(cache.get(SPREAD_BACKLOG_CACHE_KEY))
+
+    @patch(TASKS_PATH + ".character_tick", lambda pk, ticks: 1)
+    def test_should_reduce_capacity_when_last_tick_was_not_finished(
+        self, mock_update_characters_tick, mock_start_section_updates
+    ):
+        # given
+        for section in Character.UpdateSection.values[:3]:
+            CharacterUpdateStatus.objects.create(
+                character=self.character_1003,
+                section=section,
+                is_success=True,
+                parent_task_id="last-tick",
+                started_at=now() - dt.timedelta(seconds=30),
+                finished_at=now(),
+            )
+        # when
+        update_characters_tick(
+            tick=1,
+            ticks=3,
+            capacity=3,
+            root_task_id="abc",
+            last_tick_id="last-tick",
+            last_released_count=3,
+            last_released_sections=9,
+        )
+        # then
+        updated_pks = [
+            call[1]["character_pk"]
+            for call in mock_start_section_updates.call_args_list
+        ]
+        self.assertListEqual(updated_pks, [self.character_1001.pk])
+        _, kwargs = mock_update_characters_tick.apply_async.call_args
+        self.assertEqual(kwargs["kwargs"]["capacity"], 1)
+        self.assertListEqual(
+            kwargs["kwargs"]["deferred_pks"],
+            [self.character_1002.pk, self.character_1003.pk],
+        )
+
 
 @patch(TASKS_PATH + ".retry_task_if_esi_is_down", lambda x: None)
 @patch(MANAGERS_PATH + ".general.fetch_esi_status", lambda: EsiStatus(True, 99, 60))
@@ -777,6 +1139,42 @@ class TestUpdateCharactersDoctrines(TestCase):
         update_characters_skill_checks()
         self.assertTrue(mock_update_skill_sets.called)
 
+    @patch(MODELS_PATH + ".character.Character.update_skill_sets")
+    @patch(
+        MANAGERS_PATH + ".sections.CharacterSkillSetCheckManager.update_for_characters"
+    )
+    def test_should_update_all_characters_in_one_pass_when_forced(
+        self, mock_update_for_characters, mock_update_skill_sets
+    ):
+        # when
+        update_characters_skill_checks(force_update=True)
+        # then
+        self.assertFalse(mock_update_skill_sets.called)
+        (character_pks,), _ = mock_update_for_characters.call_args
+        self.assertListEqual(list(character_pks), [self.character_1001.pk])
+
+    @patch(
+        MANAGERS_PATH + ".sections.CharacterSkillSetCheckManager.update_for_skill_sets"
+    )
+    def test_should_update_checks_of_one_skill_set(self, mock_update_for_skill_sets):
+        # when
+        update_skill_set_checks.delay(skill_set_pk=42)
+        # then
+        mock_update_for_skill_sets.assert_called_once_with([42])
+
+    @patch(
+        MANAGERS_PATH
+        + ".sections.CharacterSkillSetReportRowManager.update_for_characters"
+    )
+    def test_should_update_skill_sets_report_for_all_characters(
+        self, mock_update_for_characters
+    ):
+        # when
+        update_skill_sets_report.delay()
+        # then
+        (character_pks,), _ = mock_update_for_characters.call_args
+        self.assertListEqual(list(character_pks), [self.character_1001.pk])
+
 
 @override_settings(CELERY_ALWAYS_EAGER=True, CELERY_EAGER_PROPAGATES_EXCEPTIONS=True)
 class TestDeleteCharacter(TestCase):
@@ -86,3 +86,26 @@ def json_response_to_python_2(response: JsonResponse, data_key="data") -> object
 def json_response_to_dict_2(response: JsonResponse, key="id", data_key="data") -> dict:
     """Convert JSON response into dict by given key."""
     return {x[key]: x for x in json_response_to_python_2(response, data_key)}
+
+
+def datatables_query(columns: list, order: list = None, **params) -> dict:
+    """Create query params of a DataTables request with server-side processing.
+
+    Args:
+        columns: names of all columns
+        order: list of tuples with column number and direction
+        params: additional params overriding the generated ones
+    """
+    query = {"draw": 1, "start": 0, "length": 100}
+    for num, column in enumerate(columns):
+        query[f"columns[{num}][data]"] = column
+        query[f"columns[{num}][name]"] = ""
+        query[f"columns[{num}][searchable]"] = "true"
+        query[f"columns[{num}][orderable]"] = "true"
+        query[f"columns[{num}][search][value]"] = ""
+        query[f"columns[{num}][search][regex]"] = "false"
+    for num, (column_num, direction) in enumerate(order or []):
+        query[f"order[{num}][column]"] = column_num
+        query[f"order[{num}][dir]"] = direction
+    query.update(params)
+    return query
@@ -16,10 +16,11 @@ from ..testdata.factories import (
 from ..testdata.load_eveuniverse import load_eveuniverse
 
 MODULE_PATH = "memberaudit.views.admin"
+SIGNALS_PATH = "memberaudit.signals"
 
 
 @patch(MODULE_PATH + ".messages", spec=True)
-@patch(MODULE_PATH + ".tasks", spec=True)
+@patch(SIGNALS_PATH + ".tasks", spec=True)
 class TestCreateSkillSetFromFitting(NoSocketsTestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -48,10 +49,11 @@ class TestCreateSkillSetFromFitting(NoSocketsTestCase):
         )
         request.user = self.superuser
         # when
-        response = admin.admin_create_skillset_from_fitting(request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin.admin_create_skillset_from_fitting(request)
         # then
         self.assertEqual(response.status_code, 302)
-        self.assertTrue(mock_tasks.update_characters_skill_checks.delay.called)
+        self.assertTrue(mock_tasks.update_skill_set_checks.delay.called)
         self.assertTrue(mock_messages.info.called)
         self.assertEqual(SkillSet.objects.count(), 1)
 
@@ -64,10 +66,11 @@ class TestCreateSkillSetFromFitting(NoSocketsTestCase):
         )
         request.user = self.superuser
         # when
-        response = admin.admin_create_skillset_from_fitting(request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin.admin_create_skillset_from_fitting(request)
         # then
         self.assertEqual(response.status_code, 302)
-        self.assertTrue(mock_tasks.update_characters_skill_checks.delay.called)
+        self.assertTrue(mock_tasks.update_skill_set_checks.delay.called)
         self.assertTrue(mock_messages.warning.info)
         skill_set.refresh_from_db()
         self.assertGreater(skill_set.skills.count(), 0)
@@ -86,11 +89,12 @@ class TestCreateSkillSetFromFitting(NoSocketsTestCase):
         )
         request.user = self.superuser
         # when
-        response = admin.admin_create_skillset_from_fitting(request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin.admin_create_skillset_from_fitting(request)
         # then
         self.assertEqual(response.status_code, 302)
         self.assertTrue(mock_messages.info.called)
-        self.assertTrue(mock_tasks.update_characters_skill_checks.delay.called)
+        self.assertTrue(mock_tasks.update_skill_set_checks.delay.called)
         skill_set = SkillSet.objects.first()
         self.assertIn(skill_set, skill_set_group.skill_sets.all())
 
@@ -105,17 +109,18 @@ class TestCreateSkillSetFromFitting(NoSocketsTestCase):
         )
         request.user = self.superuser
         # when
-        response = admin.admin_create_skillset_from_fitting(request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin.admin_create_skillset_from_fitting(request)
         # then
         self.assertEqual(response.status_code, 302)
-        self.assertTrue(mock_tasks.update_characters_skill_checks.delay.called)
+        self.assertTrue(mock_tasks.update_skill_set_checks.delay.called)
         self.assertTrue(mock_messages.info.called)
         skill_set = SkillSet.objects.last()
         self.assertEqual(skill_set.name, "My-Name")
 
 
 @patch(MODULE_PATH + ".messages", spec=True)
-@patch(MODULE_PATH + ".tasks", spec=True)
+@patch(SIGNALS_PATH + ".tasks", spec=True)
 class TestCreateSkillSetFromSkillPlan(NoSocketsTestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -150,10 +155,11 @@ class TestCreateSkillSetFromSkillPlan(NoSocketsTestCase):
         )
         request.user = self.superuser
         # when
-        response = admin.admin_create_skillset_from_skill_plan(request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin.admin_create_skillset_from_skill_plan(request)
         # then
         self.assertEqual(response.status_code, 302)
-        self.assertTrue(mock_tasks.update_characters_skill_checks.delay.called)
+        self.assertTrue(mock_tasks.update_skill_set_checks.delay.called)
         self.assertTrue(mock_messages.info.called)
         self.assertEqual(SkillSet.objects.count(), 1)
 
@@ -172,10 +178,11 @@ class TestCreateSkillSetFromSkillPlan(NoSocketsTestCase):
         )
         request.user = self.superuser
         # when
-        response = admin.admin_create_skillset_from_skill_plan(request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin.admin_create_skillset_from_skill_plan(request)
         # then
         self.assertEqual(response.status_code, 302)
-        self.assertTrue(mock_tasks.update_characters_skill_checks.delay.called)
+        self.assertTrue(mock_tasks.update_skill_set_checks.delay.called)
         self.assertTrue(mock_messages.warning.info)
         skill_set.refresh_from_db()
         self.assertGreater(skill_set.skills.count(), 0)
@@ -195,10 +202,11 @@ class TestCreateSkillSetFromSkillPlan(NoSocketsTestCase):
         )
         request.user = self.superuser
         # when
-        response = admin.admin_create_skillset_from_skill_plan(request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = admin.admin_create_skillset_from_skill_plan(request)
         # then
         self.assertEqual(response.status_code, 302)
         self.assertTrue(mock_messages.info.called)
-        self.assertTrue(mock_tasks.update_characters_skill_checks.delay.called)
+        self.assertTrue(mock_tasks.update_skill_set_checks.delay.called)
         skill_set = SkillSet.objects.first()
         self.assertIn(skill_set, skill_set_group.skill_sets.all())
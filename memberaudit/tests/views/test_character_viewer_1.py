@@ -1,4 +1,5 @@
 import datetime as dt
+import json
 from unittest.mock import patch
 
 import pytz
@@ -17,6 +18,7 @@ from app_utils.testing import (
 
 from ...models import (
     CharacterAsset,
+    CharacterAssetValuation,
     CharacterAttributes,
     CharacterContact,
     CharacterContract,
@@ -26,11 +28,16 @@ from ...models import (
     CharacterLoyaltyEntry,
 )
 from ...views.character_viewer_1 import (
+    CharacterAssetsListJson,
+    CharacterContactsListJson,
+    CharacterContractsListJson,
     character_asset_container,
     character_asset_container_data,
     character_assets_data,
+    character_assets_fdd_data,
     character_attribute_data,
     character_contacts_data,
+    character_contacts_fdd_data,
     character_contract_details,
     character_contract_items_included_data,
     character_contract_items_requested_data,
@@ -43,6 +50,7 @@ from ...views.character_viewer_1 import (
 from ..testdata.factories import create_character
 from ..utils import (
     LoadTestDataMixin,
+    datatables_query,
     json_response_to_dict_2,
     json_response_to_python_2,
 )
@@ -62,6 +70,26 @@ class TestCharacterViewer(LoadTestDataMixin, TestCase):
         # then
         self.assertEqual(response.status_code, 200)
 
+    def test_should_show_assets_total_from_latest_valuation(self):
+        # given
+        CharacterAssetValuation.objects.create(
+            character=self.character,
+            date=now().date() - dt.timedelta(days=1),
+            total=1_000_000,
+        )
+        CharacterAssetValuation.objects.create(
+            character=self.character, date=now().date(), total=2_500_000_000
+        )
+        request = self.factory.get(
+            reverse("memberaudit:character_viewer", args=[self.character.pk])
+        )
+        request.user = self.user
+        # when
+        response = character_viewer(request, self.character.pk)
+        # then
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("2.5 billion ISK", response_text(response))
+
     def test_can_open_character_main_view_for_orphan(self):
         # given
         character = create_character(EveCharacter.objects.get(character_id=1121))
@@ -335,6 +363,138 @@ class TestCharacterAssets(LoadTestDataMixin, TestCase):
         self.assertEqual(row["volume"], 1.0)
 
 
+class TestCharacterAssetsServerSide(LoadTestDataMixin, TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        merlin = EveType.objects.get(id=603)
+        charon = EveType.objects.get(id=20185)
+        EveMarketPrice.objects.create(eve_type=merlin, average_price=1000)
+        EveMarketPrice.objects.create(eve_type=charon, average_price=2000)
+        cls.merlin_1 = CharacterAsset.objects.create(
+            character=cls.character,
+            item_id=1,
+            location=cls.jita_44,
+            eve_type=merlin,
+            is_singleton=False,
+            name="",
+            quantity=5,
+        )
+        cls.charon = CharacterAsset.objects.create(
+            character=cls.character,
+            item_id=2,
+            location=cls.jita_44,
+            eve_type=charon,
+            is_singleton=True,
+            name="Trucker",
+            quantity=1,
+        )
+        cls.merlin_2 = CharacterAsset.objects.create(
+            character=cls.character,
+            item_id=3,
+            location=cls.structure_1,
+            eve_type=merlin,
+            is_singleton=False,
+            name="",
+            quantity=1,
+        )
+        CharacterAsset.objects.create(
+            character=cls.character,
+            item_id=4,
+            parent=cls.charon,
+            eve_type=merlin,
+            is_singleton=False,
+            quantity=2,
+        )
+
+    def _assets_response(self, **params):
+        query = datatables_query(
+            CharacterAssetsListJson.columns, order=[(0, "asc"), (1, "asc")], **params
+        )
+        request = self.factory.get(
+            reverse("memberaudit:character_assets_data", args=[self.character.pk]),
+            data=query,
+        )
+        request.user = self.user
+        response = character_assets_data(request, self.character.pk)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_should_return_requested_page_only(self):
+        # when
+        response = self._assets_response(start=1, length=1)
+        # then
+        data = json.loads(response_text(response))
+        self.assertEqual(data["recordsTotal"], 3)
+        self.assertEqual(data["recordsFiltered"], 3)
+        self.assertEqual([row["item_id"] for row in data["data"]], [2])
+        self.assertEqual(data["total"], 8000)
+
+    def test_should_order_by_requested_column(self):
+        # when
+        response = self._assets_response(
+            **{"order[0][column]": 6, "order[0][dir]": "desc"}
+        )
+        # then
+        data = json_response_to_python_2(response)
+        self.assertEqual([row["item_id"] for row in data], [1, 2, 3])
+
+    def test_should_filter_by_location_choice(self):
+        # when
+        response = self._assets_response(
+            **{
+                "columns[0][search][value]": "^Amamake.*$",
+                "columns[0][search][regex]": "true",
+            }
+        )
+        # then
+        data = json_response_to_python_2(response)
+        self.assertEqual([row["item_id"] for row in data], [3])
+
+    def test_should_filter_by_is_ship(self):
+        # when
+        response = self._assets_response(
+            **{
+                "columns[10][search][value]": "^yes$",
+                "columns[10][search][regex]": "true",
+            }
+        )
+        # then
+        data = json_response_to_python_2(response)
+        self.assertEqual({row["item_id"] for row in data}, {1, 2, 3})
+
+    def test_should_render_actions_for_containers_on_page(self):
+        # when
+        response = self._assets_response()
+        # then
+        data = json_response_to_dict_2(response, key="item_id")
+        self.assertTrue(data[2]["actions"])
+        self.assertFalse(data[1]["actions"])
+
+    def test_should_return_drop_down_options(self):
+        # given
+        request = self.factory.get(
+            reverse("memberaudit:character_assets_fdd_data", args=[self.character.pk]),
+            data={"columns": "location,solar_system,is_ship,invalid"},
+        )
+        request.user = self.user
+        # when
+        response = character_assets_fdd_data(request, self.character.pk)
+        # then
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response_text(response))
+        self.assertEqual(
+            data["location"],
+            [
+                "Amamake - Test Structure Alpha (1) (1.0k ISK)",
+                "Jita IV - Moon 4 - Caldari Navy Assembly Plant (2) (7.0k ISK)",
+            ],
+        )
+        self.assertEqual(data["solar_system"], ["Amamake", "Jita"])
+        self.assertEqual(data["is_ship"], ["yes"])
+        self.assertIn("ERROR", data["invalid"][0])
+
+
 class TestCharacterDataViewsOther(LoadTestDataMixin, TestCase):
     def test_character_contacts_data(self):
         CharacterContact.objects.create(
@@ -456,7 +616,140 @@ class TestCharacterDataViewsOther(LoadTestDataMixin, TestCase):
         self.assertEqual(data[implant_1.pk]["implant"]["sort"], 3)
 
 
+class TestCharacterContactsServerSide(LoadTestDataMixin, TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        CharacterContact.objects.create(
+            character=cls.character,
+            eve_entity=EveEntity.objects.get(id=1101),
+            standing=-10,
+            is_blocked=True,
+        )
+        CharacterContact.objects.create(
+            character=cls.character,
+            eve_entity=EveEntity.objects.get(id=2001),
+            standing=10,
+        )
+        CharacterContact.objects.create(
+            character=cls.character,
+            eve_entity=EveEntity.objects.get(id=1002),
+            standing=5,
+            is_watched=True,
+        )
+
+    def _contacts_data(self, **params) -> dict:
+        query = datatables_query(
+            CharacterContactsListJson.columns, order=[(3, "desc")], **params
+        )
+        request = self.factory.get(
+            reverse("memberaudit:character_contacts_data", args=[self.character.pk]),
+            data=query,
+        )
+        request.user = self.user
+        response = character_contacts_data(request, self.character.pk)
+        self.assertEqual(response.status_code, 200)
+        return json_response_to_python_2(response)
+
+    def test_should_order_by_standing(self):
+        # when
+        data = self._contacts_data()
+        # then
+        self.assertEqual([row["id"] for row in data], [2001, 1002, 1101])
+
+    def test_should_filter_by_level(self):
+        # when
+        data = self._contacts_data(
+            **{
+                "columns[0][search][value]": "^Good\\ Standing$",
+                "columns[0][search][regex]": "true",
+            }
+        )
+        # then
+        self.assertEqual([row["id"] for row in data], [1002])
+
+    def test_should_filter_by_watched(self):
+        # when
+        data = self._contacts_data(
+            **{
+                "columns[6][search][value]": "^no$",
+                "columns[6][search][regex]": "true",
+            }
+        )
+        # then
+        self.assertEqual([row["id"] for row in data], [2001, 1101])
+
+    def test_should_search_by_name(self):
+        # when
+        data = self._contacts_data(**{"search[value]": "wayne"})
+        # then
+        self.assertEqual([row["id"] for row in data], [2001])
+
+    def test_should_return_drop_down_options(self):
+        # given
+        request = self.factory.get(
+            reverse(
+                "memberaudit:character_contacts_fdd_data", args=[self.character.pk]
+            ),
+            data={"columns": "level,type,is_npc_str"},
+        )
+        request.user = self.user
+        # when
+        response = character_contacts_fdd_data(request, self.character.pk)
+        # then
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response_text(response))
+        self.assertEqual(
+            data["level"],
+            ["Excellent Standing", "Good Standing", "Terrible Standing"],
+        )
+        self.assertEqual(data["type"], ["Character", "Corporation"])
+        self.assertEqual(data["is_npc_str"], ["no"])
+
+
 class TestCharacterContracts(LoadTestDataMixin, TestCase):
+    @patch(MODULE_PATH + ".now")
+    def test_should_filter_contracts_by_status(self, mock_now):
+        # given
+        date_issued = dt.datetime(2020, 10, 8, 16, 45, tzinfo=pytz.utc)
+        mock_now.return_value = date_issued + dt.timedelta(days=1)
+        for contract_id, status in (
+            (42, CharacterContract.STATUS_IN_PROGRESS),
+            (43, CharacterContract.STATUS_FINISHED),
+        ):
+            CharacterContract.objects.create(
+                character=self.character,
+                contract_id=contract_id,
+                availability=CharacterContract.AVAILABILITY_PERSONAL,
+                contract_type=CharacterContract.TYPE_ITEM_EXCHANGE,
+                date_issued=date_issued,
+                date_expired=date_issued + dt.timedelta(days=3),
+                for_corporation=False,
+                issuer=EveEntity.objects.get(id=1001),
+                issuer_corporation=EveEntity.objects.get(id=2001),
+                status=status,
+                title="Dummy info",
+            )
+        query = datatables_query(
+            CharacterContractsListJson.columns,
+            order=[(5, "desc")],
+            **{
+                "columns[4][search][value]": "^finished$",
+                "columns[4][search][regex]": "true",
+            },
+        )
+        request = self.factory.get(
+            reverse("memberaudit:character_contracts_data", args=[self.character.pk]),
+            data=query,
+        )
+        request.user = self.user
+        # when
+        response = character_contracts_data(request, self.character.pk)
+        # then
+        self.assertEqual(response.status_code, 200)
+        data = json_response_to_python_2(response)
+        self.assertEqual([row["contract_id"] for row in data], [43])
+
     @patch(MODULE_PATH + ".now")
     def test_character_contracts_data_1(self, mock_now):
         """items exchange single item"""
@@ -1,4 +1,5 @@
 import datetime as dt
+import json
 
 from bs4 import BeautifulSoup
 
@@ -28,6 +29,9 @@ from ...models import (
     SkillSetSkill,
 )
 from ...views.character_viewer_2 import (
+    CharacterMiningLedgerListJson,
+    CharacterWalletJournalListJson,
+    CharacterWalletTransactionsListJson,
     character_jump_clones_data,
     character_mail,
     character_mail_headers_by_label_data,
@@ -39,6 +43,7 @@ from ...views.character_viewer_2 import (
     character_skills_data,
     character_wallet_journal_data,
     character_wallet_transactions_data,
+    character_wallet_transactions_fdd_data,
 )
 from ..testdata.factories import (
     create_character_mail,
@@ -52,6 +57,7 @@ from ..testdata.load_eveuniverse import load_eveuniverse
 from ..utils import (
     LoadTestDataMixin,
     create_memberaudit_character,
+    datatables_query,
     json_response_to_dict_2,
     json_response_to_python_2,
 )
@@ -130,6 +136,32 @@ class TestCharacterMiningLedgerData(NoSocketsTestCase):
         obj = data[0]
         self.assertEqual(obj["quantity"], entry.quantity)
 
+    def test_should_filter_by_date_range(self):
+        # given
+        today = now().date()
+        create_character_mining_ledger_entry(
+            self.character, date=today - dt.timedelta(days=10)
+        )
+        entry = create_character_mining_ledger_entry(self.character, date=today)
+        query = datatables_query(
+            CharacterMiningLedgerListJson.columns,
+            order=[(0, "asc")],
+            **{"columns[0][search][value]": f"{today - dt.timedelta(days=1)}|"},
+        )
+        request = self.factory.get(
+            reverse(
+                "memberaudit:character_mining_ledger_data", args=[self.character.pk]
+            ),
+            data=query,
+        )
+        request.user = self.user
+        # when
+        response = character_mining_ledger_data(request, self.character.pk)
+        # then
+        self.assertEqual(response.status_code, 200)
+        data = json_response_to_python_2(response)
+        self.assertEqual([obj["date"] for obj in data], [entry.date.isoformat()])
+
 
 class TestMailData(TestCase):
     @classmethod
@@ -609,3 +641,132 @@ class TestWallet(LoadTestDataMixin, TestCase):
         self.assertEqual(
             row["location"], "Jita IV - Moon 4 - Caldari Navy Assembly Plant"
         )
+
+    def _create_journal_entries(self):
+        for entry_id, amount, ref_type in (
+            (1, 1000, "player_donation"),
+            (2, -500, "market_transaction"),
+            (3, 3000, "player_donation"),
+        ):
+            CharacterWalletJournalEntry.objects.create(
+                character=self.character,
+                entry_id=entry_id,
+                amount=amount,
+                balance=10000,
+                context_id_type=CharacterWalletJournalEntry.CONTEXT_ID_TYPE_UNDEFINED,
+                date=now() - dt.timedelta(hours=entry_id),
+                description="dummy",
+                first_party=EveEntity.objects.get(id=1001),
+                ref_type=ref_type,
+            )
+
+    def _wallet_journal_data(self, **params) -> list:
+        query = datatables_query(
+            CharacterWalletJournalListJson.columns, order=[(0, "desc")], **params
+        )
+        request = self.factory.get(
+            reverse(
+                "memberaudit:character_wallet_journal_data", args=[self.character.pk]
+            ),
+            data=query,
+        )
+        request.user = self.user
+        response = character_wallet_journal_data(request, self.character.pk)
+        self.assertEqual(response.status_code, 200)
+        return json_response_to_python_2(response)
+
+    def test_should_return_wallet_journal_page(self):
+        # given
+        self._create_journal_entries()
+        # when
+        data = self._wallet_journal_data(start=1, length=1)
+        # then
+        self.assertEqual([row["amount"] for row in data], [-500])
+
+    def test_should_filter_wallet_journal_by_ref_type(self):
+        # given
+        self._create_journal_entries()
+        # when
+        data = self._wallet_journal_data(
+            **{
+                "columns[1][search][value]": "^Player\\ Donation$",
+                "columns[1][search][regex]": "true",
+            }
+        )
+        # then
+        self.assertEqual([row["amount"] for row in data], [1000, 3000])
+
+    def test_should_ignore_invalid_regex_filter(self):
+        # given
+        self._create_journal_entries()
+        # when
+        data = self._wallet_journal_data(
+            **{
+                "columns[1][search][value]": "(",
+                "columns[1][search][regex]": "true",
+            }
+        )
+        # then
+        self.assertEqual(len(data), 3)
+
+    def test_should_order_wallet_transactions_by_total(self):
+        # given
+        for transaction_id, is_buy in ((1, True), (2, False)):
+            CharacterWalletTransaction.objects.create(
+                character=self.character,
+                transaction_id=transaction_id,
+                client=EveEntity.objects.get(id=1002),
+                date=now(),
+                is_buy=is_buy,
+                is_personal=True,
+                location=Location.objects.get(id=60003760),
+                quantity=1,
+                eve_type=EveType.objects.get(id=603),
+                unit_price=100,
+            )
+        query = datatables_query(
+            CharacterWalletTransactionsListJson.columns, order=[(4, "asc")]
+        )
+        request = self.factory.get(
+            reverse(
+                "memberaudit:character_wallet_transactions_data",
+                args=[self.character.pk],
+            ),
+            data=query,
+        )
+        request.user = self.user
+        # when
+        response = character_wallet_transactions_data(request, self.character.pk)
+        # then
+        self.assertEqual(response.status_code, 200)
+        data = json_response_to_python_2(response)
+        self.assertEqual([row["total"] for row in data], [-100, 100])
+
+    def test_should_return_wallet_transactions_drop_down_options(self):
+        # given
+        CharacterWalletTransaction.objects.create(
+            character=self.character,
+            transaction_id=1,
+            client=EveEntity.objects.get(id=1002),
+            date=now(),
+            is_buy=True,
+            is_personal=True,
+            location=Location.objects.get(id=60003760),
+            quantity=1,
+            eve_type=EveType.objects.get(id=603),
+            unit_price=100,
+        )
+        request = self.factory.get(
+            reverse(
+                "memberaudit:character_wallet_transactions_fdd_data",
+                args=[self.character.pk],
+            ),
+            data={"columns": "buy_or_sell,client"},
+        )
+        request.user = self.user
+        # when
+        response = character_wallet_transactions_fdd_data(request, self.character.pk)
+        # then
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response_text(response))
+        self.assertEqual(data, {"buy_or_sell": ["Buy"], "client": ["Clark Kent"]})
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import Group
 from django.test import RequestFactory, TestCase
 from django.urls import reverse
+from django.utils.html import strip_tags
 from eveuniverse.models import EveType
 
 from allianceauth.authentication.models import State
@@ -12,15 +13,18 @@ from allianceauth.eveonline.models import (
 from allianceauth.tests.auth_utils import AuthUtils
 from app_utils.testing import (
     create_user_from_evecharacter,
+    json_response_to_python,
     multi_assert_in,
     multi_assert_not_in,
 )
 
-from ...models import Character, CharacterSkill, SkillSetGroup
+from ...models import CharacterAsset, CharacterSkill, Location
 from ...views.reports import (
+    AssetSearchListJson,
+    SkillSetsReportListJson,
     corporation_compliance_report_data,
     reports,
-    skill_sets_report_data,
+    skill_sets_report_fdd_data,
     user_compliance_report_data,
 )
 from ..testdata.factories import (
@@ -31,15 +35,22 @@ from ..testdata.factories import (
 )
 from ..testdata.load_entities import load_entities
 from ..testdata.load_eveuniverse import load_eveuniverse
+from ..testdata.load_locations import load_locations
 from ..utils import (
     add_auth_character_to_user,
     add_memberaudit_character_to_user,
     create_memberaudit_character,
     create_user_from_evecharacter_with_access,
+    datatables_query,
     json_response_to_dict_2,
+    json_response_to_python_2,
 )
 
 
+def strip_html(html: str) -> str:
+    return strip_tags(html).replace("&nbsp;", "").strip()
+
+
 class TestReports(TestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -280,10 +291,6 @@ class TestSkillSetReportData(TestCase):
         create_character(EveCharacter.objects.get(character_id=1121))
 
     def test_normal(self):
-        def make_data_id(doctrine: SkillSetGroup, character: Character) -> str:
-            doctrine_pk = doctrine.pk if doctrine else 0
-            return f"{doctrine_pk}_{character.pk}"
-
         # define doctrines
         ship_1 = create_skill_set(name="Ship 1")
         create_skill_set_skill(
@@ -347,55 +354,163 @@ class TestSkillSetReportData(TestCase):
         self.character_1101.update_skill_sets()
         self.character_1103.update_skill_sets()
 
-        request = self.factory.get(reverse("memberaudit:skill_sets_report_data"))
-        request.user = self.user
-        response = skill_sets_report_data(request)
-
-        self.assertEqual(response.status_code, 200)
-        data = json_response_to_dict_2(response)
+        data = self._skill_sets_report_data()
         self.assertEqual(len(data), 9)
 
-        mains = {x["main"] for x in data.values()}
+        mains = {strip_html(x["main_html"]) for x in data.values()}
         self.assertSetEqual(mains, {"Bruce Wayne", "Clark Kent"})
 
-        row = data[make_data_id(doctrine_1, self.character_1001)]
-        self.assertEqual(row["group"], "Alpha")
-        self.assertEqual(row["character"], "Bruce Wayne")
-        self.assertEqual(row["main"], "Bruce Wayne")
+        row = data[("Alpha", "Bruce Wayne")]
+        self.assertEqual(strip_html(row["main_html"]), "Bruce Wayne")
         self.assertEqual(row["is_main_str"], "yes")
         self.assertTrue(multi_assert_not_in(["Ship 1", "Ship 2"], row["has_required"]))
 
-        row = data[make_data_id(doctrine_1, self.character_1002)]
-        self.assertEqual(row["group"], "Alpha")
-        self.assertEqual(row["character"], "Clark Kent")
-        self.assertEqual(row["main"], "Clark Kent")
+        row = data[("Alpha", "Clark Kent")]
+        self.assertEqual(strip_html(row["main_html"]), "Clark Kent")
         self.assertEqual(row["is_main_str"], "yes")
 
         self.assertTrue(multi_assert_in(["Ship 1"], row["has_required"]))
         self.assertTrue(multi_assert_not_in(["Ship 2", "Ship 3"], row["has_required"]))
 
-        row = data[make_data_id(doctrine_1, self.character_1101)]
-        self.assertEqual(row["group"], "Alpha")
-        self.assertEqual(row["character"], "Lex Luther")
-        self.assertEqual(row["main"], "Clark Kent")
+        row = data[("Alpha", "Lex Luther")]
+        self.assertEqual(strip_html(row["main_html"]), "Clark Kent")
         self.assertEqual(row["is_main_str"], "no")
         self.assertTrue(multi_assert_in(["Ship 1", "Ship 2"], row["has_required"]))
 
-        row = data[make_data_id(doctrine_2, self.character_1101)]
-        self.assertEqual(row["group"], "Doctrine: Bravo")
-        self.assertEqual(row["character"], "Lex Luther")
-        self.assertEqual(row["main"], "Clark Kent")
+        row = data[("Doctrine: Bravo", "Lex Luther")]
+        self.assertEqual(strip_html(row["main_html"]), "Clark Kent")
         self.assertEqual(row["is_main_str"], "no")
+        self.assertEqual(row["is_doctrine_str"], "yes")
         self.assertTrue(multi_assert_in(["Ship 1"], row["has_required"]))
         self.assertTrue(multi_assert_not_in(["Ship 2"], row["has_required"]))
 
-        row = data[make_data_id(None, self.character_1101)]
-        self.assertEqual(row["group"], "[Ungrouped]")
-        self.assertEqual(row["character"], "Lex Luther")
-        self.assertEqual(row["main"], "Clark Kent")
+        row = data[("[Ungrouped]", "Lex Luther")]
+        self.assertEqual(strip_html(row["main_html"]), "Clark Kent")
         self.assertEqual(row["is_main_str"], "no")
         self.assertTrue(multi_assert_in(["Ship 3"], row["has_required"]))
 
+    def test_should_return_one_page_with_totals(self):
+        # given
+        ship_1 = create_skill_set(name="Ship 1")
+        for num in range(3):
+            create_skill_set_group(name=f"Group {num}").skill_sets.add(ship_1)
+        self.character_1001.update_skill_sets()
+        self.character_1002.update_skill_sets()
+        # when
+        response = self._skill_sets_report_response(start=2, length=2)
+        # then
+        result = json_response_to_python(response)
+        self.assertEqual(result["recordsTotal"], 6)
+        self.assertEqual(result["recordsFiltered"], 6)
+        self.assertListEqual(
+            [
+                (row["group"], strip_html(row["character_html"]))
+                for row in result["data"]
+            ],
+            [("Group 1", "Bruce Wayne"), ("Group 1", "Clark Kent")],
+        )
+
+    def test_should_filter_by_drop_down_values(self):
+        # given
+        ship_1 = create_skill_set(name="Ship 1")
+        create_skill_set_skill(
+            skill_set=ship_1, eve_type=self.skill_type_1, required_level=3
+        )
+        create_skill_set_group(name="Alpha").skill_sets.add(ship_1)
+        create_skill_set_group(name="Bravo", is_doctrine=True).skill_sets.add(ship_1)
+        CharacterSkill.objects.create(
+            character=self.character_1002,
+            eve_type=self.skill_type_1,
+            active_skill_level=5,
+            skillpoints_in_skill=10,
+            trained_skill_level=5,
+        )
+        self.character_1001.update_skill_sets()
+        self.character_1002.update_skill_sets()
+        # when
+        data = self._skill_sets_report_data(
+            **{
+                "columns[0][search][value]": "^Doctrine:\\ Bravo$",
+                "columns[0][search][regex]": "true",
+                "columns[8][search][value]": "^yes$",
+                "columns[8][search][regex]": "true",
+            }
+        )
+        # then
+        self.assertSetEqual(set(data.keys()), {("Doctrine: Bravo", "Clark Kent")})
+
+    def test_should_filter_by_regex_on_text_column(self):
+        # given
+        create_skill_set(name="Ship 1")
+        self.character_1001.update_skill_sets()
+        # when
+        data = self._skill_sets_report_data(
+            **{
+                "columns[2][search][value]": "^mem",
+                "columns[2][search][regex]": "true",
+            }
+        )
+        # then
+        self.assertIn(("[Ungrouped]", "Bruce Wayne"), data)
+
+    def test_should_ignore_invalid_regex_filters(self):
+        # given
+        create_skill_set(name="Ship 1")
+        self.character_1001.update_skill_sets()
+        # when
+        data = self._skill_sets_report_data(
+            **{
+                "columns[0][search][value]": "(",
+                "columns[0][search][regex]": "true",
+                "columns[7][search][value]": "[",
+                "columns[7][search][regex]": "true",
+            }
+        )
+        # then
+        self.assertIn(("[Ungrouped]", "Bruce Wayne"), data)
+
+    def test_should_return_drop_down_values(self):
+        # given
+        ship_1 = create_skill_set(name="Ship 1")
+        create_skill_set(name="Ship 2")
+        create_skill_set_group(name="Bravo", is_doctrine=True).skill_sets.add(ship_1)
+        self.character_1001.update_skill_sets()
+        request = self.factory.get(
+            reverse("memberaudit:skill_sets_report_fdd_data")
+            + "?columns=group,state,alliance,has_required_str,is_main_str"
+        )
+        request.user = self.user
+        # when
+        response = skill_sets_report_fdd_data(request)
+        # then
+        self.assertEqual(response.status_code, 200)
+        data = json_response_to_python(response)
+        self.assertListEqual(data["group"], ["[Ungrouped]", "Doctrine: Bravo"])
+        self.assertListEqual(data["state"], ["Member"])
+        self.assertListEqual(data["alliance"], ["Wayne Enterprises"])
+        self.assertListEqual(data["has_required_str"], ["yes"])
+        self.assertListEqual(data["is_main_str"], ["yes"])
+
+    def _skill_sets_report_response(self, **params):
+        query = datatables_query(
+            SkillSetsReportListJson.columns, order=[(0, "asc"), (4, "asc")], **params
+        )
+        request = self.factory.get(
+            reverse("memberaudit:skill_sets_report_data"), data=query
+        )
+        request.user = self.user
+        response = SkillSetsReportListJson.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def _skill_sets_report_data(self, **params) -> dict:
+        """Report rows by group and character name."""
+        response = self._skill_sets_report_response(**params)
+        return {
+            (row["group"], strip_html(row["character_html"])): row
+            for row in json_response_to_python_2(response)
+        }
+
     # def test_can_handle_user_without_main(self):
     #     character = create_memberaudit_character(1102)
     #     user = character.eve_character.character_ownership.user
@@ -414,3 +529,142 @@ class TestSkillSetReportData(TestCase):
     #     response = skill_sets_report_data(request)
     #     data = json_response_to_dict_2(response)
     #     self.assertEqual(len(data), 4)
+
+
+class TestAssetSearchReportData(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.factory = RequestFactory()
+        load_eveuniverse()
+        load_entities()
+        load_locations()
+        cls.jita_44 = Location.objects.get(id=60003760)
+        cls.structure_1 = Location.objects.get(id=1000000000001)
+        cls.merlin = EveType.objects.get(id=603)
+        cls.charon = EveType.objects.get(id=20185)
+
+        # user 1 is manager requesting the report
+        cls.character_1001 = create_memberaudit_character(1001)
+        cls.user = cls.character_1001.eve_character.character_ownership.user
+        cls.user = AuthUtils.add_permission_to_user_by_name(
+            "memberaudit.reports_access", cls.user
+        )
+
+        # user 2 is normal user and has two characters
+        cls.character_1002 = create_memberaudit_character(1002)
+        cls.character_1101 = add_memberaudit_character_to_user(
+            cls.character_1002.eve_character.character_ownership.user, 1101
+        )
+
+    def test_should_aggregate_assets_by_character_and_location(self):
+        # given
+        self._create_asset(self.character_1002, 1, self.merlin, 5, self.jita_44)
+        self._create_asset(self.character_1002, 2, self.merlin, 3, self.jita_44)
+        self._create_asset(self.character_1101, 3, self.merlin, 1, self.structure_1)
+        charon = self._create_asset(
+            self.character_1002, 4, self.charon, 1, self.jita_44
+        )
+        self._create_asset(
+            self.character_1002,
+            5,
+            self.merlin,
+            2,
+            root_location=self.jita_44,
+            parent=charon,
+        )
+        user = AuthUtils.add_permission_to_user_by_name(
+            "memberaudit.view_everything", self.user
+        )
+        # when
+        result = self._asset_search_result(user, **{"search[value]": "merl"})
+        # then
+        self.assertEqual(result["recordsTotal"], 2)
+        self.assertListEqual(
+            [
+                (
+                    strip_html(row["eve_type"]),
+                    strip_html(row["character"]),
+                    row["main"],
+                    row["location"],
+                    row["quantity"],
+                )
+                for row in result["data"]
+            ],
+            [
+                ("Merlin", "Lex Luther", "Clark Kent", self.structure_1.name_plus, 1),
+                ("Merlin", "Clark Kent", "Clark Kent", self.jita_44.name_plus, 10),
+            ],
+        )
+
+    def test_should_show_assets_without_root_location_without_location(self):
+        # given
+        self._create_asset(
+            self.character_1001, 1, self.merlin, 1, self.jita_44, root_location=None
+        )
+        # when
+        result = self._asset_search_result(self.user, **{"search[value]": "Merlin"})
+        # then
+        self.assertListEqual(
+            [(row["location"], row["quantity"]) for row in result["data"]], [("-", 1)]
+        )
+
+    def test_should_show_accessible_characters_only(self):
+        # given
+        self._create_asset(self.character_1001, 1, self.merlin, 1, self.jita_44)
+        self._create_asset(self.character_1002, 2, self.merlin, 1, self.jita_44)
+        # when
+        result = self._asset_search_result(self.user, **{"search[value]": "Merlin"})
+        # then
+        self.assertListEqual(
+            [strip_html(row["character"]) for row in result["data"]], ["Bruce Wayne"]
+        )
+
+    def test_should_return_nothing_for_short_search_terms(self):
+        # given
+        self._create_asset(self.character_1001, 1, self.merlin, 1, self.jita_44)
+        # when
+        result = self._asset_search_result(self.user, **{"search[value]": "Me"})
+        # then
+        self.assertEqual(result["recordsTotal"], 0)
+        self.assertListEqual(result["data"], [])
+
+    def test_should_return_one_page(self):
+        # given
+        for item_id, location in enumerate([self.jita_44, self.structure_1]):
+            self._create_asset(self.character_1001, item_id, self.merlin, 1, location)
+        # when
+        result = self._asset_search_result(
+            self.user, start=1, length=1, **{"search[value]": "Merlin"}
+        )
+        # then
+        self.assertEqual(result["recordsTotal"], 2)
+        self.assertListEqual(
+            [row["location"] for row in result["data"]], [self.jita_44.name_plus]
+        )
+
+    def _create_asset(
+        self, character, item_id, eve_type, quantity, location=None, **kwargs
+    ) -> CharacterAsset:
+        kwargs.setdefault("root_location", location)
+        return CharacterAsset.objects.create(
+            character=character,
+            item_id=item_id,
+            eve_type=eve_type,
+            quantity=quantity,
+            location=location,
+            is_singleton=False,
+            **kwargs,
+        )
+
+    def _asset_search_result(self, user, **params) -> dict:
+        query = datatables_query(
+            AssetSearchListJson.columns, order=[(3, "asc")], **params
+        )
+        request = self.factory.get(
+            reverse("memberaudit:asset_search_report_data"), data=query
+        )
+        request.user = user
+        response = AssetSearchListJson.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        return json_response_to_python(response)
@@ -43,6 +43,11 @@ urlpatterns = [
         character_viewer_1.character_assets_data,
         name="character_assets_data",
     ),
+    path(
+        "character_assets_fdd_data/<int:character_pk>/",
+        character_viewer_1.character_assets_fdd_data,
+        name="character_assets_fdd_data",
+    ),
     path(
         "character_asset_container/<int:character_pk>/<int:parent_asset_pk>/",
         character_viewer_1.character_asset_container,
@@ -58,11 +63,21 @@ urlpatterns = [
         character_viewer_1.character_contacts_data,
         name="character_contacts_data",
     ),
+    path(
+        "character_contacts_fdd_data/<int:character_pk>/",
+        character_viewer_1.character_contacts_fdd_data,
+        name="character_contacts_fdd_data",
+    ),
     path(
         "character_contracts_data/<int:character_pk>/",
         character_viewer_1.character_contracts_data,
         name="character_contracts_data",
     ),
+    path(
+        "character_contracts_fdd_data/<int:character_pk>/",
+        character_viewer_1.character_contracts_fdd_data,
+        name="character_contracts_fdd_data",
+    ),
     path(
         "character_contract_details/<int:character_pk>/<int:contract_pk>/",
         character_viewer_1.character_contract_details,
@@ -103,6 +118,11 @@ urlpatterns = [
         character_viewer_2.character_mining_ledger_data,
         name="character_mining_ledger_data",
     ),
+    path(
+        "character_mining_ledger_fdd_data/<int:character_pk>/",
+        character_viewer_2.character_mining_ledger_fdd_data,
+        name="character_mining_ledger_fdd_data",
+    ),
     path(
         "character_skillqueue_data/<int:character_pk>/",
         character_viewer_2.character_skillqueue_data,
@@ -123,11 +143,21 @@ urlpatterns = [
         character_viewer_2.character_wallet_journal_data,
         name="character_wallet_journal_data",
     ),
+    path(
+        "character_wallet_journal_fdd_data/<int:character_pk>/",
+        character_viewer_2.character_wallet_journal_fdd_data,
+        name="character_wallet_journal_fdd_data",
+    ),
     path(
         "character_wallet_transactions_data/<int:character_pk>/",
         character_viewer_2.character_wallet_transactions_data,
         name="character_wallet_transactions_data",
     ),
+    path(
+        "character_wallet_transactions_fdd_data/<int:character_pk>/",
+        character_viewer_2.character_wallet_transactions_fdd_data,
+        name="character_wallet_transactions_fdd_data",
+    ),
     path(
         "character_skill_set_details/<int:character_pk>/<int:skill_set_pk>",
         character_viewer_2.character_skill_set_details,
@@ -166,9 +196,19 @@ urlpatterns = [
     ),
     path(
         "skill_sets_report_data",
-        reports.skill_sets_report_data,
+        reports.SkillSetsReportListJson.as_view(),
         name="skill_sets_report_data",
     ),
+    path(
+        "skill_sets_report_fdd_data",
+        reports.skill_sets_report_fdd_data,
+        name="skill_sets_report_fdd_data",
+    ),
+    path(
+        "asset_search_report_data",
+        reports.AssetSearchListJson.as_view(),
+        name="asset_search_report_data",
+    ),
     # data export
     path("data-export/", data_export.data_export, name="data_export"),
     path(
@@ -1,3 +1,12 @@
+import re
+from collections import defaultdict
+from typing import Callable, Dict, Optional
+
+from dj_datatables_view.base_datatable_view import BaseDatatableView
+
+from django.db import models
+from django.db.models import Q
+from django.http import JsonResponse
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy
 from eveuniverse.core import dotlan
@@ -12,6 +21,17 @@ from ..models import Character
 UNGROUPED_SKILL_SET = gettext_lazy("[Ungrouped]")
 
 
+def compile_search_regex(value: str) -> Optional[re.Pattern]:
+    """Compile the regular expression of a DataTables search value.
+
+    Returns None when the value is not a valid regular expression.
+    """
+    try:
+        return re.compile(value, re.IGNORECASE)
+    except re.error:
+        return None
+
+
 def add_common_context(request, context: dict) -> dict:
     """adds the common context used by all view"""
     unregistered_count = Character.objects.unregistered_characters_of_user_count(
@@ -46,3 +66,175 @@ def eve_solar_system_to_html(solar_system: EveSolarSystem, show_region=True) ->
         round(solar_system.security_status, 1),
         region_html,
     )
+
+
+class CharacterDataListJson(BaseDatatableView):
+    """List of character data for DataTables with server-side processing.
+
+    Ordering, filtering and paging is done by the database,
+    so only the rows of the requested page are rendered.
+    Requests without DataTables parameters get all rows.
+
+    Column filters match the labels of a column's choices,
+    e.g. for drop down filters.
+    """
+
+    character = None  # set with as_view()
+
+    # names of all columns in the order of the table
+    columns = []
+
+    # names of additional columns which are included in every row
+    extra_columns = []
+
+    # fields used for ordering in the same order as columns,
+    # use an empty value for columns which can not be ordered
+    order_columns = []
+
+    # fields used for ordering requests without an order
+    default_order = ("pk",)
+
+    # fields matched by the global search
+    search_fields = []
+
+    # column name -> (field, function creating the label from a field value)
+    # for columns which can be filtered by the labels of their choices
+    choice_fields = {}
+
+    def get_initial_queryset(self):
+        raise NotImplementedError()
+
+    def render_row(self, obj) -> dict:
+        """Render all columns of a row."""
+        raise NotImplementedError()
+
+    def prepare_page(self, objs: list):
+        """Prepare rendering of the objects of the requested page."""
+
+    def extract_datatables_column_data(self):
+        col_data = super().extract_datatables_column_data()
+        if col_data:
+            return col_data
+        return [
+            {
+                "name": "",
+                "data": column,
+                "searchable": False,
+                "orderable": False,
+                "search.value": "",
+                "search.regex": "false",
+            }
+            for column in self.columns
+        ]
+
+    def ordering(self, qs):
+        order = []
+        order_columns = self.get_order_columns()
+        num = 0
+        while f"order[{num}][column]" in self._querydict:
+            try:
+                field = order_columns[int(self._querydict[f"order[{num}][column]"])]
+            except (ValueError, IndexError):
+                field = ""
+            if field:
+                is_desc = self._querydict.get(f"order[{num}][dir]") == "desc"
+                order.append(f"-{field}" if is_desc else field)
+            num += 1
+        return qs.order_by(*order, *self.default_order)
+
+    def paging(self, qs):
+        if "length" not in self._querydict:
+            return qs
+        return super().paging(qs)
+
+    def filter_queryset(self, qs):
+        """Apply column filters and the global search."""
+        for col in self.columns_data:
+            value = col["search.value"]
+            if not value:
+                continue
+            column = col["data"]
+            if column in self.choice_fields or hasattr(self, f"choices_{column}"):
+                qs = qs.filter(
+                    self._choices_query(
+                        self.choices(column), value, col["search.regex"] == "true"
+                    )
+                )
+
+        search = self._querydict.get("search[value]", None)
+        if search and self.search_fields:
+            my_q = Q()
+            for field in self.search_fields:
+                my_q |= Q(**{f"{field}__icontains": search})
+            qs = qs.filter(my_q)
+        return qs
+
+    @staticmethod
+    def _choices_query(choices: Dict[str, Q], value: str, is_regex: bool) -> Q:
+        """Query matching all choices whose label matches the given value.
+
+        Invalid regular expressions are ignored.
+        """
+        if is_regex:
+            pattern = compile_search_regex(value)
+            if not pattern:
+                return Q()
+            labels = [label for label in choices if pattern.search(label)]
+        else:
+            labels = [
+                label for label in choices if label.lower().startswith(value.lower())
+            ]
+        my_q = Q(pk__in=[])
+        for label in labels:
+            my_q |= choices[label]
+        return my_q
+
+    def choices(self, column: str) -> Dict[str, Q]:
+        """Query for each label of a column's choices."""
+        method = getattr(self, f"choices_{column}", None)
+        if method:
+            return method()
+        field, to_label = self.choice_fields[column]
+        return self.field_choices(self.get_initial_queryset(), field, to_label)
+
+    @staticmethod
+    def field_choices(
+        qs: models.QuerySet, field: str, to_label: Optional[Callable] = None
+    ) -> Dict[str, Q]:
+        """Query for each label of the distinct values of a field."""
+        values_by_label = defaultdict(list)
+        for value in qs.order_by().values_list(field, flat=True).distinct():
+            label = str(to_label(value) if to_label else value)
+            values_by_label[label].append(value)
+        choices = dict()
+        for label, values in values_by_label.items():
+            my_q = Q(**{f"{field}__in": [obj for obj in values if obj is not None]})
+            if None in values:
+                my_q |= Q(**{f"{field}__isnull": True})
+            choices[label] = my_q
+        return choices
+
+    def prepare_results(self, qs):
+        objs = list(qs)
+        self.prepare_page(objs)
+        names = [col["data"] for col in self.columns_data] + self.extra_columns
+        data = []
+        for obj in objs:
+            row = self.render_row(obj)
+            data.append({name: row.get(name) for name in names})
+        return data
+
+    @classmethod
+    def drop_down_data(cls, request, character) -> JsonResponse:
+        """Provide lists for drop down fields."""
+        view = cls(character=character)
+        result = dict()
+        columns = request.GET.get("columns")
+        if columns:
+            for column in columns.split(","):
+                if column in cls.choice_fields or hasattr(cls, f"choices_{column}"):
+                    options = [label for label in view.choices(column) if label]
+                else:
+                    options = [f"** ERROR: Invalid column name '{column}' **"]
+                result[column] = sorted(options, key=str.casefold)
+        return JsonResponse(result, safe=False)
@@ -8,7 +8,7 @@ from allianceauth import NAME as site_header
 from allianceauth.services.hooks import get_extension_logger
 from app_utils.logging import LoggerAddTag
 
-from .. import __title__, tasks
+from .. import __title__
 from ..forms import ImportFittingForm, ImportSkillPlanForm
 from ..models import SkillSet
 
@@ -48,7 +48,6 @@ def admin_create_skillset_from_fitting(request):
                 logger.info(
                     "Skill Set created from fitting with name: %s", fitting.name
                 )
-                tasks.update_characters_skill_checks.delay(force_update=True)
                 if created:
                     msg = f"Skill Set <b>{obj.name}</b> has been created"
                 else:
@@ -86,7 +85,6 @@ def admin_create_skillset_from_skill_plan(request):
                 params["skill_set_group"] = form.cleaned_data["skill_set_group"]
             obj, created = SkillSet.objects.update_or_create_from_skill_plan(**params)
             logger.info("%s: Skill Set created from skill plan", skill_plan.name)
-            tasks.update_characters_skill_checks.delay(force_update=True)
             if created:
                 msg = f"Skill Set <b>{obj.name}</b> has been created"
             else:
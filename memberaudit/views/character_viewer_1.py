@@ -1,16 +1,16 @@
+from collections import defaultdict
 from typing import Tuple
 
 from django.contrib.auth.decorators import login_required, permission_required
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import models
-from django.db.models import Count, F, Max, Q, Sum
+from django.db.models import F, Max, Q
 from django.http import HttpResponse, HttpResponseNotFound, JsonResponse
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.timesince import timeuntil
 from django.utils.timezone import now
-from eveuniverse.models import EveType
+from eveuniverse.models import EveEntity, EveType
 
 from allianceauth.eveonline.models import EveCharacter
 from allianceauth.services.hooks import get_extension_logger
@@ -33,11 +33,12 @@ from ..decorators import fetch_character_if_allowed
 from ..models import (
     Character,
     CharacterAsset,
+    CharacterContact,
     CharacterContract,
     CharacterContractItem,
     Location,
 )
-from ._common import add_common_context
+from ._common import CharacterDataListJson, add_common_context
 
 logger = LoggerAddTag(get_extension_logger(__name__), __title__)
 
@@ -114,16 +115,8 @@ def character_viewer(request, character_pk: int, character: Character) -> HttpRe
     all_characters = _identify_user_characters(request, character)
 
     # assets total value
-    character_assets_total = (
-        character.assets.exclude(is_blueprint_copy=True)
-        .aggregate(
-            total=Sum(
-                F("quantity") * F("eve_type__market_price__average_price"),
-                output_field=models.FloatField(),
-            )
-        )
-        .get("total")
-    )
+    asset_valuation = character.asset_valuations.order_by("-date").first()
+    character_assets_total = asset_valuation.total if asset_valuation else None
 
     # implants
     try:
@@ -205,16 +198,59 @@ def _identify_user_characters(request, character):
     return all_characters
 
 
-@login_required
-@permission_required("memberaudit.basic_access")
-@fetch_character_if_allowed()
-def character_assets_data(
-    request, character_pk: int, character: Character
-) -> JsonResponse:
-    data = list()
-    try:
-        asset_qs = (
-            character.assets.annotate_pricing()
+class CharacterAssetsListJson(CharacterDataListJson):
+    columns = [
+        "location",
+        "name",
+        "quantity",
+        "group",
+        "volume",
+        "price",
+        "total",
+        "actions",
+        "region",
+        "solar_system",
+        "is_ship",
+    ]
+    extra_columns = ["item_id", "contents_count", "contents_total", "contents_volume"]
+    order_columns = [
+        "location__name",
+        "eve_type__name",
+        "quantity",
+        "eve_type__eve_group__name",
+        "eve_type__volume",
+        "price",
+        "total",
+        "",
+        "location__eve_solar_system__eve_constellation__eve_region__name",
+        "location__eve_solar_system__name",
+        "",
+    ]
+    default_order = ("location__name", "pk")
+    search_fields = [
+        "name",
+        "eve_type__name",
+        "eve_type__eve_group__name",
+        "location__name",
+    ]
+    choice_fields = {
+        "region": (
+            "location__eve_solar_system__eve_constellation__eve_region__name",
+            lambda name: name or "",
+        ),
+        "solar_system": (
+            "location__eve_solar_system__name",
+            lambda name: name or "",
+        ),
+        "is_ship": (
+            "eve_type__eve_group__eve_category_id",
+            lambda category_id: yesno_str(category_id == EveCategoryId.SHIP),
+        ),
+    }
+
+    def get_initial_queryset(self):
+        return (
+            self.character.assets.annotate_pricing()
             .select_related(
                 "eve_type",
                 "eve_type__eve_group",
@@ -224,25 +260,40 @@ def character_assets_data(
             )
             .filter(location__isnull=False)
         )
-    except ObjectDoesNotExist:
-        return HttpResponseNotFound()
 
-    assets_with_children_ids = set(
-        character.assets.filter(children__isnull=False).values_list(
-            "item_id", flat=True
-        )
-    )
-    location_counts = {
-        obj["id"]: obj["items_count"]
-        for obj in (
-            Location.objects.select_related("characterasset__character")
-            .filter(characterasset__character=character)
-            .annotate(items_count=Count("characterasset"))
-            .values("id", "items_count")
+    def get_context_data(self, *args, **kwargs):
+        context = super().get_context_data(*args, **kwargs)
+        if "data" in context:
+            context["total"] = sum(
+                obj["total"] or 0 for obj in self._location_totals().values()
+            )
+        return context
+
+    def _location_totals(self) -> dict:
+        if not hasattr(self, "_location_totals_cache"):
+            self._location_totals_cache = self.character.assets.location_totals()
+        return self._location_totals_cache
+
+    def _location_label(self, location: Location) -> str:
+        totals = self._location_totals().get(location.id, {})
+        total = humanize_number(totals.get("total") or 0.0)
+        return f"{location.name_plus} ({totals.get('items_count', 0)}) ({total} ISK)"
+
+    def choices_location(self) -> dict:
+        locations = Location.objects.filter(id__in=self._location_totals().keys())
+        return {
+            self._location_label(location): Q(location_id=location.id)
+            for location in locations
+        }
+
+    def prepare_page(self, objs: list):
+        self._assets_with_children_ids = set(
+            CharacterAsset.objects.filter(parent__in=objs).values_list(
+                "parent__item_id", flat=True
+            )
         )
-    }
-    location_totals = {}
-    for asset in asset_qs:
+
+    def render_row(self, asset) -> dict:
         if asset.location.eve_solar_system:
             region = asset.location.eve_solar_system.eve_constellation.eve_region.name
             solar_system = asset.location.eve_solar_system.name
@@ -254,10 +305,10 @@ def character_assets_data(
             asset.eve_type.eve_group.eve_category_id == EveCategoryId.SHIP
         )
 
-        if asset.item_id in assets_with_children_ids:
+        if asset.item_id in self._assets_with_children_ids:
             ajax_children_url = reverse(
                 "memberaudit:character_asset_container",
-                args=[character.pk, asset.pk],
+                args=[self.character.pk, asset.pk],
             )
             actions_html = (
                 '<button type="button" class="btn btn-default btn-sm" '
@@ -268,35 +319,42 @@ def character_assets_data(
         else:
             actions_html = ""
 
-        location_name = (
-            f"{asset.location.name_plus} ({location_counts.get(asset.location_id, 0)})"
-        )
-        if location_name not in location_totals:
-            location_totals[location_name] = 0.0
-        if asset.total is not None:
-            location_totals[location_name] += asset.total
-
         name_html, name = item_icon_plus_name_html(asset)
-        data.append(
-            {
-                "item_id": asset.item_id,
-                "location": location_name,
-                "name": {"display": name_html, "sort": name},
-                "quantity": asset.quantity if not asset.is_singleton else "",
-                "group": asset.group_display,
-                "volume": asset.eve_type.volume,
-                "price": asset.price,
-                "total": asset.total,
-                "actions": actions_html,
-                "region": region,
-                "solar_system": solar_system,
-                "is_ship": is_ship,
-            }
-        )
-    for row in data:
-        sumstr = humanize_number(location_totals[row["location"]])
-        row["location"] = row["location"] + f" ({sumstr} ISK)"
-    return JsonResponse({"data": data})
+        return {
+            "item_id": asset.item_id,
+            "location": self._location_label(asset.location),
+            "name": {"display": name_html, "sort": name},
+            "quantity": asset.quantity if not asset.is_singleton else "",
+            "group": asset.group_display,
+            "volume": asset.eve_type.volume,
+            "price": asset.price,
+            "total": asset.total,
+            "actions": actions_html,
+            "region": region,
+            "solar_system": solar_system,
+            "is_ship": is_ship,
+            "contents_count": asset.contents_count,
+            "contents_total": asset.contents_total,
+            "contents_volume": asset.contents_volume,
+        }
+
+
+@login_required
+@permission_required("memberaudit.basic_access")
+@fetch_character_if_allowed()
+def character_assets_data(
+    request, character_pk: int, character: Character
+) -> JsonResponse:
+    return CharacterAssetsListJson.as_view(character=character)(request)
+
+
+@login_required
+@permission_required("memberaudit.basic_access")
+@fetch_character_if_allowed()
+def character_assets_fdd_data(
+    request, character_pk: int, character: Character
+) -> JsonResponse:
+    return CharacterAssetsListJson.drop_down_data(request, character)
 
 
 @login_required
@@ -307,7 +365,7 @@ def character_asset_container(
 ) -> HttpResponse:
     try:
         parent_asset = character.assets.select_related(
-            "location", "eve_type", "eve_type__eve_group"
+            "location", "root_location", "eve_type", "eve_type__eve_group"
         ).get(pk=parent_asset_pk)
     except CharacterAsset.DoesNotExist:
         error_msg = (
@@ -318,9 +376,18 @@ def character_asset_container(
             "error": error_msg,
         }
     else:
+        ancestors = sorted(
+            CharacterAsset.objects.ancestors_of(parent_asset).select_related(
+                "eve_type"
+            ),
+            key=lambda obj: obj.path,
+        )
         context = {
             "character": character,
             "parent_asset": parent_asset,
+            "parent_asset_ancestors": ancestors,
+            "parent_asset_location": parent_asset.root_location
+            or parent_asset.location,
             "parent_asset_icon_url": parent_asset.eve_type.icon_url(
                 size=DEFAULT_ICON_SIZE
             ),
@@ -368,6 +435,8 @@ def character_asset_container_data(
                 "volume": asset.eve_type.volume,
                 "price": asset.price,
                 "total": asset.total,
+                "contents_count": asset.contents_count,
+                "contents_total": asset.contents_total,
             }
         )
     return JsonResponse({"data": data})
@@ -394,47 +463,173 @@ def character_attribute_data(
     )
 
 
+class CharacterContactsListJson(CharacterDataListJson):
+    columns = [
+        "level",
+        "name",
+        "type",
+        "standing",
+        "is_watched",
+        "is_blocked",
+        "is_watched_str",
+        "is_blocked_str",
+        "is_npc_str",
+    ]
+    extra_columns = ["id"]
+    order_columns = [
+        "standing",
+        "eve_entity__name",
+        "eve_entity__category",
+        "standing",
+        "is_watched",
+        "is_blocked",
+        "is_watched",
+        "is_blocked",
+        "",
+    ]
+    default_order = ("-standing", "eve_entity__name", "pk")
+    search_fields = ["eve_entity__name"]
+    choice_fields = {
+        "level": (
+            "standing",
+            lambda standing: CharacterContact(standing=standing).standing_level.title(),
+        ),
+        "type": (
+            "eve_entity__category",
+            lambda category: EveEntity(category=category)
+            .get_category_display()
+            .title(),
+        ),
+        "is_watched_str": ("is_watched", lambda value: yesno_str(value is True)),
+        "is_blocked_str": ("is_blocked", lambda value: yesno_str(value is True)),
+    }
+
+    def get_initial_queryset(self):
+        return self.character.contacts.select_related("eve_entity")
+
+    def choices_is_npc_str(self) -> dict:
+        ids_by_label = defaultdict(list)
+        for contact in self.get_initial_queryset():
+            label = str(yesno_str(contact.eve_entity.is_npc))
+            ids_by_label[label].append(contact.eve_entity_id)
+        return {label: Q(eve_entity_id__in=ids) for label, ids in ids_by_label.items()}
+
+    def render_row(self, contact) -> dict:
+        is_watched = contact.is_watched is True
+        is_blocked = contact.is_blocked is True
+        name = contact.eve_entity.name
+        is_npc = contact.eve_entity.is_npc
+        if is_npc:
+            name_plus = format_html("{} {}", name, bootstrap_label_html("NPC", "info"))
+        else:
+            name_plus = name
+
+        name_html = bootstrap_icon_plus_name_html(
+            contact.eve_entity.icon_url(DEFAULT_ICON_SIZE), name_plus, avatar=True
+        )
+        return {
+            "id": contact.eve_entity_id,
+            "name": {"display": name_html, "sort": name},
+            "standing": contact.standing,
+            "type": contact.eve_entity.get_category_display().title(),
+            "is_watched": is_watched,
+            "is_blocked": is_blocked,
+            "is_watched_str": yesno_str(is_watched),
+            "is_blocked_str": yesno_str(is_blocked),
+            "is_npc_str": yesno_str(is_npc),
+            "level": contact.standing_level.title(),
+        }
+
+
 @login_required
 @permission_required("memberaudit.basic_access")
 @fetch_character_if_allowed()
 def character_contacts_data(
     request, character_pk: int, character: Character
 ) -> JsonResponse:
-    data = list()
-    try:
-        for contact in character.contacts.select_related("eve_entity").all():
-            is_watched = contact.is_watched is True
-            is_blocked = contact.is_blocked is True
-            name = contact.eve_entity.name
-            is_npc = contact.eve_entity.is_npc
-            if is_npc:
-                name_plus = format_html(
-                    "{} {}", name, bootstrap_label_html("NPC", "info")
-                )
-            else:
-                name_plus = name
-
-            name_html = bootstrap_icon_plus_name_html(
-                contact.eve_entity.icon_url(DEFAULT_ICON_SIZE), name_plus, avatar=True
-            )
-            data.append(
-                {
-                    "id": contact.eve_entity_id,
-                    "name": {"display": name_html, "sort": name},
-                    "standing": contact.standing,
-                    "type": contact.eve_entity.get_category_display().title(),
-                    "is_watched": is_watched,
-                    "is_blocked": is_blocked,
-                    "is_watched_str": yesno_str(is_watched),
-                    "is_blocked_str": yesno_str(is_blocked),
-                    "is_npc_str": yesno_str(is_npc),
-                    "level": contact.standing_level.title(),
-                }
-            )
-    except ObjectDoesNotExist:
-        pass
+    return CharacterContactsListJson.as_view(character=character)(request)
 
-    return JsonResponse({"data": data})
+
+@login_required
+@permission_required("memberaudit.basic_access")
+@fetch_character_if_allowed()
+def character_contacts_fdd_data(
+    request, character_pk: int, character: Character
+) -> JsonResponse:
+    return CharacterContactsListJson.drop_down_data(request, character)
+
+
+class CharacterContractsListJson(CharacterDataListJson):
+    columns = [
+        "summary",
+        "type",
+        "from",
+        "to",
+        "status",
+        "date_issued",
+        "time_left",
+        "info",
+        "actions",
+    ]
+    extra_columns = ["contract_id"]
+    order_columns = [
+        "",
+        "contract_type",
+        "issuer__name",
+        "assignee__name",
+        "status",
+        "date_issued",
+        "date_expired",
+        "title",
+        "",
+    ]
+    default_order = ("-date_issued", "pk")
+    search_fields = ["title", "issuer__name", "assignee__name"]
+    choice_fields = {
+        "type": (
+            "contract_type",
+            lambda contract_type: CharacterContract(contract_type=contract_type)
+            .get_contract_type_display()
+            .title(),
+        ),
+        "status": (
+            "status",
+            lambda status: CharacterContract(status=status).get_status_display(),
+        ),
+    }
+
+    def get_initial_queryset(self):
+        return self.character.contracts.select_related("issuer", "assignee")
+
+    def render_row(self, contract) -> dict:
+        if now() < contract.date_expired:
+            time_left = timeuntil(contract.date_expired, now())
+        else:
+            time_left = "expired"
+
+        ajax_contract_detail = reverse(
+            "memberaudit:character_contract_details",
+            args=[self.character.pk, contract.pk],
+        )
+
+        actions_html = (
+            '<button type="button" class="btn btn-primary" '
+            'data-toggle="modal" data-target="#modalCharacterContract" '
+            f"data-ajax_contract_detail={ajax_contract_detail}>"
+            '<i class="fas fa-search"></i></button>'
+        )
+        return {
+            "contract_id": contract.contract_id,
+            "summary": contract.summary(),
+            "type": contract.get_contract_type_display().title(),
+            "from": contract.issuer.name,
+            "to": contract.assignee.name if contract.assignee else "(None)",
+            "status": contract.get_status_display(),
+            "date_issued": contract.date_issued.isoformat(),
+            "time_left": time_left,
+            "info": contract.title,
+            "actions": actions_html,
+        }
 
 
 @login_required
@@ -443,43 +638,16 @@ def character_contacts_data(
 def character_contracts_data(
     request, character_pk: int, character: Character
 ) -> JsonResponse:
-    data = list()
-    try:
-        for contract in character.contracts.select_related("issuer", "assignee").all():
-            if now() < contract.date_expired:
-                time_left = timeuntil(contract.date_expired, now())
-            else:
-                time_left = "expired"
-
-            ajax_contract_detail = reverse(
-                "memberaudit:character_contract_details",
-                args=[character.pk, contract.pk],
-            )
+    return CharacterContractsListJson.as_view(character=character)(request)
 
-            actions_html = (
-                '<button type="button" class="btn btn-primary" '
-                'data-toggle="modal" data-target="#modalCharacterContract" '
-                f"data-ajax_contract_detail={ajax_contract_detail}>"
-                '<i class="fas fa-search"></i></button>'
-            )
-            data.append(
-                {
-                    "contract_id": contract.contract_id,
-                    "summary": contract.summary(),
-                    "type": contract.get_contract_type_display().title(),
-                    "from": contract.issuer.name,
-                    "to": contract.assignee.name if contract.assignee else "(None)",
-                    "status": contract.get_status_display(),
-                    "date_issued": contract.date_issued.isoformat(),
-                    "time_left": time_left,
-                    "info": contract.title,
-                    "actions": actions_html,
-                }
-            )
-    except ObjectDoesNotExist:
-        pass
 
-    return JsonResponse({"data": data})
+@login_required
+@permission_required("memberaudit.basic_access")
+@fetch_character_if_allowed()
+def character_contracts_fdd_data(
+    request, character_pk: int, character: Character
+) -> JsonResponse:
+    return CharacterContractsListJson.drop_down_data(request, character)
 
 
 @login_required
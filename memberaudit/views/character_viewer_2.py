@@ -5,7 +5,15 @@ import humanize
 
 from django.contrib.auth.decorators import login_required, permission_required
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Prefetch
+from django.db.models import (
+    Case,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    Prefetch,
+    Value,
+    When,
+)
 from django.http import HttpResponse, HttpResponseNotFound, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
@@ -35,7 +43,11 @@ from ..constants import (
 )
 from ..decorators import fetch_character_if_allowed
 from ..models import Character, SkillSet, SkillSetSkill
-from ._common import UNGROUPED_SKILL_SET, eve_solar_system_to_html
+from ._common import (
+    UNGROUPED_SKILL_SET,
+    CharacterDataListJson,
+    eve_solar_system_to_html,
+)
 
 logger = LoggerAddTag(get_extension_logger(__name__), __title__)
 
@@ -118,19 +130,33 @@ def character_jump_clones_data(
 
     return JsonResponse({"data": data})
 
-@login_required
-@permission_required("memberaudit.basic_access")
-@fetch_character_if_allowed()
-def character_mining_ledger_data(
-    request, character_pk: int, character: Character
-) -> JsonResponse:
-    qs = character.mining_ledger.select_related(
-        "eve_solar_system",
-        "eve_solar_system__eve_constellation__eve_region",
-        "eve_type",
-    ).annotate_pricing()
-    data = [
-        {
+
+class CharacterMiningLedgerListJson(CharacterDataListJson):
+    columns = ["date", "type", "quantity", "total", "solar_system"]
+    extra_columns = ["region", "price"]
+    order_columns = [
+        "date",
+        "eve_type__name",
+        "quantity",
+        "total",
+        "eve_solar_system__name",
+    ]
+    default_order = ("date", "eve_type__name", "eve_solar_system__name", "pk")
+    search_fields = ["eve_type__name", "eve_solar_system__name"]
+    choice_fields = {
+        "type": ("eve_type__name", None),
+        "solar_system": ("eve_solar_system__name", None),
+    }
+
+    def get_initial_queryset(self):
+        return self.character.mining_ledger.select_related(
+            "eve_solar_system",
+            "eve_solar_system__eve_constellation__eve_region",
+            "eve_type",
+        ).annotate_pricing()
+
+    def render_row(self, row) -> dict:
+        return {
             "date": row.date.isoformat(),
             "quantity": row.quantity,
             "region": row.eve_solar_system.eve_constellation.eve_region.name,
@@ -139,9 +165,24 @@ def character_mining_ledger_data(
             "total": row.total,
             "type": row.eve_type.name,
         }
-        for row in qs
-    ]
-    return JsonResponse({"data": data})
+
+
+@login_required
+@permission_required("memberaudit.basic_access")
+@fetch_character_if_allowed()
+def character_mining_ledger_data(
+    request, character_pk: int, character: Character
+) -> JsonResponse:
+    return CharacterMiningLedgerListJson.as_view(character=character)(request)
+
+
+@login_required
+@permission_required("memberaudit.basic_access")
+@fetch_character_if_allowed()
+def character_mining_ledger_fdd_data(
+    request, character_pk: int, character: Character
+) -> JsonResponse:
+    return CharacterMiningLedgerListJson.drop_down_data(request, character)
 
 
 @login_required
@@ -464,35 +505,133 @@ def character_skills_data(
     return JsonResponse({"data": skills_data})
 
 
+class CharacterWalletJournalListJson(CharacterDataListJson):
+    columns = [
+        "date",
+        "ref_type",
+        "first_party",
+        "second_party",
+        "amount",
+        "balance",
+        "description",
+    ]
+    extra_columns = ["reason"]
+    order_columns = [
+        "date",
+        "ref_type",
+        "first_party__name",
+        "second_party__name",
+        "amount",
+        "balance",
+        "description",
+    ]
+    default_order = ("-date", "-entry_id")
+    search_fields = [
+        "description",
+        "reason",
+        "first_party__name",
+        "second_party__name",
+    ]
+    choice_fields = {
+        "ref_type": ("ref_type", lambda ref_type: ref_type.replace("_", " ").title()),
+        "first_party": ("first_party__name", lambda name: name or "-"),
+        "second_party": ("second_party__name", lambda name: name or "-"),
+    }
+
+    def get_initial_queryset(self):
+        return self.character.wallet_journal.select_related(
+            "first_party", "second_party"
+        )
+
+    def render_row(self, row) -> dict:
+        return {
+            "date": row.date.isoformat(),
+            "ref_type": row.ref_type.replace("_", " ").title(),
+            "first_party": row.first_party.name if row.first_party else "-",
+            "second_party": row.second_party.name if row.second_party else "-",
+            "amount": float(row.amount),
+            "balance": float(row.balance),
+            "description": row.description,
+            "reason": row.reason,
+        }
+
+
 @login_required
 @permission_required("memberaudit.basic_access")
 @fetch_character_if_allowed()
 def character_wallet_journal_data(
     request, character_pk: int, character: Character
 ) -> JsonResponse:
-    wallet_data = list()
-    try:
-        for row in character.wallet_journal.select_related(
-            "first_party", "second_party"
-        ).all():
-            first_party = row.first_party.name if row.first_party else "-"
-            second_party = row.second_party.name if row.second_party else "-"
-            wallet_data.append(
-                {
-                    "date": row.date.isoformat(),
-                    "ref_type": row.ref_type.replace("_", " ").title(),
-                    "first_party": first_party,
-                    "second_party": second_party,
-                    "amount": float(row.amount),
-                    "balance": float(row.balance),
-                    "description": row.description,
-                    "reason": row.reason,
-                }
+    return CharacterWalletJournalListJson.as_view(character=character)(request)
+
+
+@login_required
+@permission_required("memberaudit.basic_access")
+@fetch_character_if_allowed()
+def character_wallet_journal_fdd_data(
+    request, character_pk: int, character: Character
+) -> JsonResponse:
+    return CharacterWalletJournalListJson.drop_down_data(request, character)
+
+
+class CharacterWalletTransactionsListJson(CharacterDataListJson):
+    columns = [
+        "date",
+        "quantity",
+        "type",
+        "unit_price",
+        "total",
+        "client",
+        "location",
+        "buy_or_sell",
+    ]
+    extra_columns = ["is_buy"]
+    order_columns = [
+        "date",
+        "quantity",
+        "eve_type__name",
+        "unit_price",
+        "total",
+        "client__name",
+        "location__name",
+        "is_buy",
+    ]
+    default_order = ("-date", "-transaction_id")
+    search_fields = ["eve_type__name", "client__name", "location__name"]
+    choice_fields = {
+        "buy_or_sell": (
+            "is_buy",
+            lambda is_buy: gettext("Buy") if is_buy else gettext("Sell"),
+        ),
+        "client": ("client__name", None),
+        "location": ("location__name", None),
+    }
+
+    def get_initial_queryset(self):
+        return self.character.wallet_transactions.select_related(
+            "client", "eve_type", "location"
+        ).annotate(
+            total=ExpressionWrapper(
+                F("unit_price")
+                * F("quantity")
+                * Case(When(is_buy=True, then=Value(-1)), default=Value(1)),
+                output_field=DecimalField(),
             )
-    except ObjectDoesNotExist:
-        pass
+        )
 
-    return JsonResponse({"data": wallet_data})
+    def render_row(self, row) -> dict:
+        buy_or_sell = gettext_lazy("Buy") if row.is_buy else gettext_lazy("Sell")
+        return {
+            "date": row.date.isoformat(),
+            "quantity": row.quantity,
+            "type": row.eve_type.name,
+            "unit_price": float(row.unit_price),
+            "total": float(row.unit_price * row.quantity * (-1 if row.is_buy else 1)),
+            "client": row.client.name,
+            "location": row.location.name,
+            "is_buy": row.is_buy,
+            "buy_or_sell": buy_or_sell,
+        }
 
 
 @login_required
@@ -501,27 +640,13 @@ def character_wallet_journal_data(
 def character_wallet_transactions_data(
     request, character_pk: int, character: Character
 ) -> JsonResponse:
-    wallet_data = list()
-    try:
-        for row in character.wallet_transactions.select_related(
-            "client", "eve_type", "location"
-        ).all():
-            buy_or_sell = gettext_lazy("Buy") if row.is_buy else gettext_lazy("Sell")
-            wallet_data.append(
-                {
-                    "date": row.date.isoformat(),
-                    "quantity": row.quantity,
-                    "type": row.eve_type.name,
-                    "unit_price": float(row.unit_price),
-                    "total": float(
-                        row.unit_price * row.quantity * (-1 if row.is_buy else 1)
-                    ),
-                    "client": row.client.name,
-                    "location": row.location.name,
-                    "is_buy": row.is_buy,
-                    "buy_or_sell": buy_or_sell,
-                }
-            )
-    except ObjectDoesNotExist:
-        pass
-    return JsonResponse({"data": wallet_data})
+    return CharacterWalletTransactionsListJson.as_view(character=character)(request)
+
+
+@login_required
+@permission_required("memberaudit.basic_access")
+@fetch_character_if_allowed()
+def character_wallet_transactions_fdd_data(
+    request, character_pk: int, character: Character
+) -> JsonResponse:
+    return CharacterWalletTransactionsListJson.drop_down_data(request, character)
@@ -1,12 +1,17 @@
-from collections import defaultdict
+from typing import Callable
+
+from dj_datatables_view.base_datatable_view import BaseDatatableView
 
 from django.contrib.auth.decorators import login_required, permission_required
+from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Count, Exists, OuterRef, Q
+from django.db.models import Count, Q, Sum
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+from django.utils.translation import gettext as _
 from eveuniverse.core import eveimageserver
 from eveuniverse.models import EveType
 
@@ -18,8 +23,15 @@ from app_utils.views import bootstrap_icon_plus_name_html, yesno_str
 
 from .. import __title__
 from ..constants import DEFAULT_ICON_SIZE, SKILL_SET_DEFAULT_ICON_TYPE_ID
-from ..models import CharacterSkillSetCheck, General, SkillSet, SkillSetSkill
-from ._common import UNGROUPED_SKILL_SET, add_common_context
+from ..models import (
+    Character,
+    CharacterAsset,
+    CharacterSkillSetReportRow,
+    General,
+    Location,
+    SkillSetGroup,
+)
+from ._common import UNGROUPED_SKILL_SET, add_common_context, compile_search_regex
 
 logger = LoggerAddTag(get_extension_logger(__name__), __title__)
 
@@ -213,122 +225,330 @@ def corporation_compliance_report_data(request) -> JsonResponse:
     return JsonResponse({"data": data})
 
 
-@login_required
-@permission_required("memberaudit.reports_access")
-def skill_sets_report_data(request) -> JsonResponse:
-    def _create_data_row(group, character, skill_sets) -> dict:
-        if character.main_character:
-            main_name = character.main_character.character_name
-            main_html = bootstrap_icon_plus_name_html(
-                character.main_character.portrait_url(), main_name, avatar=True
+class SkillSetsReportListJson(
+    PermissionRequiredMixin, LoginRequiredMixin, BaseDatatableView
+):
+    """Skill sets report served page by page from pre-computed report rows."""
+
+    model = CharacterSkillSetReportRow
+    permission_required = "memberaudit.reports_access"
+    columns = [
+        "group",
+        "main_html",
+        "state",
+        "organization_html",
+        "character_html",
+        "has_required",
+        "alliance",
+        "corporation",
+        "has_required_str",
+        "is_doctrine_str",
+        "is_main_str",
+    ]
+
+    # define column names that will be used in sorting
+    # order is important and should be same as order of columns
+    # displayed by datatables. For non sortable columns use empty
+    # value like ''
+    order_columns = [
+        "group_name",
+        "main_name",
+        "state_name",
+        "corporation_name",
+        "character_name",
+        "has_required",
+        "",
+        "",
+        "",
+        "",
+        "",
+    ]
+
+    def get_initial_queryset(self):
+        return CharacterSkillSetReportRow.objects.all()
+
+    def filter_queryset(self, qs):
+        """use parameters passed in GET request to filter queryset"""
+        qs = self._apply_choice_filter(qs, 0, self.group_choices)
+        qs = self._apply_search_filter(qs, 2, "state_name")
+        qs = self._apply_choice_filter(qs, 6, self.alliance_choices)
+        qs = self._apply_search_filter(qs, 7, "corporation_name")
+        qs = self._apply_choice_filter(qs, 8, lambda: yesno_choices("has_required"))
+        qs = self._apply_choice_filter(qs, 9, lambda: yesno_choices("is_doctrine"))
+        qs = self._apply_choice_filter(qs, 10, lambda: yesno_choices("is_main"))
+
+        search = self.request.GET.get("search[value]", None)
+        if search:
+            qs = qs.filter(
+                Q(character_name__istartswith=search) | Q(main_name__istartswith=search)
             )
-            main_corporation = character.eve_character.corporation_name
-            main_alliance = (
-                character.eve_character.alliance_name
-                if character.eve_character.alliance_name
-                else "---"
+        return qs
+
+    def _is_regex_search(self, column_num) -> bool:
+        return self.request.GET.get(f"columns[{column_num}][search][regex]") == "true"
+
+    def _apply_search_filter(self, qs, column_num, field):
+        """Filter by the values of a field which match the search value.
+
+        Invalid regular expressions are ignored.
+        """
+        my_filter = self.request.GET.get(f"columns[{column_num}][search][value]", None)
+        if my_filter:
+            if self._is_regex_search(column_num):
+                pattern = compile_search_regex(my_filter)
+                if not pattern:
+                    return qs
+                values = [
+                    value
+                    for value in qs.order_by().values_list(field, flat=True).distinct()
+                    if value and pattern.search(value)
+                ]
+                kwargs = {f"{field}__in": values}
+            else:
+                kwargs = {f"{field}__istartswith": my_filter}
+            return qs.filter(**kwargs)
+        return qs
+
+    def _apply_choice_filter(self, qs, column_num, get_choices: Callable[[], dict]):
+        """Filter by the choices whose label matches the search value.
+
+        Invalid regular expressions are ignored.
+        """
+        my_filter = self.request.GET.get(f"columns[{column_num}][search][value]", None)
+        if my_filter:
+            choices = get_choices()
+            if self._is_regex_search(column_num):
+                pattern = compile_search_regex(my_filter)
+                if not pattern:
+                    return qs
+                labels = [label for label in choices if pattern.search(label)]
+            else:
+                labels = [
+                    label
+                    for label in choices
+                    if label.lower().startswith(my_filter.lower())
+                ]
+            my_q = Q(pk__in=[])
+            for label in labels:
+                my_q |= choices[label]
+            return qs.filter(my_q)
+        return qs
+
+    @staticmethod
+    def group_choices() -> dict:
+        """Query for each group name as shown in the report."""
+        choices = {str(UNGROUPED_SKILL_SET): Q(group__isnull=True)}
+        for group in SkillSetGroup.objects.all():
+            choices[group.name_plus] = Q(group=group)
+        return choices
+
+    @staticmethod
+    def alliance_choices() -> dict:
+        """Query for each alliance name as shown in the report."""
+        return {
+            name or "---": Q(alliance_name=name)
+            for name in CharacterSkillSetReportRow.objects.values_list(
+                "alliance_name", flat=True
+            ).distinct()
+        }
+
+    def render_column(self, row, column):
+        if column == "group":
+            if not row.group_id:
+                return str(UNGROUPED_SKILL_SET)
+            return "{}{}".format(
+                _("Doctrine: ") if row.is_doctrine else "", row.group_name
+            )
+        if column == "main_html":
+            if row.main_eve_id:
+                return bootstrap_icon_plus_name_html(
+                    eveimageserver.character_portrait_url(row.main_eve_id),
+                    row.main_name,
+                    avatar=True,
+                )
+            return ""
+        if column == "state":
+            return row.state_name
+        if column == "organization_html":
+            if row.main_eve_id:
+                return format_html(
+                    "{}{}",
+                    row.corporation_name,
+                    f" [{row.alliance_ticker}]" if row.alliance_name else "",
+                )
+            return ""
+        if column == "character_html":
+            character_viewer_url = "{}?tab=skill_sets".format(
+                reverse("memberaudit:character_viewer", args=[row.character_id])
             )
-            organization_html = format_html(
-                "{}{}",
-                main_corporation,
-                f" [{character.eve_character.alliance_ticker}]"
-                if character.eve_character.alliance_name
-                else "",
+            return bootstrap_icon_plus_name_html(
+                eveimageserver.character_portrait_url(row.character_eve_id),
+                row.character_name,
+                avatar=True,
+                url=character_viewer_url,
             )
-        else:
-            main_html = main_name = ""
-            main_corporation = main_alliance = organization_html = ""
-        character_viewer_url = "{}?tab=skill_sets".format(
-            reverse("memberaudit:character_viewer", args=[character.pk])
-        )
-        character_html = bootstrap_icon_plus_name_html(
-            character.eve_character.portrait_url(),
-            character.eve_character.character_name,
-            avatar=True,
-            url=character_viewer_url,
-        )
-        group_pk = group.pk if group else 0
-        has_required = [
-            bootstrap_icon_plus_name_html(
-                obj.ship_type.icon_url(
-                    DEFAULT_ICON_SIZE, variant=EveType.IconVariant.REGULAR
+        if column == "has_required":
+            return self._render_skill_sets(row.skill_sets)
+        if column == "alliance":
+            return (row.alliance_name or "---") if row.main_eve_id else ""
+        if column == "corporation":
+            return row.corporation_name if row.main_eve_id else ""
+        if column == "has_required_str":
+            return yesno_str(row.has_required)
+        if column == "is_doctrine_str":
+            return yesno_str(row.is_doctrine)
+        if column == "is_main_str":
+            return yesno_str(row.is_main)
+        return super().render_column(row, column)
+
+    @staticmethod
+    def _render_skill_sets(skill_sets: list) -> str:
+        if not skill_sets:
+            return mark_safe('<i class="fas fa-times boolean-icon-false"></i>')
+        return mark_safe(
+            "<br>".join(
+                bootstrap_icon_plus_name_html(
+                    eveimageserver.type_icon_url(
+                        ship_type_id or SKILL_SET_DEFAULT_ICON_TYPE_ID,
+                        size=DEFAULT_ICON_SIZE,
+                    ),
+                    name,
                 )
-                if obj.ship_type
-                else eveimageserver.type_icon_url(
-                    SKILL_SET_DEFAULT_ICON_TYPE_ID, size=DEFAULT_ICON_SIZE
+                for name, ship_type_id in skill_sets
+            )
+        )
+
+
+class AssetSearchListJson(
+    PermissionRequiredMixin, LoginRequiredMixin, BaseDatatableView
+):
+    """Search for item types in the assets of all accessible characters.
+
+    Assets are aggregated by item type, character and location,
+    so each row tells who has how many items of a type and where.
+    """
+
+    permission_required = "memberaudit.reports_access"
+    columns = ["eve_type", "character", "main", "location", "quantity"]
+    order_columns = [
+        "eve_type__name",
+        "character__eve_character__character_name",
+        "",
+        "root_location__name",
+        "quantity_total",
+    ]
+    search_min_length = 3
+
+    def get_initial_queryset(self):
+        search = self.request.GET.get("search[value]", "").strip()
+        if len(search) < self.search_min_length:
+            return CharacterAsset.objects.none()
+        return (
+            CharacterAsset.objects.filter(
+                eve_type_id__in=EveType.objects.filter(name__istartswith=search).values(
+                    "id"
+                ),
+                character__eve_character__character_ownership__user__in=(
+                    General.accessible_users(self.request.user)
                 ),
-                obj.name,
             )
-            for obj in sorted(skill_sets, key=lambda x: x.name.lower())
-        ]
-        has_required_html = (
-            "<br>".join(has_required)
-            if has_required
-            else '<i class="fas fa-times boolean-icon-false"></i>'
+            .values("eve_type_id", "character_id", "root_location_id")
+            .annotate(quantity_total=Sum("quantity"))
         )
-        state_name = character.user.profile.state.name if character.user else ""
-        return {
-            "id": f"{group_pk}_{character.pk}",
-            "group": group.name_plus if group else UNGROUPED_SKILL_SET,
-            "main": main_name,
-            "main_html": main_html,
-            "state": state_name,
-            "organization_html": organization_html,
-            "corporation": main_corporation,
-            "alliance": main_alliance,
-            "character": character.eve_character.character_name,
-            "character_html": character_html,
-            "has_required": has_required_html,
-            "has_required_str": yesno_str(bool(has_required)),
-            "is_doctrine_str": yesno_str(group.is_doctrine if group else False),
-            "is_main_str": yesno_str(character.is_main),
-        }
 
-    failed_required_skills_qs = SkillSetSkill.objects.filter(
-        failed_required_skill_set_checks__pk=OuterRef("pk")
-    )
-    skill_set_checks_qs = (
-        CharacterSkillSetCheck.objects.select_related(
-            "character",
-            "character__eve_character__character_ownership__user",
-            "character__eve_character__character_ownership__user__profile__main_character",
-            "character__eve_character__character_ownership__user__profile__state",
-            "skill_set",
-            "skill_set__ship_type",
+    def filter_queryset(self, qs):
+        """The search was already applied to the initial queryset."""
+        return qs
+
+    def ordering(self, qs):
+        qs = super().ordering(qs)
+        return qs.order_by(
+            *qs.query.order_by, "eve_type_id", "character_id", "root_location_id"
         )
-        .exclude(
-            character__eve_character__character_ownership__user__profile__state__pk=(
-                get_guest_state_pk()
+
+    def prepare_results(self, qs):
+        rows = list(qs)
+        eve_types = EveType.objects.in_bulk({row["eve_type_id"] for row in rows})
+        characters = Character.objects.select_related(
+            "eve_character",
+            "eve_character__character_ownership__user__profile__main_character",
+        ).in_bulk({row["character_id"] for row in rows})
+        locations = Location.objects.in_bulk({row["root_location_id"] for row in rows})
+        data = []
+        for row in rows:
+            eve_type = eve_types[row["eve_type_id"]]
+            character = characters[row["character_id"]]
+            location = locations.get(row["root_location_id"])
+            main_character = character.main_character
+            character_viewer_url = "{}?tab=assets".format(
+                reverse("memberaudit:character_viewer", args=[character.pk])
             )
-        )
-        .annotate(has_skills=~Exists(failed_required_skills_qs))
-    )
-    character_skill_checks = defaultdict(list)
-    for skill_set_check in skill_set_checks_qs:
-        character_skill_checks[skill_set_check.skill_set.pk].append(skill_set_check)
-
-    data = []
-    groups_map = SkillSet.objects.compile_groups_map()
-    for group_map in groups_map.values():
-        group = group_map["group"]
-        characters_map = dict()
-        for skill_set in group_map["skill_sets"]:
-            for skill_check in character_skill_checks[skill_set.pk]:
-                character = skill_check.character
-                if character.pk not in characters_map:
-                    characters_map[character.pk] = {
-                        "character": character,
-                        "character_name": character,
-                        "skill_sets": [],
-                    }
-                if skill_check.has_skills:
-                    characters_map[character.pk]["skill_sets"].append(
-                        skill_check.skill_set
-                    )
-        for character_map in characters_map.values():
             data.append(
-                _create_data_row(
-                    group, character_map["character"], character_map["skill_sets"]
-                )
+                {
+                    "eve_type": bootstrap_icon_plus_name_html(
+                        eve_type.icon_url(size=DEFAULT_ICON_SIZE), eve_type.name
+                    ),
+                    "character": bootstrap_icon_plus_name_html(
+                        character.eve_character.portrait_url(),
+                        character.eve_character.character_name,
+                        avatar=True,
+                        url=character_viewer_url,
+                    ),
+                    "main": main_character.character_name if main_character else "",
+                    "location": location.name_plus if location else "-",
+                    "quantity": row["quantity_total"],
+                }
             )
-    return JsonResponse({"data": data})
+        return data
+
+
+def yesno_choices(field: str) -> dict:
+    """Query for the labels of a boolean field as shown in the report."""
+    return {
+        str(yesno_str(True)): Q(**{field: True}),
+        str(yesno_str(False)): Q(**{field: False}),
+    }
+
+
+@login_required
+@permission_required("memberaudit.reports_access")
+def skill_sets_report_fdd_data(request) -> JsonResponse:
+    """Provide lists for drop down fields."""
+    result = dict()
+    qs = SkillSetsReportListJson.model.objects.all()
+    columns = request.GET.get("columns")
+    if columns:
+        for column in columns.split(","):
+            if column == "group":
+                group_ids = set(qs.values_list("group_id", flat=True).distinct())
+                options = [
+                    group.name_plus
+                    for group in SkillSetGroup.objects.filter(pk__in=group_ids)
+                ]
+                if None in group_ids:
+                    options.append(str(UNGROUPED_SKILL_SET))
+            elif column == "state":
+                options = qs.values_list("state_name", flat=True).distinct()
+            elif column == "alliance":
+                options = [
+                    name or "---"
+                    for name in qs.exclude(main_eve_id__isnull=True)
+                    .values_list("alliance_name", flat=True)
+                    .distinct()
+                ]
+            elif column == "corporation":
+                options = (
+                    qs.exclude(main_eve_id__isnull=True)
+                    .values_list("corporation_name", flat=True)
+                    .distinct()
+                )
+            elif column in {"has_required_str", "is_doctrine_str", "is_main_str"}:
+                field = column[: -len("_str")]
+                options = [
+                    str(yesno_str(value))
+                    for value in qs.values_list(field, flat=True).distinct()
+                ]
+            else:
+                options = [f"** ERROR: Invalid column name '{column}' **"]
+            result[column] = sorted(list(set(options)), key=str.casefold)
+    return JsonResponse(result, safe=False)